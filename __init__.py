@@ -1,16 +1,25 @@
 """
 Adaptive Breath Hold Training System
 A modular system for generating personalized breath hold training plans.
-"""
 
-from .core.athlete import Athlete
-from .core.training_zones import TrainingZones
-from .core.sessions import SessionGenerator
-from .generators.schedule import ScheduleGenerator
-from .generators.pdf_generator import PDFGenerator
-from .data.storage import ProgressStorage
+Public names are imported on first use (PEP 562), so e.g. recording a new
+max through ProgressStorage never loads the PDF stack.
+"""
+import importlib
+from typing import Any, List
 
 __version__ = "1.0.0"
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'Athlete': 'core.athlete',
+    'TrainingZones': 'core.training_zones',
+    'SessionGenerator': 'core.sessions',
+    'ScheduleGenerator': 'generators.schedule',
+    'PDFGenerator': 'generators.pdf_generator',
+    'ProgressStorage': 'data.storage',
+}
+
 __all__ = [
     'Athlete',
     'TrainingZones', 
@@ -18,4 +27,16 @@ __all__ = [
     'ScheduleGenerator',
     'PDFGenerator',
     'ProgressStorage'
-]
\ No newline at end of file
+]
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from fastapi import Request, Response
+from breath_hold_training.config.constants import DEFAULT_RESPONSE_CACHE_SIZE
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check; uses weak comparison as RFC 9110 13.1.2 requires"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    return any(candidate.strip().removeprefix('W/') == etag for candidate in if_none_match.split(','))
+
+class CachedResponse:
+    """A rendered response body with its ETag"""
+    __slots__ = ('body', 'media_type', 'etag', 'headers', 'validator', 'tag')
+
+    def __init__(self, body: bytes, media_type: str, validator: Any = None, tag: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        self.body = body
+        self.media_type = media_type
+        self.etag = make_etag(body)
+        self.headers = headers or {}
+        self.validator = validator
+        self.tag = tag
+
+class ResponseCache:
+    """Small in-memory LRU of rendered API responses.
+
+    Entries can carry a validator (e.g. the storage file signature) that must
+    still match on lookup, and a tag (the storage path) so writes through
+    ProgressStorage drop them at once via invalidate_tag. Lookups that
+    end in a 304 are counted as not_modified.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Hashable, CachedResponse]' = OrderedDict()
+        # Storage writes invalidate from I/O threads
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, validator: Any = None) -> Optional[CachedResponse]:
+        """Get a live entry, treating one with a different validator as missing"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.validator != validator:
+                del self._entries[key]
+                self.stale += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, entry: CachedResponse) -> CachedResponse:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate_tag(self, tag: str):
+        """Drop every entry derived from a storage file"""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.tag == tag]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def respond(self, request: Request, entry: CachedResponse) -> Response:
+        """200 with the body, or 304 when the client already has this ETag"""
+        headers = {'ETag': entry.etag, 'Cache-Control': 'no-cache', **entry.headers}
+        if etag_matches(request.headers.get('if-none-match'), entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+    async def serve(self, request: Request, key: Hashable, render: Callable[[], Awaitable[bytes]],
+                    media_type: str, validator: Any = None, tag: Optional[str] = None,
+                    headers: Optional[Dict[str, str]] = None, store: bool = True) -> Response:
+        """Answer from the cache, rendering the body on a miss.
+
+        With store=False the body is always rendered and only the ETag
+        check applies.
+        """
+        entry = self.get(key, validator) if store else None
+        if entry is None:
+            entry = CachedResponse(await render(), media_type, validator, tag, headers)
+            if store:
+                self.put(key, entry)
+        return self.respond(request, entry)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        with self._lock:
+            size = sum(len(entry.body) for entry in self._entries.values())
+            entries = len(self._entries)
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'not_modified': self.not_modified,
+            'invalidations': self.invalidations,
+            'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': entries,
+            'bytes': size,
+            'maxsize': self.maxsize
+        }
+
+def storage_version(storage) -> Optional[Any]:
+    """Validator for responses derived from stored progress.
+
+    A stat() of the progress file, cheap enough to run on the event loop.
+    Backends without a signature return None; their responses are not stored.
+    """
+    signature = getattr(storage, 'signature', None)
+    return signature() if signature is not None else None
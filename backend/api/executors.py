@@ -0,0 +1,94 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from breath_hold_training.config.constants import (
+    DEFAULT_API_RENDER_WORKERS, DEFAULT_API_IO_WORKERS, DEFAULT_API_MAX_PENDING
+)
+from breath_hold_training.utils.instrumentation import call_captured, get_metrics, is_enabled
+
+class ExecutorBusy(Exception):
+    """Raised when a pool already has its maximum number of jobs pending"""
+
+class BoundedPool:
+    """An executor that refuses work past a fixed number of pending jobs.
+
+    Jobs past max_pending are rejected immediately instead of queueing without
+    bound, so an overloaded server sheds load with 503s rather than growing
+    latency for every client.
+    """
+
+    def __init__(self, name: str, executor: Executor, max_pending: int):
+        self.name = name
+        self.executor = executor
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn in the pool without blocking the event loop"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ExecutorBusy(f"{self.name} pool is busy ({self.pending} jobs pending)")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {'pending': self.pending, 'completed': self.completed,
+                'rejected': self.rejected, 'max_pending': self.max_pending}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+class Executors:
+    """The API's pools: PDF rendering in processes, blocking I/O in threads.
+
+    PDF rendering holds the GIL for tens of milliseconds, so it runs in a
+    process pool; render_workers=0 puts it on a thread pool instead (e.g.
+    where worker processes are not available). Storage calls release the GIL
+    on file I/O and run on a small thread pool.
+    """
+
+    def __init__(self, render_workers: Optional[int] = DEFAULT_API_RENDER_WORKERS,
+                 io_workers: int = DEFAULT_API_IO_WORKERS, max_pending: int = DEFAULT_API_MAX_PENDING):
+        if render_workers is None:
+            render_workers = os.cpu_count() or 1
+        if render_workers > 0:
+            render_executor = ProcessPoolExecutor(max_workers=render_workers)
+        else:
+            render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='render')
+        self.render_pool = BoundedPool('render', render_executor, max_pending)
+        self.io_pool = BoundedPool('io', ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='io'),
+                                   max_pending)
+
+    async def render(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run CPU-bound rendering; fn and its arguments must be picklable"""
+        if not is_enabled():
+            return await self.render_pool.run(fn, *args, **kwargs)
+        # Stage timings recorded in a worker process are sent back with the result
+        result, records = await self.render_pool.run(call_captured, fn, *args, **kwargs)
+        get_metrics().replay(records)
+        return result
+
+    async def cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run other CPU-bound library work (e.g. re-planning) off the event loop, in the render pool"""
+        return await self.render(fn, *args, **kwargs)
+
+    async def io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run blocking storage I/O"""
+        return await self.io_pool.run(fn, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {'render': self.render_pool.stats(), 'io': self.io_pool.stats()}
+
+    def shutdown(self):
+        self.render_pool.shutdown()
+        self.io_pool.shutdown()
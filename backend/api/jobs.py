@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Callable, Dict, List
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.config.constants import (
+    DEFAULT_JOB_WORKERS, DEFAULT_JOB_POLL_INTERVAL, DEFAULT_JOB_CLEANUP_INTERVAL
+)
+from breath_hold_training.data.job_queue import JobQueue
+from breath_hold_training.generators.plan_cache import get_plan_cache
+from .executors import Executors, ExecutorBusy
+from .routes.training import render_plan_bytes
+
+class JobWorkers:
+    """Async workers that drain the job queue through the API's render pool.
+
+    Each worker claims one job at a time, so at most `workers` renders are
+    handed to the render pool and synchronous requests keep the rest of it.
+    Workers wake on notify() after an enqueue and otherwise poll, which also
+    picks up retries once their delay has passed and jobs queued by other
+    processes. A housekeeping task deletes expired results and requeues
+    jobs whose worker died. A full pool never ends a worker: queue calls
+    wait until the I/O pool has room, and a job the render pool turns away
+    goes back to the queue without using up an attempt.
+    """
+
+    def __init__(self, queue: JobQueue, executors: Executors, workers: int = DEFAULT_JOB_WORKERS,
+                 poll_interval: float = DEFAULT_JOB_POLL_INTERVAL,
+                 cleanup_interval: float = DEFAULT_JOB_CLEANUP_INTERVAL):
+        self.queue = queue
+        self.executors = executors
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.cleanup_interval = cleanup_interval
+        self.busy = 0
+        self.completed = 0
+        self.failed = 0
+        self.deferred = 0
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._housekeeping()))
+
+    async def stop(self):
+        """Cancel the workers; jobs they were running go back to the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after a job was enqueued"""
+        self._wakeup.set()
+
+    async def _work(self):
+        while True:
+            # Clearing before the claim means an enqueue after it is never missed
+            self._wakeup.clear()
+            job = await self._io(self.queue.claim)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]):
+        self.busy += 1
+        try:
+            athlete = Athlete(**job['params'])
+            schedule = get_plan_cache().get_schedule(athlete)
+            data = await self.executors.render(render_plan_bytes, job['format'], athlete, schedule)
+        except asyncio.CancelledError:
+            self.queue.release(job['id'])
+            raise
+        except ExecutorBusy:
+            # Not the job's fault: requeue it as it was and give the pool time to drain
+            self.deferred += 1
+            await self._io(self.queue.release, job['id'])
+            await asyncio.sleep(self.poll_interval)
+        except Exception as e:
+            # The error is kept on the job; it is only final once the retries run out
+            retry = await self._io(self.queue.fail, job['id'], f"{type(e).__name__}: {e}")
+            if not retry:
+                self.failed += 1
+        else:
+            await self._io(self.queue.complete, job['id'], data)
+            self.completed += 1
+        finally:
+            self.busy -= 1
+
+    async def _housekeeping(self):
+        while True:
+            await self._io(self.queue.requeue_stale)
+            await self._io(self.queue.cleanup)
+            await asyncio.sleep(self.cleanup_interval)
+
+    async def _io(self, fn: Callable, *args) -> Any:
+        """Run a queue call on the I/O pool, backing off while the pool is full"""
+        while True:
+            try:
+                return await self.executors.io(fn, *args)
+            except ExecutorBusy:
+                await asyncio.sleep(self.poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'workers': self.workers, 'busy': self.busy, 'completed': self.completed, 'failed': self.failed,
+                'deferred': self.deferred}
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """A job as returned by the API, without its stored inputs"""
+    status = {key: job[key] for key in ('id', 'status', 'format', 'attempts', 'max_attempts', 'error',
+                                        'created', 'started', 'finished', 'expires')}
+    if job['finished'] is not None:
+        status['latency_ms'] = round((job['finished'] - job['created']) * 1000, 1)
+    return status
@@ -0,0 +1,142 @@
+"""
+HTTP API for plan generation and progress tracking.
+
+Needs fastapi plus an ASGI server. Run from the backend directory, e.g.:
+    uvicorn api.main:app --port 8000
+
+Settings come from the environment:
+    BREATH_HOLD_STORAGE          progress backend: json, journal or sqlite (default json)
+    BREATH_HOLD_PROGRESS_FILE    progress file (default breath_hold_progress.json, .jsonl or .db)
+    BREATH_HOLD_RENDER_WORKERS   PDF render processes (default CPU count, 0 = thread)
+    BREATH_HOLD_IO_WORKERS       storage I/O threads (default 4)
+    BREATH_HOLD_JOB_DB           background job queue database (default breath_hold_jobs.db)
+    BREATH_HOLD_JOB_WORKERS      background jobs rendered at once (default 2)
+    BREATH_HOLD_METRICS          0 disables the /metrics instrumentation (default on)
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from breath_hold_training.config.constants import (
+    DEFAULT_STORAGE_BACKEND, DEFAULT_API_RENDER_WORKERS, DEFAULT_API_IO_WORKERS, DEFAULT_API_MAX_PENDING,
+    DEFAULT_RESPONSE_CACHE_SIZE, DEFAULT_JOB_DB, DEFAULT_JOB_WORKERS
+)
+from breath_hold_training.data.backends import open_storage
+from breath_hold_training.data.job_queue import JobQueue
+from breath_hold_training.data.storage import ProgressStorage
+from breath_hold_training.utils import instrumentation
+from .cache import ResponseCache
+from .executors import Executors, ExecutorBusy
+from .jobs import JobWorkers
+from .routes import jobs, progress, training
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+def create_app(storage=None, render_workers: Optional[int] = None, io_workers: Optional[int] = None,
+               max_pending: int = DEFAULT_API_MAX_PENDING,
+               response_cache_size: int = DEFAULT_RESPONSE_CACHE_SIZE, job_queue: Optional[JobQueue] = None,
+               job_workers: Optional[int] = None, metrics: Optional[bool] = None) -> FastAPI:
+    """Build the API around a storage backend (BREATH_HOLD_STORAGE by default) and a job queue"""
+    if metrics is None:
+        metrics = os.environ.get('BREATH_HOLD_METRICS', '1') != '0'
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Only a running server records metrics; importing this module leaves them off
+        metrics_were_enabled = instrumentation.is_enabled()
+        if metrics:
+            instrumentation.enable()
+        # A storage handed in belongs to the caller; one opened here is closed on shutdown
+        app.state.storage = storage or open_storage(
+            os.environ.get('BREATH_HOLD_STORAGE', DEFAULT_STORAGE_BACKEND), os.environ.get('BREATH_HOLD_PROGRESS_FILE'))
+        app.state.executors = Executors(
+            render_workers if render_workers is not None
+            else _env_int('BREATH_HOLD_RENDER_WORKERS', DEFAULT_API_RENDER_WORKERS),
+            io_workers or _env_int('BREATH_HOLD_IO_WORKERS', DEFAULT_API_IO_WORKERS),
+            max_pending
+        )
+        # Writes through any ProgressStorage drop the responses built from that file
+        app.state.response_cache = ResponseCache(response_cache_size)
+        ProgressStorage.add_write_listener(app.state.response_cache.invalidate_tag)
+        app.state.job_queue = job_queue or JobQueue(os.environ.get('BREATH_HOLD_JOB_DB', DEFAULT_JOB_DB))
+        app.state.job_workers = JobWorkers(
+            app.state.job_queue, app.state.executors,
+            job_workers if job_workers is not None else _env_int('BREATH_HOLD_JOB_WORKERS', DEFAULT_JOB_WORKERS))
+        app.state.job_workers.start()
+        yield
+        await app.state.job_workers.stop()
+        ProgressStorage.remove_write_listener(app.state.response_cache.invalidate_tag)
+        app.state.executors.shutdown()
+        app.state.job_queue.close()
+        if storage is None and hasattr(app.state.storage, 'close'):
+            app.state.storage.close()
+        if not metrics_were_enabled:
+            instrumentation.disable()
+
+    app = FastAPI(title='Adaptive Breath Hold Training API', lifespan=lifespan)
+    app.include_router(training.router)
+    app.include_router(progress.router)
+    app.include_router(jobs.router)
+
+    @app.exception_handler(ExecutorBusy)
+    async def executor_busy(request: Request, exc: ExecutorBusy):
+        return JSONResponse(status_code=503, content={'detail': str(exc)}, headers={'Retry-After': '1'})
+
+    if metrics:
+        @app.middleware('http')
+        async def record_request(request: Request, call_next):
+            start = time.perf_counter()
+            response = await call_next(request)
+            # The route template keeps label values bounded (no job ids)
+            route = request.scope.get('route')
+            path = route.path if route is not None else 'unmatched'
+            instrumentation.observe('breath_hold_http_request_seconds', time.perf_counter() - start,
+                                    method=request.method, route=path)
+            instrumentation.count('breath_hold_http_requests_total', method=request.method, route=path,
+                                  status=str(response.status_code))
+            return response
+
+        @app.get('/metrics', include_in_schema=False)
+        async def read_metrics(request: Request) -> PlainTextResponse:
+            """Prometheus scrape endpoint"""
+            await _collect_gauges(request.app)
+            return PlainTextResponse(instrumentation.render_prometheus(),
+                                     media_type='text/plain; version=0.0.4; charset=utf-8')
+
+    @app.get('/api/health')
+    async def health(request: Request) -> Dict[str, Any]:
+        """Liveness check with executor queue depths, response cache and job worker metrics"""
+        return {
+            'status': 'ok',
+            'executors': request.app.state.executors.stats(),
+            'response_cache': request.app.state.response_cache.stats(),
+            'job_workers': request.app.state.job_workers.stats()
+        }
+
+    return app
+
+async def _collect_gauges(app: FastAPI):
+    """Sample pool, cache and job queue levels at scrape time"""
+    metrics = instrumentation.get_metrics()
+    for pool, stats in app.state.executors.stats().items():
+        metrics.set_gauge('breath_hold_executor_pending', stats['pending'], pool=pool)
+        metrics.set_gauge('breath_hold_executor_rejected', stats['rejected'], pool=pool)
+    cache = app.state.response_cache.stats()
+    metrics.set_gauge('breath_hold_response_cache_entries', cache['entries'])
+    metrics.set_gauge('breath_hold_response_cache_hit_ratio', cache['hit_ratio'])
+
+    # Not through the bounded I/O pool: a scrape must not get a 503 when the API is busiest
+    jobs = await asyncio.to_thread(app.state.job_queue.stats)
+    for status, depth in jobs['depth'].items():
+        metrics.set_gauge('breath_hold_jobs', depth, status=status)
+    metrics.set_gauge('breath_hold_jobs_oldest_queued_seconds', jobs['oldest_queued_s'])
+    metrics.set_gauge('breath_hold_job_workers_busy', app.state.job_workers.stats()['busy'])
+    for quantile in ('p50', 'p95'):
+        metrics.set_gauge('breath_hold_job_latency_seconds', jobs['total_ms'][quantile] / 1000, quantile=quantile)
+
+app = create_app()
@@ -0,0 +1,61 @@
+from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.generators.renderers import get_renderer
+from ..jobs import job_status
+from .training import AthleteIn, check_format
+
+router = APIRouter(prefix='/api/jobs', tags=['jobs'])
+
+@router.post('', status_code=202)
+async def enqueue_plan(body: AthleteIn, request: Request,
+                       output_format: str = Query('pdf', alias='format')) -> JSONResponse:
+    """Queue a plan render and return the job to poll.
+
+    A request identical to a job that is still queued or running gets that
+    job back (deduplicated=true) instead of a second render.
+    """
+    check_format(output_format)
+    body.to_athlete()
+    queue = request.app.state.job_queue
+    job_id, created = await request.app.state.executors.io(queue.enqueue, output_format, body.model_dump())
+    if created:
+        request.app.state.job_workers.notify()
+
+    job = await request.app.state.executors.io(queue.get, job_id)
+    return JSONResponse(status_code=202, content={**job_status(job), 'deduplicated': not created},
+                        headers={'Location': f"/api/jobs/{job_id}"})
+
+@router.get('/stats')
+async def job_stats(request: Request) -> Dict[str, Any]:
+    """Queue depth by status and recent job latency, for sizing workers"""
+    stats = await request.app.state.executors.io(request.app.state.job_queue.stats)
+    return {**stats, 'workers': request.app.state.job_workers.stats()}
+
+async def _get_job(request: Request, job_id: str) -> Dict[str, Any]:
+    job = await request.app.state.executors.io(request.app.state.job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"No job {job_id} (unknown or expired)")
+    return job
+
+@router.get('/{job_id}')
+async def read_job(job_id: str, request: Request) -> Dict[str, Any]:
+    """A job's status"""
+    return job_status(await _get_job(request, job_id))
+
+@router.get('/{job_id}/result')
+async def read_job_result(job_id: str, request: Request) -> Response:
+    """Download a finished job's plan; 409 while it is pending or after it failed"""
+    job = await _get_job(request, job_id)
+    if job['status'] != 'done':
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}"
+                            + (f": {job['error']}" if job['status'] == 'failed' else ''))
+
+    data = await request.app.state.executors.io(request.app.state.job_queue.result, job_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"No job {job_id} (unknown or expired)")
+    renderer = get_renderer(job['format'])
+    filename = renderer.filename(Athlete(**job['params']))
+    return Response(content=data, media_type=renderer.media_type,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
@@ -0,0 +1,83 @@
+import json
+import os
+from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+from breath_hold_training.generators.replan import Replanner
+from ..cache import storage_version
+
+router = APIRouter(prefix='/api/progress', tags=['progress'])
+
+class MaxHoldIn(BaseModel):
+    """A new maximum hold from a performance test"""
+    max_hold: int = Field(gt=0, description='New maximum breath hold in seconds')
+
+async def _serve_stored(request: Request, key: str, build, load=None) -> Response:
+    """Serve JSON built from stored progress (the whole document by default), cached until the next write"""
+    storage = request.app.state.storage
+    version = storage_version(storage)
+
+    async def render() -> bytes:
+        data = await request.app.state.executors.io(load or storage.load_progress)
+        return json.dumps(build(data), separators=(',', ':')).encode('utf-8')
+
+    return await request.app.state.response_cache.serve(
+        request, ('progress', key), render, 'application/json',
+        validator=version, tag=os.path.abspath(storage.filename), store=version is not None)
+
+@router.get('')
+async def read_progress(request: Request) -> Response:
+    """Full training history and the current record"""
+    return await _serve_stored(request, 'all', lambda data: {
+        'training_history': data.get('training_history', []),
+        'current': data.get('current')
+    })
+
+@router.get('/current')
+async def read_current(request: Request) -> Response:
+    """The current training record"""
+    def current(data: Dict[str, Any]) -> Dict[str, Any]:
+        if not data.get('current'):
+            raise HTTPException(status_code=404, detail='No training data recorded yet')
+        return data['current']
+
+    return await _serve_stored(request, 'current', current)
+
+@router.get('/analytics')
+async def read_analytics(request: Request) -> Response:
+    """Best, rolling mean, week-over-week change, trend and plateau over the training history.
+
+    A max recorded with PUT /max-hold is counted once the next plan is saved.
+    """
+    return await _serve_stored(request, 'analytics', lambda summary: summary,
+                               load=request.app.state.storage.get_analytics)
+
+def replan_summary(record: Dict[str, Any], new_max: int) -> Dict[str, Any]:
+    """What changes in next week's plan for a new max (runs in the render pool)"""
+    return Replanner().replan(record, new_max).summary()
+
+@router.put('/max-hold')
+async def update_max_hold(body: MaxHoldIn, request: Request) -> Dict[str, Any]:
+    """Record a new max hold and report how next week's plan changes"""
+    storage = request.app.state.storage
+    executors = request.app.state.executors
+
+    current = await executors.io(storage.get_current_data)
+    if not current:
+        raise HTTPException(status_code=404, detail='No training data recorded yet; generate a plan first')
+    # The stored record is shared with the storage cache; keep a copy from before the update
+    current = dict(current)
+
+    # Re-plan first: a busy pool then answers 503 before anything is recorded
+    replan = await executors.cpu(replan_summary, current, body.max_hold)
+    await executors.io(storage.update_max_hold, body.max_hold)
+
+    old_max = current.get('max_hold', 0)
+    improvement = body.max_hold - old_max
+    return {
+        'previous_max': old_max,
+        'max_hold': body.max_hold,
+        'improvement': improvement,
+        'improvement_pct': round(improvement / old_max * 100, 1) if old_max > 0 else 0.0,
+        'replan': replan
+    }
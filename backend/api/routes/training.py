@@ -0,0 +1,268 @@
+import asyncio
+import base64
+import json
+import os
+from datetime import date
+from typing import Dict, Any, AsyncIterator, Hashable, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.config.constants import (
+    DEFAULT_TOTAL_WEEKS, DEFAULT_BULK_CONCURRENCY, MAX_BULK_CONCURRENCY
+)
+from breath_hold_training.generators.plan_cache import PlanCache, get_plan_cache
+from breath_hold_training.generators.renderers import RENDERERS, JSONRenderer, get_renderer
+from ..cache import CachedResponse, storage_version
+from ..executors import ExecutorBusy
+
+router = APIRouter(prefix='/api/plans', tags=['training'])
+
+class AthleteIn(BaseModel):
+    """Athlete data for a plan request"""
+    current_max: int = Field(gt=0, description='Maximum breath hold in seconds')
+    experience_level: str
+    goals: str
+    current_week: int = Field(1, ge=1)
+    total_weeks: int = Field(DEFAULT_TOTAL_WEEKS, ge=1)
+    previous_max: Optional[int] = Field(None, ge=0)
+
+    def to_athlete(self) -> Athlete:
+        try:
+            return Athlete(**self.model_dump())
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+def render_plan_bytes(output_format: str, athlete: Athlete, weekly_schedule: Dict[str, Any]) -> bytes:
+    """Render a plan in a worker process"""
+    return get_renderer(output_format).render(athlete, weekly_schedule)
+
+@router.get('/formats')
+async def list_formats() -> Dict[str, Any]:
+    """Available plan output formats"""
+    return {name: {'extension': renderer.extension, 'media_type': renderer.media_type}
+            for name, renderer in sorted(RENDERERS.items())}
+
+def stored_athlete(data: Dict[str, Any]) -> Optional[Athlete]:
+    """Rebuild the athlete behind the stored current record.
+
+    The previous max is the latest recorded max that differs from the
+    current one, since update_max_hold only rewrites the current record.
+    """
+    current = data.get('current')
+    if not current:
+        return None
+    history = data.get('training_history', [])
+    earlier = [record['max_hold'] for record in history if record.get('max_hold') != current['max_hold']]
+    return Athlete(
+        current_max=current['max_hold'],
+        previous_max=earlier[-1] if earlier else None,
+        experience_level=current['experience_level'],
+        goals=current['goals'],
+        current_week=current['week']
+    )
+
+def plan_cache_key(output_format: str, athlete: Athlete) -> Hashable:
+    """Everything a rendered plan depends on: the schedule inputs plus the header fields"""
+    key = ('plan', output_format, PlanCache.plan_key(athlete), athlete.current_week,
+           athlete.previous_max, athlete.total_weeks)
+    if output_format == 'ics':
+        # Calendar events are dated from the current week
+        key += (date.today(),)
+    return key
+
+async def render_plan(request: Request, output_format: str, athlete: Athlete) -> bytes:
+    """Render a plan; PDFs go to the process pool, other formats take well under a millisecond"""
+    schedule = get_plan_cache().get_schedule(athlete)
+    if output_format == 'pdf':
+        return await request.app.state.executors.render(render_plan_bytes, output_format, athlete, schedule)
+    return get_renderer(output_format).render(athlete, schedule, TrainingZones(athlete))
+
+def plan_headers(renderer, athlete: Athlete) -> Dict[str, str]:
+    return {'Content-Disposition': f'inline; filename="{renderer.filename(athlete)}"'}
+
+def check_format(output_format: str):
+    if output_format not in RENDERERS:
+        raise HTTPException(status_code=400,
+                            detail=f"Unknown format: {output_format} (choose from {', '.join(sorted(RENDERERS))})")
+
+@router.post('')
+async def generate_plan(body: AthleteIn, request: Request,
+                        output_format: str = Query('json', alias='format'),
+                        save: bool = Query(False, description='Record the athlete in progress storage')):
+    """Generate this week's plan in the requested format.
+
+    Identical requests are answered from the response cache and honour
+    If-None-Match.
+    """
+    check_format(output_format)
+    athlete = body.to_athlete()
+    renderer = get_renderer(output_format)
+
+    if save:
+        zones = TrainingZones(athlete)
+        await request.app.state.executors.io(request.app.state.storage.save_progress, athlete, zones.zones)
+
+    return await request.app.state.response_cache.serve(
+        request, plan_cache_key(output_format, athlete), lambda: render_plan(request, output_format, athlete),
+        renderer.media_type, headers=plan_headers(renderer, athlete))
+
+@router.get('/current')
+async def current_plan(request: Request, output_format: str = Query('json', alias='format')):
+    """This week's plan for the stored athlete, cached until the progress file changes"""
+    check_format(output_format)
+    storage = request.app.state.storage
+    cache = request.app.state.response_cache
+    version = storage_version(storage)
+    key = ('current-plan', output_format)
+    if output_format == 'ics':
+        key += (date.today(),)
+
+    entry = cache.get(key, version) if version is not None else None
+    if entry is None:
+        data = await request.app.state.executors.io(storage.load_progress)
+        athlete = stored_athlete(data)
+        if athlete is None:
+            raise HTTPException(status_code=404, detail='No training data recorded yet')
+
+        renderer = get_renderer(output_format)
+        entry = CachedResponse(await render_plan(request, output_format, athlete), renderer.media_type,
+                               version, os.path.abspath(storage.filename), plan_headers(renderer, athlete))
+        if version is not None:
+            cache.put(key, entry)
+    return cache.respond(request, entry)
+
+async def _roster_items(request: Request) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (index, athlete object or parse error) from a JSON array or NDJSON body.
+
+    NDJSON is parsed line by line as it arrives, so large rosters are never
+    held in memory; a JSON array has to be read whole first.
+    """
+    chunks = request.stream()
+    buffer = b''
+    async for chunk in chunks:
+        buffer += chunk
+        if buffer.strip():
+            break
+
+    if buffer.lstrip().startswith(b'['):
+        async for chunk in chunks:
+            buffer += chunk
+        try:
+            roster = json.loads(buffer)
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON roster: {e}")
+        for index, item in enumerate(roster):
+            yield index, item
+        return
+
+    index = 0
+    while True:
+        *lines, buffer = buffer.split(b'\n')
+        for line in lines:
+            if line.strip():
+                yield index, _parse_line(line)
+                index += 1
+        chunk = await anext(chunks, None)
+        if chunk is None:
+            break
+        buffer += chunk
+    if buffer.strip():
+        yield index, _parse_line(buffer)
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return ValueError(f"Invalid JSON: {e}")
+
+async def _bulk_plan(request: Request, output_format: str, index: int, item: Any) -> Dict[str, Any]:
+    """One roster entry as an NDJSON result, with any validation error inline"""
+    try:
+        if isinstance(item, Exception):
+            raise item
+        athlete = Athlete(**AthleteIn.model_validate(item).model_dump())
+    except ValidationError as e:
+        errors = '; '.join(f"{'.'.join(map(str, err['loc'])) or 'athlete'}: {err['msg']}" for err in e.errors())
+        return {'index': index, 'ok': False, 'error': errors}
+    except (ValueError, TypeError) as e:
+        return {'index': index, 'ok': False, 'error': str(e)}
+
+    # Every failure stays on its own line, so one bad plan never cuts the stream short
+    try:
+        renderer = get_renderer(output_format)
+        result = {'index': index, 'ok': True, 'filename': renderer.filename(athlete)}
+        if output_format == 'json':
+            schedule = get_plan_cache().get_schedule(athlete)
+            result['plan'] = JSONRenderer().to_dict(athlete, schedule, TrainingZones(athlete))
+        else:
+            # Rosters repeat athletes; share rendered plans with the single-plan route
+            cache = request.app.state.response_cache
+            key = plan_cache_key(output_format, athlete)
+            entry = cache.get(key)
+            if entry is None:
+                entry = cache.put(key, CachedResponse(await render_plan(request, output_format, athlete),
+                                                      renderer.media_type, headers=plan_headers(renderer, athlete)))
+            if output_format == 'pdf':
+                result.update(encoding='base64', data=base64.b64encode(entry.body).decode('ascii'))
+            else:
+                result['data'] = entry.body.decode('utf-8')
+    except ExecutorBusy as e:
+        return {'index': index, 'ok': False, 'error': str(e), 'retry': True}
+    except Exception as e:
+        return {'index': index, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+    return result
+
+@router.post('/bulk')
+async def bulk_plans(request: Request, output_format: str = Query('json', alias='format'),
+                     concurrency: int = Query(DEFAULT_BULK_CONCURRENCY, ge=1, le=MAX_BULK_CONCURRENCY)):
+    """Plans for a whole roster, streamed as NDJSON in completion order.
+
+    The body is a JSON array or NDJSON of athletes. At most `concurrency`
+    plans are in flight; new roster entries are only read once results have
+    been written, so a slow client throttles the work instead of letting
+    finished plans pile up. Each line carries the roster index; invalid
+    athletes get an inline error. A final line summarises the batch.
+    """
+    check_format(output_format)
+    items = _roster_items(request)
+    # Read up to the first entry now, so a malformed array is still a plain 400
+    first = await anext(items, None)
+
+    async def stream() -> AsyncIterator[bytes]:
+        pending = set()
+        totals = {'total': 0, 'ok': 0, 'failed': 0}
+
+        def finished(done) -> bytes:
+            lines = []
+            for task in done:
+                result = task.result()
+                totals['total'] += 1
+                totals['ok' if result['ok'] else 'failed'] += 1
+                lines.append(json.dumps(result, separators=(',', ':')))
+            return ('\n'.join(lines) + '\n').encode('utf-8')
+
+        async def roster():
+            if first is not None:
+                yield first
+                async for entry in items:
+                    yield entry
+
+        try:
+            async for index, item in roster():
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    yield finished(done)
+                pending.add(asyncio.create_task(_bulk_plan(request, output_format, index, item)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                yield finished(done)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        yield (json.dumps({'done': True, **totals}, separators=(',', ':')) + '\n').encode('utf-8')
+
+    return StreamingResponse(stream(), media_type='application/x-ndjson')
@@ -0,0 +1,178 @@
+"""
+HTTP API latency under concurrent load.
+
+Starts the API with uvicorn in a subprocess (against a throwaway progress
+file), or targets a running server with --url, then fires requests for
+each scenario at each concurrency level and reports p50/p99 latency,
+throughput, errors and 304s ('poll' revalidates with If-None-Match the way
+the dashboard does). While a scenario runs, a probe requests
+/api/health every 20 ms. Its p99 shows whether the event loop stays
+responsive while PDFs render.
+
+Run from the backend directory:
+    python -m benchmarks.bench_api_load --concurrency 1 8 32 --requests 200
+    python -m benchmarks.bench_api_load --scenarios pdf --render-workers 2
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+
+SCENARIOS = ('json', 'pdf', 'progress', 'poll', 'max-hold', 'mixed')
+POLL_PATHS = ('/api/progress/current', '/api/plans/current')
+PROBE_INTERVAL = 0.02
+
+def athlete_body(rng: random.Random) -> dict:
+    return {
+        'current_max': rng.randint(30, 600),
+        'experience_level': rng.choice(['beginner', 'intermediate', 'advanced']),
+        'goals': rng.choice(['strength', 'endurance', 'balanced']),
+        'current_week': rng.randint(1, 6)
+    }
+
+async def send(client: httpx.AsyncClient, scenario: str, rng: random.Random,
+               etags: dict) -> httpx.Response:
+    if scenario == 'poll':
+        # A dashboard revalidating what it already has
+        path = rng.choice(POLL_PATHS)
+        headers = {'If-None-Match': etags[path]} if path in etags else {}
+        response = await client.get(path, headers=headers)
+        if 'etag' in response.headers:
+            etags[path] = response.headers['etag']
+        return response
+    if scenario == 'mixed':
+        scenario = rng.choices(['json', 'pdf', 'progress', 'max-hold'], weights=[5, 2, 5, 1])[0]
+    if scenario in ('json', 'pdf'):
+        return await client.post('/api/plans', params={'format': scenario}, json=athlete_body(rng))
+    if scenario == 'progress':
+        return await client.get('/api/progress/current')
+    return await client.put('/api/progress/max-hold', json={'max_hold': rng.randint(60, 300)})
+
+async def run_level(base_url: str, scenario: str, concurrency: int, requests: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    latencies, errors, not_modified = [], 0, 0
+    probe_latencies = []
+    etags = {}
+    remaining = requests
+    done = asyncio.Event()
+
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal remaining, errors, not_modified
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    response = await send(client, scenario, rng, etags)
+                    if response.status_code >= 400:
+                        errors += 1
+                    elif response.status_code == 304:
+                        not_modified += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get('/api/health')
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(PROBE_INTERVAL)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    latencies.sort()
+    probe_latencies.sort()
+    return {
+        'p50_ms': statistics.median(latencies),
+        'p99_ms': latencies[max(int(len(latencies) * 0.99) - 1, 0)],
+        'rps': len(latencies) / elapsed,
+        'errors': errors,
+        'not_modified': not_modified,
+        'probe_p99_ms': probe_latencies[max(int(len(probe_latencies) * 0.99) - 1, 0)] if probe_latencies else 0.0
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(port: int, directory: str, render_workers) -> subprocess.Popen:
+    env = dict(os.environ, BREATH_HOLD_PROGRESS_FILE=os.path.join(directory, 'progress.json'),
+               PYTHONWARNINGS='ignore')
+    if render_workers is not None:
+        env['BREATH_HOLD_RENDER_WORKERS'] = str(render_workers)
+    return subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'api.main:app', '--port', str(port), '--log-level', 'warning'],
+        env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def wait_ready(base_url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"API did not start at {base_url}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario and level')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--render-workers', type=int, help='PDF render processes for the started server')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = None
+        base_url = args.url
+        if base_url is None:
+            base_url = f"http://127.0.0.1:{free_port()}"
+            server = start_server(int(base_url.rsplit(':', 1)[1]), directory, args.render_workers)
+        try:
+            wait_ready(base_url)
+            # Progress routes need a current record
+            httpx.post(f"{base_url}/api/plans", params={'save': 'true'},
+                       json=athlete_body(random.Random(args.seed))).raise_for_status()
+
+            print(f"{os.cpu_count()} CPUs, {args.requests} requests per run")
+            print(f"{'scenario':>9} {'conc':>5} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>8} {'errors':>6} "
+                  f"{'304s':>5} {'health p99':>10}")
+            ok = True
+            for scenario in args.scenarios:
+                for concurrency in args.concurrency:
+                    result = asyncio.run(run_level(base_url, scenario, concurrency, args.requests, args.seed))
+                    ok = ok and result['errors'] == 0
+                    print(f"{scenario:>9} {concurrency:>5} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} "
+                          f"{result['rps']:>8.1f} {result['errors']:>6} {result['not_modified']:>5} "
+                          f"{result['probe_p99_ms']:>10.1f}")
+            cache = httpx.get(f"{base_url}/api/health").json().get('response_cache')
+            if cache:
+                print(f"\nresponse cache: {cache['hits']} hits, {cache['misses']} misses, "
+                      f"{cache['not_modified']} not modified, {cache['invalidations']} invalidated")
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
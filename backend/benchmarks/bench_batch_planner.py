@@ -0,0 +1,95 @@
+"""
+Throughput of BatchPlanner against the per-athlete scalar path.
+
+Builds a fixed-seed synthetic roster, checks that every batch round time
+matches TrainingZones/SessionGenerator exactly, then times both paths.
+
+Run from the backend directory:
+    python -m benchmarks.bench_batch_planner --sizes 10000 1000000
+"""
+import argparse
+import sys
+import time
+import numpy as np
+from breath_hold_training.config.constants import SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.batch import BatchPlanner
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.core.training_zones import TrainingZones
+
+def synthetic_roster(size: int, seed: int = 42) -> dict:
+    """Columnar athlete inputs covering every level, goal, week and progress bucket"""
+    rng = np.random.default_rng(seed)
+    current_max = rng.integers(30, 601, size)
+    previous_max = np.where(rng.random(size) < 0.2, 0, (current_max / rng.uniform(0.8, 1.4, size)).astype(np.int64))
+    return {
+        'current_max': current_max,
+        'previous_max': np.maximum(previous_max, 0),
+        'level': rng.integers(0, len(SUPPORTED_EXPERIENCE_LEVELS), size),
+        'goal': rng.integers(0, len(SUPPORTED_GOALS), size),
+        'week': rng.integers(1, 7, size),
+    }
+
+def scalar_rounds(roster: dict, index: int) -> dict:
+    """Round times for one athlete through the object-per-athlete path"""
+    athlete = Athlete(
+        current_max=int(roster['current_max'][index]),
+        previous_max=int(roster['previous_max'][index]) or None,
+        experience_level=SUPPORTED_EXPERIENCE_LEVELS[roster['level'][index]],
+        goals=SUPPORTED_GOALS[roster['goal'][index]],
+        current_week=int(roster['week'][index])
+    )
+    session_gen = SessionGenerator(athlete, TrainingZones(athlete))
+    sessions = {
+        'co2_recovery': session_gen.generate_co2_table("recovery"),
+        'co2_standard': session_gen.generate_co2_table("standard"),
+        'o2': session_gen.generate_o2_table(),
+        'performance_test': session_gen.generate_performance_test(),
+        'technique': session_gen.generate_technique_session(),
+    }
+    return {
+        name: [(r.hold, r.rest) for r in session.rounds]
+        for name, session in sessions.items()
+    }
+
+def check_exact(roster: dict, planner: BatchPlanner, sessions: dict, limit: int) -> int:
+    """Compare batch output with the scalar path; returns the mismatch count"""
+    mismatches = 0
+    for i in range(min(limit, len(planner))):
+        if planner.athlete_rounds(i, sessions) != scalar_rounds(roster, i):
+            mismatches += 1
+    return mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--scalar-limit', type=int, default=10_000,
+                        help='athletes to run through the scalar path for checking and timing')
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'athletes':>10} {'batch s':>9} {'batch/s':>12} {'scalar/s':>10} {'speedup':>8} {'mismatches':>10}")
+    for size in args.sizes:
+        roster = synthetic_roster(size)
+
+        start = time.perf_counter()
+        planner = BatchPlanner(**roster)
+        sessions = planner.generate_rounds()
+        batch_s = time.perf_counter() - start
+
+        checked = min(size, args.scalar_limit)
+        start = time.perf_counter()
+        for i in range(checked):
+            scalar_rounds(roster, i)
+        scalar_rate = checked / (time.perf_counter() - start)
+
+        mismatches = check_exact(roster, planner, sessions, args.scalar_limit)
+        ok = ok and mismatches == 0
+        batch_rate = size / batch_s
+        print(f"{size:>10} {batch_s:>9.3f} {batch_rate:>12.0f} {scalar_rate:>10.0f} "
+              f"{batch_rate / scalar_rate:>7.1f}x {mismatches:>10}")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
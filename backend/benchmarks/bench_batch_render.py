@@ -0,0 +1,58 @@
+"""
+Roster PDF rendering throughput against worker count.
+
+Run from the backend directory:
+    python -m benchmarks.bench_batch_render --athletes 200 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from breath_hold_training.config.constants import SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.generators.batch_render import render_batch
+
+def synthetic_athletes(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        Athlete(
+            current_max=rng.randint(30, 600),
+            experience_level=rng.choice(SUPPORTED_EXPERIENCE_LEVELS),
+            goals=rng.choice(SUPPORTED_GOALS),
+            current_week=rng.randint(1, 6)
+        )
+        for _ in range(count)
+    ]
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--athletes', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, max(cpus // 2, 1), cpus}))
+    parser.add_argument('--chunksize', type=int, default=8)
+    parser.add_argument('--bytes', action='store_true', help='return PDF bytes instead of writing files')
+    args = parser.parse_args()
+
+    athletes = synthetic_athletes(args.athletes)
+    print(f"{cpus} CPUs, {args.athletes} plans, chunksize {args.chunksize}")
+    print(f"{'workers':>7} {'seconds':>8} {'plans/s':>8} {'failed':>6}")
+
+    ok = True
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            results = render_batch(athletes, output_dir=None if args.bytes else directory,
+                                   workers=workers, chunksize=args.chunksize)
+            elapsed = time.perf_counter() - start
+
+        failed = sum(1 for result in results if not result.ok)
+        ok = ok and failed == 0
+        print(f"{workers:>7} {elapsed:>8.2f} {len(results) / elapsed:>8.1f} {failed:>6}")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Roster plans: one streamed bulk request vs. a request per athlete.
+
+For each roster size, times POST /api/plans/bulk against the same
+athletes sent as separate POST /api/plans requests at the same
+concurrency. Each run gets a freshly started uvicorn server, so both start
+with a cold response cache and the peak RSS (VmHWM) is the run's own. With
+--url all runs share one server and RSS is not reported.
+
+Run from the backend directory:
+    python -m benchmarks.bench_bulk_stream --athletes 50 200 --format json pdf
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+import httpx
+from benchmarks.bench_api_load import athlete_body, free_port, start_server, wait_ready
+
+def peak_rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+async def run_bulk(base_url: str, roster: list, output_format: str, concurrency: int) -> dict:
+    body = ''.join(json.dumps(athlete) + '\n' for athlete in roster)
+    first, failed, lines = None, 0, 0
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        start = time.perf_counter()
+        async with client.stream('POST', '/api/plans/bulk', content=body,
+                                 params={'format': output_format, 'concurrency': concurrency},
+                                 headers={'Content-Type': 'application/x-ndjson'}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                result = json.loads(line)
+                if result.get('done'):
+                    failed = result['failed']
+                    continue
+                if first is None:
+                    first = time.perf_counter() - start
+                lines += 1
+        total = time.perf_counter() - start
+    return {'first_ms': (first or total) * 1000, 'total_ms': total * 1000, 'plans': lines, 'failed': failed}
+
+async def run_separate(base_url: str, roster: list, output_format: str, concurrency: int) -> dict:
+    queue = list(enumerate(roster))
+    first, failed = None, 0
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        start = time.perf_counter()
+
+        async def worker():
+            nonlocal first, failed
+            while queue:
+                _, athlete = queue.pop()
+                response = await client.post('/api/plans', params={'format': output_format}, json=athlete)
+                if response.status_code != 200:
+                    failed += 1
+                if first is None:
+                    first = time.perf_counter() - start
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        total = time.perf_counter() - start
+    return {'first_ms': (first or total) * 1000, 'total_ms': total * 1000, 'plans': len(roster), 'failed': failed}
+
+def measure(args, run, roster: list, output_format: str):
+    """One run against --url or a fresh server; returns the result and peak RSS in kB"""
+    if args.url:
+        return asyncio.run(run(args.url, roster, output_format, args.concurrency)), 0
+    with tempfile.TemporaryDirectory() as directory:
+        base_url = f"http://127.0.0.1:{free_port()}"
+        server = start_server(int(base_url.rsplit(':', 1)[1]), directory, args.render_workers)
+        try:
+            wait_ready(base_url)
+            result = asyncio.run(run(base_url, roster, output_format, args.concurrency))
+            return result, peak_rss_kb(server.pid)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--athletes', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--format', nargs='+', default=['json', 'pdf'], dest='formats')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--render-workers', type=int, help='PDF render processes for the started server')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'format':>6} {'athletes':>8} {'mode':>8} {'first ms':>9} {'total ms':>9} "
+          f"{'failed':>6} {'peak RSS MB':>11}")
+    ok = True
+    for output_format in args.formats:
+        for size in args.athletes:
+            rng = random.Random(args.seed)
+            roster = [athlete_body(rng) for _ in range(size)]
+            for mode, run in (('bulk', run_bulk), ('separate', run_separate)):
+                result, rss = measure(args, run, roster, output_format)
+                ok = ok and result['failed'] == 0 and result['plans'] == size
+                rss = f"{rss / 1024:.1f}" if rss else '-'
+                print(f"{output_format:>6} {size:>8} {mode:>8} {result['first_ms']:>9.1f} "
+                      f"{result['total_ms']:>9.1f} {result['failed']:>6} {rss:>11}")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
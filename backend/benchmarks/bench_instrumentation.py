@@ -0,0 +1,77 @@
+"""
+Cost of the pipeline instrumentation, disabled and enabled.
+
+Times one timed() wrapper against the bare function, then the schedule
+pipeline (Athlete, TrainingZones, SessionGenerator, ScheduleGenerator) and
+a full PDF plan with metrics disabled and enabled. The disabled overhead
+should be lost in the noise.
+
+Run from the backend directory:
+    python -m benchmarks.bench_instrumentation --iterations 2000
+"""
+import argparse
+import statistics
+import sys
+import time
+import warnings
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.generators.pdf_generator import PDFGenerator
+from breath_hold_training.generators.schedule import ScheduleGenerator
+from breath_hold_training.utils import instrumentation
+
+def schedule_pipeline():
+    athlete = Athlete(current_max=150, experience_level='intermediate', goals='balanced', current_week=2)
+    zones = TrainingZones(athlete)
+    return athlete, zones, ScheduleGenerator(athlete, SessionGenerator(athlete, zones)).generate_weekly_schedule()
+
+def pdf_pipeline():
+    athlete, zones, schedule = schedule_pipeline()
+    pdf_gen = PDFGenerator(athlete, zones)
+    pdf_gen.generate_complete_plan(schedule)
+    return pdf_gen.to_bytes()
+
+def per_call_us(fn, iterations: int, repeats: int = 5) -> float:
+    """Median of repeats of the mean time per call, in microseconds"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        samples.append((time.perf_counter() - start) / iterations * 1e6)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000, help='schedule pipelines per repeat')
+    parser.add_argument('--pdf-iterations', type=int, default=50)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', DeprecationWarning)
+
+    def bare():
+        return None
+    wrapped = instrumentation.timed('noop')(bare)
+
+    instrumentation.disable()
+    bare_us = per_call_us(bare, args.iterations * 50)
+    wrapper_us = per_call_us(wrapped, args.iterations * 50)
+    print(f"timed() wrapper, disabled: {(wrapper_us - bare_us) * 1000:.0f} ns per call")
+
+    print(f"{'pipeline':>9} {'disabled us':>12} {'enabled us':>11} {'overhead':>9}")
+    ok = True
+    for name, fn, iterations in (('schedule', schedule_pipeline, args.iterations),
+                                 ('pdf', pdf_pipeline, args.pdf_iterations)):
+        instrumentation.disable()
+        disabled = per_call_us(fn, iterations)
+        instrumentation.enable()
+        enabled = per_call_us(fn, iterations)
+        instrumentation.disable()
+        instrumentation.get_metrics().reset()
+        print(f"{name:>9} {disabled:>12.1f} {enabled:>11.1f} {(enabled / disabled - 1) * 100:>8.1f}%")
+        ok = ok and disabled > 0
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Background job queue throughput and latency by worker count.
+
+Enqueues a roster of PDF jobs into a throwaway SQLite queue (a share of
+them duplicates of earlier athletes, which dedupe while in flight), drains
+it with JobWorkers over the API's executors, and reports drain time,
+jobs/s and the queue's wait/run/total latency percentiles. Use it to pick
+BREATH_HOLD_JOB_WORKERS and BREATH_HOLD_RENDER_WORKERS.
+
+Run from the backend directory:
+    python -m benchmarks.bench_job_queue --jobs 200 --workers 1 2 4
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+from api.executors import Executors
+from api.jobs import JobWorkers
+from breath_hold_training.data.job_queue import JobQueue
+from benchmarks.bench_api_load import athlete_body
+
+async def drain(directory: str, jobs: int, workers: int, render_workers: int, duplicates: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    roster = []
+    for _ in range(jobs):
+        roster.append(rng.choice(roster) if roster and rng.random() < duplicates else athlete_body(rng))
+
+    queue = JobQueue(os.path.join(directory, f"jobs-{workers}.db"))
+    executors = Executors(render_workers, max_pending=jobs + workers)
+    pool = JobWorkers(queue, executors, workers, poll_interval=0.05)
+    try:
+        start = time.perf_counter()
+        pool.start()
+        for athlete in roster:
+            await executors.io(queue.enqueue, 'pdf', athlete)
+            pool.notify()
+        while True:
+            stats = await executors.io(queue.stats)
+            if stats['depth']['queued'] == 0 and stats['depth']['running'] == 0:
+                break
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - start
+    finally:
+        await pool.stop()
+        executors.shutdown()
+        queue.close()
+    stats['elapsed'] = elapsed
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--render-workers', type=int, default=None, help='PDF render processes (default CPU count)')
+    parser.add_argument('--duplicates', type=float, default=0.2, help='share of jobs repeating an earlier athlete')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    warnings.simplefilter('ignore', DeprecationWarning)
+
+    print(f"{os.cpu_count()} CPUs, {args.jobs} jobs, {args.duplicates:.0%} duplicates")
+    print(f"{'workers':>7} {'rendered':>8} {'deduped':>7} {'drain s':>8} {'jobs/s':>7} "
+          f"{'wait p95':>9} {'run p50':>8} {'total p95':>10}")
+    ok = True
+    with tempfile.TemporaryDirectory() as directory:
+        for workers in args.workers:
+            stats = asyncio.run(drain(directory, args.jobs, workers, args.render_workers, args.duplicates, args.seed))
+            done = stats['depth']['done']
+            ok = ok and stats['depth']['failed'] == 0
+            print(f"{workers:>7} {done:>8} {stats['deduplicated']:>7} {stats['elapsed']:>8.2f} "
+                  f"{done / stats['elapsed']:>7.1f} {stats['wait_ms']['p95']:>9.1f} "
+                  f"{stats['run_ms']['p50']:>8.1f} {stats['total_ms']['p95']:>10.1f}")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Per-document render cost of a weekly plan with the shared page layout
+against the previous per-document drawing code.
+
+The legacy renderer below reproduces the old PDFGenerator drawing: the
+'Arial' alias and the deprecated ln= cell argument on every call (both go
+through fpdf2's deprecation path), rounds table headers and focus labels
+rebuilt per page, and eight empty bordered cells for the notes ruling.
+Stamped blocks are translated into place, so the two PDFs differ in bytes;
+the benchmark checks that every page draws the same rectangles, lines and
+text at the same positions (within 0.02 pt). Time is measured with
+tracemalloc off; peak traced memory is measured on separate runs.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_layout --repeat 50
+"""
+import argparse
+import datetime
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+import warnings
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.generators.schedule import ScheduleGenerator
+from breath_hold_training.generators.pdf_generator import PDFGenerator
+from breath_hold_training.utils.time_utils import format_time
+
+CREATION_DATE = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+TRANSLATE = re.compile(r'q 1 0 0 1 0 (-?[\d.]+) cm')
+FONT_SELECT = re.compile(r'BT /F\d+ [\d.]+ Tf ET')
+# Operators whose second operand is a y coordinate
+Y_OPERATORS = {'re', 'Td', 'm', 'l'}
+TOLERANCE = 0.02
+
+class LegacyPDFGenerator(PDFGenerator):
+    """PDFGenerator drawing as it did before the shared page layout"""
+
+    def header(self):
+        self.set_font('Arial', 'B', 16)
+        title = f"Adaptive Breath-Hold Training - Week {self.week}/{self.athlete.total_weeks}"
+        self.cell(0, 10, title, 0, 1, 'C')
+
+        self.set_font('Arial', '', 10)
+        progress_info = f"Current Max: {format_time(self.athlete.current_max)} | "
+        if self.athlete.previous_max and self.athlete.previous_max > 0:
+            improvement = self.athlete.current_max - self.athlete.previous_max
+            progress_info += f"Progress: +{format_time(improvement)} | "
+        progress_info += f"Level: {self.athlete.experience_level.title()}"
+
+        self.cell(0, 5, progress_info, 0, 1, 'C')
+        self.ln(5)
+
+    def _draw_overview(self, schedule):
+        self.set_font('Arial', 'B', 14)
+        self.cell(0, 10, f'Personalized Training Plan - {self.athlete.goals.title()} Focus', 0, 1, 'L')
+        self.ln(5)
+
+        self.set_font('Arial', '', 11)
+        stats_text = f"Experience: {self.athlete.experience_level.title()} | "
+        stats_text += f"Current Max: {format_time(self.athlete.current_max)}"
+        if self.athlete.previous_max and self.athlete.previous_max > 0:
+            improvement = ((self.athlete.current_max - self.athlete.previous_max) / self.athlete.previous_max) * 100
+            stats_text += f" | Recent Progress: {improvement:.1f}%"
+
+        self.multi_cell(0, 6, stats_text)
+        self.ln(10)
+
+        self.set_font('Arial', 'B', 12)
+        self.cell(0, 8, 'This Week\'s Schedule:', 0, 1)
+        self.ln(5)
+
+        for day, session in schedule.items():
+            self.set_font('Arial', 'B', 10)
+            self.cell(0, 6, f"{day}: {session.get('type', 'Rest')}", 0, 1)
+            if 'description' in session:
+                self.set_font('Arial', '', 9)
+                self.cell(0, 5, f"  {session['description']}", 0, 1)
+
+        self.ln(10)
+
+    def _draw_session_detail(self, day, session):
+        self.add_page()
+        self.set_font('Arial', 'B', 14)
+        self.cell(0, 10, f'{day} - {session["type"]}', 0, 1)
+        self.ln(5)
+
+        if 'description' in session:
+            self.set_font('Arial', '', 11)
+            self.multi_cell(0, 6, session['description'])
+            self.ln(5)
+
+        if 'rounds' in session:
+            self._draw_rounds_table(session['rounds'])
+
+        self.set_font('Arial', 'B', 11)
+        self.cell(0, 8, 'Notes & Performance:', 0, 1)
+        for i in range(8):
+            self.cell(0, 8, '', 'B', 1)
+
+    def _draw_rounds_table(self, rounds):
+        headers = ['Round', 'Hold Time', 'Rest', 'Target RPE']
+        if 'focus' in rounds[0]:
+            headers.append('Focus')
+
+        col_widths = [20, 30, 30, 30] + ([70] if len(headers) > 4 else [])
+
+        self.set_font('Arial', 'B', 10)
+        for i, header in enumerate(headers):
+            self.cell(col_widths[i], 8, header, 1, 0, 'C')
+        self.ln()
+
+        self.set_font('Arial', '', 9)
+        for round_data in rounds:
+            self.cell(col_widths[0], 8, str(round_data['round']), 1, 0, 'C')
+            self.cell(col_widths[1], 8, round_data['hold_time'], 1, 0, 'C')
+            self.cell(col_widths[2], 8, round_data['rest_time'], 1, 0, 'C')
+            self.cell(col_widths[3], 8, round_data.get('target_rpe', ''), 1, 0, 'C')
+
+            if 'focus' in round_data:
+                focus_text = round_data['focus'][:25] + '...' if len(round_data['focus']) > 25 else round_data['focus']
+                self.cell(col_widths[4], 8, focus_text, 1, 0, 'L')
+
+            self.ln()
+
+        self.ln(5)
+
+def build_inputs():
+    athlete = Athlete(current_max=150, previous_max=130, experience_level='intermediate',
+                      goals='balanced', current_week=2)
+    zones = TrainingZones(athlete)
+    schedule = ScheduleGenerator(athlete, SessionGenerator(athlete, zones)).generate_weekly_schedule()
+    return athlete, zones, schedule
+
+def drawing_ops(generator_class, athlete, zones, schedule):
+    """Drawing operators per page with stamp translations applied.
+
+    Font selections and the q/cm/Q wrapper around stamps are dropped since
+    only where things land on the page matters.
+    """
+    pdf_gen = generator_class(athlete, zones)
+    pdf_gen.generate_complete_plan(schedule)
+    pages = []
+    for number in range(1, pdf_gen.pages_count + 1):
+        shift, page = 0.0, []
+        for line in bytes(pdf_gen.pages[number].contents).decode('latin-1').splitlines():
+            match = TRANSLATE.match(line)
+            if match:
+                shift = float(match.group(1))
+            elif line == 'Q':
+                shift = 0.0
+            elif line and not FONT_SELECT.fullmatch(line):
+                operands = []
+                for token in line.split():
+                    try:
+                        operands.append(float(token))
+                        continue
+                    except ValueError:
+                        pass
+                    if token in Y_OPERATORS:
+                        operands[1] += shift
+                    page.append((token, tuple(operands)))
+                    operands = []
+        pages.append(page)
+    return pages
+
+def same_drawing(left, right) -> bool:
+    if len(left) != len(right):
+        return False
+    for left_page, right_page in zip(left, right):
+        if len(left_page) != len(right_page):
+            return False
+        for (left_op, left_args), (right_op, right_args) in zip(left_page, right_page):
+            if left_op != right_op or len(left_args) != len(right_args):
+                return False
+            if any(abs(a - b) > TOLERANCE for a, b in zip(left_args, right_args)):
+                return False
+    return True
+
+def render(generator_class, athlete, zones, schedule) -> bytes:
+    pdf_gen = generator_class(athlete, zones)
+    pdf_gen.set_creation_date(CREATION_DATE)
+    pdf_gen.generate_complete_plan(schedule)
+    return pdf_gen.to_bytes()
+
+def measure(generator_class, repeat: int, inputs) -> dict:
+    render(generator_class, *inputs)
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        render(generator_class, *inputs)
+        latencies.append((time.perf_counter_ns() - start) / 1e6)
+
+    peaks = []
+    for _ in range(max(repeat // 10, 3)):
+        tracemalloc.start()
+        render(generator_class, *inputs)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1024)
+        tracemalloc.stop()
+
+    return {'p50_ms': statistics.median(latencies), 'mean_ms': statistics.fmean(latencies),
+            'peak_kib': statistics.median(peaks)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    # As outside __main__: deprecations are still raised (and their call
+    # stacks walked) by fpdf2, just not printed
+    warnings.simplefilter('ignore', DeprecationWarning)
+    inputs = build_inputs()
+    identical = same_drawing(drawing_ops(LegacyPDFGenerator, *inputs), drawing_ops(PDFGenerator, *inputs))
+    results = {name: measure(generator_class, args.repeat, inputs)
+               for name, generator_class in (('legacy', LegacyPDFGenerator), ('layout', PDFGenerator))}
+
+    print(f"{'renderer':>8} {'p50 ms':>8} {'mean ms':>8} {'peak KiB':>9}")
+    for name, result in results.items():
+        print(f"{name:>8} {result['p50_ms']:>8.2f} {result['mean_ms']:>8.2f} {result['peak_kib']:>9.1f}")
+
+    legacy, layout = results['legacy'], results['layout']
+    print(f"\nPer document: {legacy['p50_ms'] - layout['p50_ms']:.2f} ms faster "
+          f"({(1 - layout['p50_ms'] / legacy['p50_ms']) * 100:.0f}%), "
+          f"{legacy['peak_kib'] - layout['peak_kib']:.1f} KiB lower peak; "
+          f"pages {'match' if identical else 'DIFFER'}")
+    sys.exit(0 if identical else 1)
+
+if __name__ == '__main__':
+    main()
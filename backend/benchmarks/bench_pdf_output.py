@@ -0,0 +1,107 @@
+"""
+In-memory PDF output against the write-to-disk-and-read-back path.
+
+A web handler using save_pdf has to write the file, read it back into the
+response and delete it. This compares that with PDFGenerator.to_bytes(),
+timing only the output stage and counting I/O syscalls from /proc/self/io
+(Linux) plus open/unlink events seen by an audit hook.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_output --repeat 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.generators.schedule import ScheduleGenerator
+from breath_hold_training.generators.pdf_generator import PDFGenerator
+
+FILE_EVENTS = {'open', 'os.remove', 'os.unlink', 'os.rename', 'os.replace'}
+_file_events = 0
+
+def _audit(event, _args):
+    global _file_events
+    if event in FILE_EVENTS:
+        _file_events += 1
+
+def _io_syscalls() -> int:
+    try:
+        with open('/proc/self/io') as f:
+            fields = dict(line.split(': ') for line in f.read().splitlines())
+        return int(fields['syscr']) + int(fields['syscw'])
+    except OSError:
+        return 0
+
+def build_pdf() -> PDFGenerator:
+    athlete = Athlete(current_max=150, previous_max=130, experience_level='intermediate',
+                      goals='balanced', current_week=2)
+    zones = TrainingZones(athlete)
+    schedule = ScheduleGenerator(athlete, SessionGenerator(athlete, zones)).generate_weekly_schedule()
+    pdf_gen = PDFGenerator(athlete, zones)
+    pdf_gen.generate_complete_plan(schedule)
+    return pdf_gen
+
+def via_file(pdf_gen: PDFGenerator, directory: str) -> bytes:
+    filename = os.path.join(directory, 'plan.pdf')
+    pdf_gen.save_pdf(filename)
+    with open(filename, 'rb') as f:
+        body = f.read()
+    os.remove(filename)
+    return body
+
+def via_memory(pdf_gen: PDFGenerator, _directory: str) -> bytes:
+    return pdf_gen.to_bytes()
+
+def _probe_overhead() -> int:
+    """Syscalls spent reading /proc/self/io itself"""
+    before = _io_syscalls()
+    return _io_syscalls() - before
+
+def measure(path, repeat: int, directory: str) -> dict:
+    global _file_events
+    overhead = _probe_overhead()
+    latencies, syscalls, events = [], 0, 0
+    for _ in range(repeat):
+        pdf_gen = build_pdf()
+        before = _io_syscalls()
+        _file_events = 0
+        start = time.perf_counter_ns()
+        path(pdf_gen, directory)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+        events += _file_events
+        syscalls += _io_syscalls() - before - overhead
+    latencies.sort()
+    return {
+        'p50_us': statistics.median(latencies),
+        'p99_us': latencies[int(len(latencies) * 0.99) - 1],
+        'io_syscalls': syscalls / repeat,
+        'file_events': events / repeat,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    sys.addaudithook(_audit)
+    with tempfile.TemporaryDirectory() as directory:
+        results = {name: measure(path, args.repeat, directory)
+                   for name, path in (('file', via_file), ('memory', via_memory))}
+
+    print(f"{'path':>7} {'p50 us':>9} {'p99 us':>9} {'io syscalls':>12} {'open/unlink':>12}")
+    for name, result in results.items():
+        print(f"{name:>7} {result['p50_us']:>9.1f} {result['p99_us']:>9.1f} "
+              f"{result['io_syscalls']:>12.1f} {result['file_events']:>12.1f}")
+
+    saved = results['file']['p50_us'] - results['memory']['p50_us']
+    print(f"\nSaved per request: {saved:.1f} us p50, "
+          f"{results['file']['io_syscalls'] - results['memory']['io_syscalls']:.1f} read/write syscalls, "
+          f"{results['file']['file_events'] - results['memory']['file_events']:.1f} open/unlink calls")
+
+if __name__ == '__main__':
+    main()
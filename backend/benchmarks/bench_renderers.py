@@ -0,0 +1,82 @@
+"""
+Per-plan render cost of each output format.
+
+Weekly schedules for a fixed-seed population are generated up front, so
+only the renderer is timed. PDFs are rendered without the on-disk cache.
+
+Run from the backend directory:
+    python -m benchmarks.bench_renderers --plans 100
+    python -m benchmarks.bench_renderers --formats json ics
+"""
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import time
+import warnings
+from breath_hold_training.config.constants import SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.generators.schedule import ScheduleGenerator
+from breath_hold_training.generators.renderers import RENDERERS, get_renderer
+
+def synthetic_plans(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    plans = []
+    for _ in range(count):
+        current_max = rng.randint(30, 600)
+        athlete = Athlete(
+            current_max=current_max,
+            previous_max=rng.choice([None, max(current_max - rng.randint(0, 40), 1)]),
+            experience_level=rng.choice(SUPPORTED_EXPERIENCE_LEVELS),
+            goals=rng.choice(SUPPORTED_GOALS),
+            current_week=rng.randint(1, 6)
+        )
+        zones = TrainingZones(athlete)
+        schedule = ScheduleGenerator(athlete, SessionGenerator(athlete, zones)).generate_weekly_schedule()
+        plans.append((athlete, schedule, zones))
+    return plans
+
+def measure(renderer, plans, repeat: int) -> dict:
+    for athlete, schedule, zones in plans[:5]:
+        renderer.render(athlete, schedule, zones)
+
+    latencies, sizes = [], []
+    for _ in range(repeat):
+        for athlete, schedule, zones in plans:
+            start = time.perf_counter_ns()
+            data = renderer.render(athlete, schedule, zones)
+            latencies.append((time.perf_counter_ns() - start) / 1000)
+            sizes.append(len(data))
+    return {
+        'p50_us': statistics.median(latencies),
+        'mean_us': statistics.fmean(latencies),
+        'bytes': statistics.fmean(sizes)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--plans', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--formats', nargs='+', choices=sorted(RENDERERS), default=sorted(RENDERERS))
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', DeprecationWarning)
+    plans = synthetic_plans(args.plans)
+    options = {'ics': {'start_date': datetime.date(2024, 1, 1),
+                       'timestamp': datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)}}
+    results = {name: measure(get_renderer(name, **options.get(name, {})), plans, args.repeat)
+               for name in args.formats}
+
+    slowest = max(result['p50_us'] for result in results.values())
+    print(f"{args.plans} plans x {args.repeat}")
+    print(f"{'format':>6} {'p50 us':>10} {'mean us':>10} {'avg bytes':>10} {'vs slowest':>10}")
+    for name, result in sorted(results.items(), key=lambda item: item[1]['p50_us']):
+        print(f"{name:>6} {result['p50_us']:>10.1f} {result['mean_us']:>10.1f} "
+              f"{result['bytes']:>10.0f} {slowest / result['p50_us']:>9.1f}x")
+    sys.exit(0)
+
+if __name__ == '__main__':
+    main()
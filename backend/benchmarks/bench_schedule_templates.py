@@ -0,0 +1,78 @@
+"""
+Template-driven ScheduleGenerator against the previous eager path.
+
+The eager path built all six generated sessions and then overwrote days for
+the goal and the deload week, discarding up to four sessions per call.
+
+Run from the backend directory:
+    python -m benchmarks.bench_schedule_templates --repeat 2000
+"""
+import argparse
+import itertools
+import sys
+import time
+from breath_hold_training.config.constants import SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS, DEFAULT_TOTAL_WEEKS
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.models import Session, SessionKind
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.generators.schedule import ScheduleGenerator
+
+def eager_weekly_schedule(athlete: Athlete, session_gen: SessionGenerator) -> dict:
+    """The pre-template generate_weekly_schedule"""
+    base_schedule = {
+        'Monday': session_gen.generate_co2_table("recovery"),
+        'Tuesday': session_gen.generate_performance_test(),
+        'Wednesday': Session(SessionKind.ACTIVE_RECOVERY, 'Light mobility, breathing technique practice'),
+        'Thursday': session_gen.generate_o2_table(),
+        'Friday': session_gen.generate_co2_table("standard"),
+        'Saturday': session_gen.generate_technique_session(),
+        'Sunday': Session(SessionKind.REST, 'Full recovery day')
+    }
+    if athlete.goals == 'strength':
+        base_schedule['Saturday'] = session_gen.generate_co2_table("recovery")
+    elif athlete.goals == 'endurance':
+        base_schedule['Wednesday'] = session_gen.generate_technique_session()
+    if athlete.current_week == 4:
+        base_schedule['Tuesday'] = session_gen.generate_technique_session()
+        base_schedule['Thursday'] = session_gen.generate_co2_table("recovery")
+        base_schedule['Friday'] = session_gen.generate_technique_session()
+    return base_schedule
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=2000, help='schedules per combination')
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'goal':>10} {'week':>4} {'eager us':>9} {'template us':>11} {'speedup':>8}")
+    for goals, week in itertools.product(SUPPORTED_GOALS, (1, 4)):
+        generators = []
+        for level in SUPPORTED_EXPERIENCE_LEVELS:
+            athlete = Athlete(current_max=150, experience_level=level, goals=goals, current_week=week,
+                              total_weeks=DEFAULT_TOTAL_WEEKS)
+            session_gen = SessionGenerator(athlete, TrainingZones(athlete))
+            schedule_gen = ScheduleGenerator(athlete, session_gen)
+            ok = ok and eager_weekly_schedule(athlete, session_gen) == schedule_gen.generate_weekly_schedule()
+            generators.append((athlete, session_gen, schedule_gen))
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for athlete, session_gen, _schedule_gen in generators:
+                eager_weekly_schedule(athlete, session_gen)
+        eager_us = (time.perf_counter() - start) / (args.repeat * len(generators)) * 1e6
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _athlete, _session_gen, schedule_gen in generators:
+                schedule_gen.generate_weekly_schedule()
+        template_us = (time.perf_counter() - start) / (args.repeat * len(generators)) * 1e6
+
+        print(f"{goals:>10} {week:>4} {eager_us:>9.1f} {template_us:>11.1f} {eager_us / template_us:>7.2f}x")
+
+    if not ok:
+        print("Template schedules differ from the eager path")
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Cold-start cost of the CLI paths, measured with python -X importtime.
+
+Each path runs in fresh interpreters: 'update' imports what the update
+command touches (the CLI and ProgressStorage), 'plan' builds and renders
+a JSON plan, 'pdf' renders a PDF. Reports the median wall time and import
+time per path, whether fpdf/numpy were loaded, and the heaviest imports.
+'bare' is the interpreter on its own.
+
+Run from the backend directory:
+    python -m benchmarks.bench_startup --repeats 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+SETUP = "from breath_hold_training.cli.interface import main\n"
+PLAN = SETUP + """\
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.generators.plan_cache import get_plan_cache
+from breath_hold_training.generators.renderers import get_renderer
+athlete = Athlete(current_max=150, experience_level='intermediate', goals='balanced', current_week=2)
+schedule = get_plan_cache().get_schedule(athlete)
+"""
+PATHS = {
+    'bare': "pass\n",
+    'update': SETUP + "from breath_hold_training.data.storage import ProgressStorage\n"
+                      "ProgressStorage(os.devnull + '.json').get_current_data()\n",
+    'plan': PLAN + "get_renderer('json').render(athlete, schedule, TrainingZones(athlete))\n",
+    'pdf': PLAN + "get_renderer('pdf').render(athlete, schedule, TrainingZones(athlete))\n",
+}
+REPORT = "import sys\nprint(' '.join(m for m in ('fpdf', 'numpy') if m in sys.modules), file=sys.stderr)\n"
+
+def run(code: str) -> Tuple[float, List[Tuple[int, int, str]], str]:
+    """Wall seconds, importtime rows (self us, cumulative us, name) and heavy modules loaded"""
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', 'import os\n' + code + REPORT],
+                          cwd=backend, capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+
+    rows, lines = [], proc.stderr.splitlines()
+    for line in lines:
+        if line.startswith('import time:') and not line.startswith('import time: self'):
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return wall, rows, lines[-1].strip() if lines else ''
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--paths', nargs='+', choices=list(PATHS), default=list(PATHS))
+    parser.add_argument('--top', type=int, default=5, help='heaviest top-level imports to list per path')
+    args = parser.parse_args()
+
+    print(f"{'path':>7} {'wall ms':>8} {'import ms':>10}  heavy modules")
+    heaviest: Dict[str, List[Tuple[int, str]]] = {}
+    for path in args.paths:
+        walls, imports = [], []
+        for _ in range(args.repeats):
+            wall, rows, loaded = run(PATHS[path])
+            # Top-level imports are the rows whose name is not indented
+            top = [(cumulative, name.strip()) for _, cumulative, name in rows if not name.startswith('   ')]
+            walls.append(wall * 1000)
+            imports.append(sum(cumulative for cumulative, _ in top) / 1000)
+        heaviest[path] = sorted(top, reverse=True)[:args.top]
+        print(f"{path:>7} {statistics.median(walls):>8.1f} {statistics.median(imports):>10.1f}  {loaded or '-'}")
+
+    for path in args.paths:
+        print(f"\n{path}: " + ', '.join(f"{name} {cumulative / 1000:.1f} ms" for cumulative, name in heaviest[path]))
+
+if __name__ == '__main__':
+    main()
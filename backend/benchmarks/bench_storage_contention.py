@@ -0,0 +1,75 @@
+"""
+Contention benchmark for ProgressStorage writes.
+
+Spawns N processes that each call save_progress M times against the same
+progress file, then checks that every record made it into the history.
+
+Run from the backend directory:
+    python -m benchmarks.bench_storage_contention --processes 8 --saves 50
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.data.storage import ProgressStorage
+
+def _writer(filename: str, writer_id: int, saves: int, start_event):
+    storage = ProgressStorage(filename)
+    athlete = Athlete(current_max=120, experience_level='intermediate', goals='balanced', current_week=1)
+    start_event.wait()
+    for seq in range(saves):
+        storage.save_progress(athlete, {'writer': writer_id, 'seq': seq})
+
+def run(processes: int, saves: int, directory: str) -> dict:
+    filename = os.path.join(directory, 'contention_progress.json')
+    start_event = multiprocessing.Event()
+    workers = [
+        multiprocessing.Process(target=_writer, args=(filename, i, saves, start_event))
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+
+    start = time.perf_counter()
+    start_event.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    history = ProgressStorage(filename).load_progress()['training_history']
+    written = {(r['training_zones']['writer'], r['training_zones']['seq']) for r in history}
+    expected = {(w, s) for w in range(processes) for s in range(saves)}
+
+    return {
+        'processes': processes,
+        'saves_per_process': saves,
+        'expected_records': len(expected),
+        'stored_records': len(history),
+        'lost_records': len(expected - written),
+        'failed_workers': sum(1 for w in workers if w.exitcode != 0),
+        'elapsed_s': elapsed,
+        'saves_per_s': len(expected) / elapsed if elapsed else 0.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--saves', type=int, default=50, help='saves per process')
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'procs':>5} {'records':>8} {'lost':>5} {'seconds':>8} {'saves/s':>9}")
+    for processes in args.processes:
+        with tempfile.TemporaryDirectory() as directory:
+            result = run(processes, args.saves, directory)
+        ok = ok and result['lost_records'] == 0 and result['failed_workers'] == 0
+        print(f"{result['processes']:>5} {result['stored_records']:>8} {result['lost_records']:>5} "
+              f"{result['elapsed_s']:>8.2f} {result['saves_per_s']:>9.1f}")
+
+    sys.exit(0 if ok else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""
+Benchmark suite for every stage of the plan pipeline, with JSON baselines.
+
+Times TrainingZones construction, each SessionGenerator.generate_*,
+ScheduleGenerator.generate_weekly_schedule, PDFGenerator layout and
+save_pdf, and ProgressStorage load (cold and cached) and save with 10 to
+1M history records. Athletes come from a fixed-seed population, so runs
+on the same machine are comparable. Each case is timed asv-style: loops
+are calibrated to --min-time per sample, and the median of --repeats
+samples is the figure compared.
+
+'run' writes results to JSON (--save NAME also stores them as
+benchmarks/baselines/NAME.json). 'compare' checks results against a
+baseline, running the baseline's cases now unless given a results file.
+It exits 1 when a case is slower than the baseline by more than
+--threshold.
+
+benchmarks/baselines/reference.json is a committed full run. Its 'meta'
+block records the machine it came from; timings only compare on similar
+hardware, so save a local baseline before comparing elsewhere.
+
+Run from the backend directory:
+    python -m benchmarks.bench_suite run --save main
+    python -m benchmarks.bench_suite run --filter 'storage' --max-history 100000
+    python -m benchmarks.bench_suite compare main
+    python -m benchmarks.bench_suite compare baseline.json current.json --threshold 0.1
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from datetime import datetime, timedelta
+from itertools import cycle
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from breath_hold_training.config.constants import SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS
+from breath_hold_training.core.analytics import ProgressAnalytics
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.data.storage import ProgressStorage
+from breath_hold_training.utils.file_utils import atomic_write
+from breath_hold_training.generators.schedule import ScheduleGenerator
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+HISTORY_SIZES = (10, 1_000, 100_000, 1_000_000)
+POPULATION_SIZE = 512
+SESSIONS = {
+    'co2_standard': lambda gen: gen.generate_co2_table('standard'),
+    'co2_recovery': lambda gen: gen.generate_co2_table('recovery'),
+    'o2': lambda gen: gen.generate_o2_table(),
+    'performance_test': lambda gen: gen.generate_performance_test(),
+    'technique': lambda gen: gen.generate_technique_session(),
+}
+
+def population(size: int = POPULATION_SIZE, seed: int = 42) -> List[Athlete]:
+    """Synthetic roster with realistic spreads of max, level, goal, week and progress"""
+    rng = random.Random(seed)
+    athletes = []
+    for _ in range(size):
+        level = rng.choices(SUPPORTED_EXPERIENCE_LEVELS, weights=[5, 3, 2])[0]
+        current_max = int(rng.gauss({'beginner': 90, 'intermediate': 180, 'advanced': 300}[level], 30))
+        current_max = max(current_max, 20)
+        previous_max = int(current_max / rng.uniform(0.95, 1.25)) if rng.random() < 0.7 else None
+        athletes.append(Athlete(current_max=current_max, experience_level=level, goals=rng.choice(SUPPORTED_GOALS),
+                                current_week=rng.randint(1, 6), previous_max=previous_max))
+    return athletes
+
+def history_document(records: int, seed: int = 42) -> Dict[str, Any]:
+    """A progress document with one record per day going back `records` days.
+
+    It carries current analytics state, as saved documents do, so timed saves
+    take the incremental path instead of rebuilding the aggregates.
+    """
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    history = []
+    max_hold = 60
+    for day in range(records):
+        max_hold = max(20, max_hold + rng.randint(-3, 4))
+        history.append({
+            'date': (start + timedelta(days=day)).isoformat(),
+            'week': day // 7 % 6 + 1,
+            'max_hold': max_hold,
+            'experience_level': 'intermediate',
+            'goals': 'balanced',
+            'training_zones': TrainingZones.calculate(max_hold, 'intermediate', 'steady')
+        })
+    return {'training_history': history, 'current': dict(history[-1]),
+            'analytics': ProgressAnalytics.from_history(history).to_dict()}
+
+# Cases are (name, setup); setup(context) returns the operation to time, or
+# (operation, reset) when state must be restored, untimed, before every call
+Operation = Callable[[], Any]
+Case = Tuple[str, Callable[['Context'], Any]]
+
+class Context:
+    """Shared fixtures: the athlete population and a scratch directory"""
+
+    def __init__(self, seed: int, directory: str):
+        self.seed = seed
+        self.athletes = population(seed=seed)
+        self.directory = directory
+
+    def next_athlete(self) -> Iterator[Athlete]:
+        return cycle(self.athletes)
+
+def zones_case(ctx: Context) -> Callable[[], Any]:
+    athletes = ctx.next_athlete()
+    return lambda: TrainingZones(next(athletes))
+
+def session_case(build: Callable) -> Callable[[Context], Callable[[], Any]]:
+    def setup(ctx: Context) -> Callable[[], Any]:
+        generators = cycle([SessionGenerator(a, TrainingZones(a)) for a in ctx.athletes])
+        return lambda: build(next(generators))
+    return setup
+
+def schedule_case(ctx: Context) -> Callable[[], Any]:
+    generators = cycle([(a, SessionGenerator(a, TrainingZones(a))) for a in ctx.athletes])
+
+    def run():
+        athlete, session_gen = next(generators)
+        return ScheduleGenerator(athlete, session_gen).generate_weekly_schedule()
+    return run
+
+def pdf_case(save: bool) -> Callable[[Context], Callable[[], Any]]:
+    def setup(ctx: Context) -> Callable[[], Any]:
+        from breath_hold_training.generators.pdf_generator import PDFGenerator
+
+        plans = cycle([(a, TrainingZones(a), ScheduleGenerator(a, SessionGenerator(a, TrainingZones(a)))
+                        .generate_weekly_schedule()) for a in ctx.athletes[:32]])
+        filename = os.path.join(ctx.directory, 'plan.pdf')
+
+        def run():
+            athlete, zones, schedule = next(plans)
+            pdf_gen = PDFGenerator(athlete, zones)
+            pdf_gen.generate_complete_plan(schedule)
+            if save:
+                pdf_gen.save_pdf(filename)
+        return run
+    return setup
+
+def storage_case(records: int, mode: str) -> Callable[[Context], Any]:
+    def setup(ctx: Context) -> Any:
+        filename = os.path.join(ctx.directory, f"progress_{records}.json")
+        if not os.path.exists(filename):
+            with open(filename, 'w') as f:
+                json.dump(history_document(records, ctx.seed), f, indent=2)
+        with open(filename, 'rb') as f:
+            original = f.read()
+        storage = ProgressStorage(filename)
+        ProgressStorage.clear_cache()
+
+        if mode == 'load_cold':
+            def run():
+                storage.invalidate_cache()
+                return storage.load_progress()
+            return run
+        if mode == 'load_cached':
+            storage.load_progress()
+            return storage.load_progress
+        athletes = ctx.next_athlete()
+
+        def reset():
+            # Every save starts from the original file, read into the cache as after
+            # a previous save, instead of from a file growing with every loop
+            atomic_write(filename, original)
+            storage.load_progress()
+
+        def run():
+            athlete = next(athletes)
+            storage.save_progress(athlete, TrainingZones(athlete).zones)
+        return run, reset
+    return setup
+
+def cases(max_history: int) -> List[Case]:
+    found: List[Case] = [('zones', zones_case)]
+    found += [(f"session_{name}", session_case(build)) for name, build in SESSIONS.items()]
+    found += [('schedule', schedule_case), ('pdf_layout', pdf_case(False)), ('pdf_save', pdf_case(True))]
+    for records in HISTORY_SIZES:
+        if records <= max_history:
+            found += [(f"storage_{mode}[{records}]", storage_case(records, mode))
+                      for mode in ('load_cold', 'load_cached', 'save')]
+    return found
+
+def measure(fn: Operation, min_time: float, repeats: int, reset: Optional[Operation] = None) -> Dict[str, Any]:
+    """Per-operation seconds over `repeats` samples of a calibrated number of loops"""
+    def sample(loops: int) -> float:
+        if reset is None:
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            return time.perf_counter() - start
+        # Time each call on its own so the resets stay out of the figures
+        elapsed = 0.0
+        for _ in range(loops):
+            reset()
+            start = time.perf_counter()
+            fn()
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    # Calibrate: double the loops until one sample takes min_time (a slow op runs once)
+    loops = 1
+    while True:
+        elapsed = sample(loops)
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed * 10 > min_time else 10
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        try:
+            samples.append(sample(loops) / loops)
+        finally:
+            if gc_enabled:
+                gc.enable()
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'max': max(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'loops': loops,
+        'repeats': repeats
+    }
+
+def machine_info() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds')
+    }
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def run_suite(pattern: Optional[str], max_history: int, min_time: float, repeats: int, seed: int,
+              names: Optional[List[str]] = None) -> Dict[str, Any]:
+    warnings.simplefilter('ignore', DeprecationWarning)
+    selected = [(name, setup) for name, setup in cases(max_history)
+                if (pattern is None or re.search(pattern, name)) and (names is None or name in names)]
+    results = {}
+    directory = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        ctx = Context(seed, directory)
+        for name, setup in selected:
+            operation = setup(ctx)
+            run, reset = operation if isinstance(operation, tuple) else (operation, None)
+            result = measure(run, min_time, repeats, reset)
+            results[name] = result
+            print(f"{name:<32} {format_time(result['median']):>10}  "
+                  f"(min {format_time(result['min'])}, {result['loops']} loops x {repeats})", flush=True)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {'meta': {**machine_info(), 'seed': seed, 'min_time': min_time}, 'results': results}
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> bool:
+    """Print case-by-case ratios; returns False when any case regressed"""
+    ok = True
+    print(f"\n{'case':<32} {'baseline':>10} {'current':>10} {'ratio':>7}  status")
+    for name in sorted(set(baseline['results']) | set(current['results'])):
+        before = baseline['results'].get(name)
+        after = current['results'].get(name)
+        if before is None or after is None:
+            print(f"{name:<32} {'-' if before is None else format_time(before['median']):>10} "
+                  f"{'-' if after is None else format_time(after['median']):>10} {'':>7}  "
+                  f"{'new' if before is None else 'missing'}")
+            continue
+        ratio = after['median'] / before['median']
+        # Both medians and the faster samples have to agree before calling it a change
+        if ratio > 1 + threshold and after['min'] > before['min'] * (1 + threshold):
+            status, ok = 'REGRESSED', False
+        elif ratio < 1 - threshold and after['max'] < before['max'] * (1 - threshold):
+            status = 'improved'
+        else:
+            status = 'ok'
+        print(f"{name:<32} {format_time(before['median']):>10} {format_time(after['median']):>10} "
+              f"{ratio:>6.2f}x  {status}")
+    return ok
+
+def baseline_path(name: str) -> str:
+    """A results file path, or the path of a named baseline"""
+    if os.path.exists(name) or name.endswith('.json'):
+        return name
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the suite and write JSON results')
+    run.add_argument('-o', '--output', help='results file (default: print only)')
+    run.add_argument('--save', metavar='NAME', help='also store the results as baseline NAME')
+
+    check = commands.add_parser('compare', help='flag regressions against a baseline')
+    check.add_argument('baseline', help='baseline name or results file')
+    check.add_argument('current', nargs='?', help='results file (default: run the baseline cases now)')
+    check.add_argument('--threshold', type=float, default=0.15, help='slowdown ratio counted as a regression')
+
+    for sub in (run, check):
+        sub.add_argument('--filter', help='regex selecting case names')
+        sub.add_argument('--max-history', type=int, default=max(HISTORY_SIZES),
+                         help='largest ProgressStorage history to benchmark (default: %(default)s)')
+        sub.add_argument('--min-time', type=float, default=0.1, help='seconds per sample')
+        sub.add_argument('--repeats', type=int, default=5)
+        sub.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run_suite(args.filter, args.max_history, args.min_time, args.repeats, args.seed)
+        for path in filter(None, (args.output, args.save and baseline_path(args.save))):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(results, f, indent=2)
+            print(f"Results written to {path}")
+        sys.exit(0)
+
+    with open(baseline_path(args.baseline)) as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(baseline_path(args.current)) as f:
+            current = json.load(f)
+    else:
+        if args.filter:
+            baseline['results'] = {name: result for name, result in baseline['results'].items()
+                                   if re.search(args.filter, name)}
+        current = run_suite(args.filter, args.max_history, args.min_time, args.repeats,
+                            baseline['meta'].get('seed', args.seed), names=list(baseline['results']))
+    sys.exit(0 if compare(baseline, current, args.threshold) else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+# breath_hold_training/cli/batch.py
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Iterator, Optional, Tuple
+from ..core.athlete import Athlete
+from ..core.training_zones import TrainingZones
+from ..generators.batch_render import render_batch
+from ..generators.plan_cache import get_plan_cache
+from ..generators.renderers import get_renderer
+from ..config.constants import DEFAULT_PROGRESS_DB, DEFAULT_RENDER_CHUNKSIZE
+from ..data.sqlite_storage import SQLiteProgressStorage
+from ..utils.profiling import stage
+
+INT_FIELDS = ('current_max', 'current_week', 'total_weeks', 'previous_max')
+TEXT_FIELDS = ('experience_level', 'goals')
+# Columns that name the athlete in progress storage, in order of preference
+ID_FIELDS = ('athlete_id', 'id', 'name')
+
+@dataclass
+class RosterEntry:
+    """One roster row: its athlete, or why it could not be read"""
+    row: int
+    athlete_id: str
+    athlete: Optional[Athlete] = None
+    error: Optional[str] = None
+
+def read_roster(path: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (row number, record) from a CSV or JSONL roster.
+
+    The format comes from the extension (.csv, .jsonl, .ndjson), falling back
+    to the first character. JSONL lines that do not parse yield an error
+    string in place of the record.
+    """
+    with open(path, newline='') as f:
+        extension = os.path.splitext(path)[1].lower()
+        if extension in ('.jsonl', '.ndjson'):
+            is_jsonl = True
+        elif extension == '.csv':
+            is_jsonl = False
+        else:
+            is_jsonl = f.read(1024).lstrip().startswith('{')
+            f.seek(0)
+
+        if not is_jsonl:
+            # Row 1 is the header
+            for row, record in enumerate(csv.DictReader(f), start=2):
+                yield row, record
+            return
+
+        for row, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield row, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row, f"Invalid JSON: {e}"
+
+def parse_entry(row: int, record: Any) -> RosterEntry:
+    """Validate a roster record through Athlete"""
+    if isinstance(record, str):
+        return RosterEntry(row, str(row), error=record)
+    if not isinstance(record, dict):
+        return RosterEntry(row, str(row), error="Expected an object with athlete fields")
+
+    athlete_id = next((str(record[key]).strip() for key in ID_FIELDS if record.get(key)), str(row))
+    fields: Dict[str, Any] = {}
+    try:
+        for key in INT_FIELDS:
+            value = record.get(key)
+            if value is None or (isinstance(value, str) and not value.strip()):
+                continue
+            fields[key] = _whole_number(key, value)
+        for key in TEXT_FIELDS:
+            value = record.get(key)
+            if value is not None:
+                fields[key] = str(value).strip().lower()
+
+        missing = [key for key in ('current_max',) + TEXT_FIELDS if key not in fields]
+        if missing:
+            raise ValueError(f"Missing {', '.join(missing)}")
+        fields.setdefault('current_week', 1)
+        return RosterEntry(row, athlete_id, athlete=Athlete(**fields))
+    except ValueError as e:
+        return RosterEntry(row, athlete_id, error=str(e))
+
+def _whole_number(key: str, value: Any) -> int:
+    """An integer field from CSV text or JSON; fractions and booleans are errors, not truncated"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise ValueError(f"{key} must be a whole number of seconds or weeks, got {value!r}")
+
+class ProgressLine:
+    """Single-line progress indicator on stderr, drawn only on a terminal"""
+
+    def __init__(self, label: str, stream=None):
+        self.label = label
+        self.stream = stream or sys.stderr
+        self.enabled = self.stream.isatty()
+        self.start = time.perf_counter()
+
+    def update(self, done: int, total: int):
+        if not self.enabled or not total:
+            return
+        width = 30
+        filled = width * done // total
+        rate = done / max(time.perf_counter() - self.start, 1e-9)
+        self.stream.write(f"\r{self.label} [{'#' * filled}{'.' * (width - filled)}] "
+                          f"{done}/{total} ({rate:.1f}/s)")
+        self.stream.flush()
+
+    def finish(self):
+        if self.enabled:
+            self.stream.write('\n')
+            self.stream.flush()
+
+def run_batch(roster: str, output_format: str = 'pdf', output_dir: str = 'plans',
+              workers: Optional[int] = None, progress_db: Optional[str] = DEFAULT_PROGRESS_DB,
+              chunksize: int = DEFAULT_RENDER_CHUNKSIZE) -> int:
+    """Generate plans for every athlete in a roster file.
+
+    PDFs render across a process pool; other formats render in process.
+    Each plan rendered is recorded in the SQLite progress database under the
+    athlete's id (progress_db=None skips this). Returns the number of failed
+    athletes, so 0 means the whole roster succeeded.
+    """
+    start = time.perf_counter()
+    try:
+        with stage('roster_read'):
+            entries = [parse_entry(row, record) for row, record in read_roster(roster)]
+    except OSError as e:
+        print(f"Cannot read roster: {e}")
+        return 1
+
+    valid = [entry for entry in entries if entry.athlete is not None]
+    errors: Dict[int, str] = {entry.row: entry.error for entry in entries if entry.error is not None}
+    print(f"Read {len(entries)} athletes from {roster} ({len(valid)} valid, {len(errors)} invalid)")
+
+    # Schedules come from the shared plan cache; rosters repeat many plans
+    with stage('schedule'):
+        plan_cache = get_plan_cache()
+        items = [(entry.athlete, plan_cache.get_schedule(entry.athlete)) for entry in valid]
+    os.makedirs(output_dir, exist_ok=True)
+
+    bar = ProgressLine(f"Rendering {output_format}")
+    files: Dict[int, str] = {}
+    # Build and write are one stage here: PDFs do both in the worker processes
+    with stage(f'{output_format}_render', workers=output_format == 'pdf'):
+        if output_format == 'pdf':
+            for result in render_batch(items, output_dir, workers, chunksize, progress=bar.update):
+                if result.ok:
+                    files[valid[result.index].row] = result.filename
+                else:
+                    errors[valid[result.index].row] = result.error
+        else:
+            renderer = get_renderer(output_format)
+            for index, (athlete, schedule) in enumerate(items):
+                filename = os.path.join(output_dir, f"{index:05d}_{renderer.filename(athlete)}")
+                try:
+                    with open(filename, 'wb') as f:
+                        f.write(renderer.render(athlete, schedule, TrainingZones(athlete)))
+                    files[valid[index].row] = filename
+                except Exception as e:
+                    errors[valid[index].row] = f"{type(e).__name__}: {e}"
+                bar.update(index + 1, len(items))
+    bar.finish()
+
+    if progress_db is not None and files:
+        with stage('progress_save'):
+            storage = SQLiteProgressStorage(progress_db)
+            try:
+                # One connection and one commit for the whole roster
+                with storage.transaction():
+                    for entry in valid:
+                        if entry.row in files:
+                            storage.for_athlete(entry.athlete_id).save_progress(
+                                entry.athlete, TrainingZones(entry.athlete).zones)
+            finally:
+                storage.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {len(files)}/{len(entries)} plans written to {output_dir} in {elapsed:.1f}s "
+          f"({len(files) / elapsed:.1f} plans/s)")
+    if progress_db is not None and files:
+        print(f"📊 Progress recorded in {progress_db}")
+    if errors:
+        ids = {entry.row: entry.athlete_id for entry in entries}
+        print(f"❌ {len(errors)} athletes failed:")
+        for row in sorted(errors):
+            print(f"  row {row} ({ids[row]}): {errors[row]}")
+    return len(errors)
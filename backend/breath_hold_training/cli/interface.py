@@ -1,13 +1,17 @@
 # breath_hold_training/cli/interface.py
+import argparse
 import sys
 from datetime import datetime
+from typing import List, Optional
 from ..core.athlete import Athlete
 from ..core.training_zones import TrainingZones
 from ..core.sessions import SessionGenerator
 from ..generators.schedule import ScheduleGenerator
-from ..generators.pdf_generator import PDFGenerator
-from ..data.storage import ProgressStorage
+from ..generators.renderers import RENDERERS, get_renderer
+from ..config.constants import DEFAULT_OUTPUT_FORMAT, DEFAULT_PROGRESS_DB, STORAGE_BACKENDS, DEFAULT_STORAGE_BACKEND
+from ..data.backends import open_storage
 from ..utils.time_utils import parse_time_input, format_time
+from ..utils.profiling import profile_run, stage
 
 def get_athlete_input():
     """Interactive input system for athlete data"""
@@ -102,13 +106,15 @@ def get_athlete_input():
         total_weeks=6
     )
 
-def create_training_plan():
+def create_training_plan(output_format: str = DEFAULT_OUTPUT_FORMAT, output: Optional[str] = None,
+                         storage_backend: str = DEFAULT_STORAGE_BACKEND):
     """Main function to create adaptive training plan"""
     print("=== Adaptive Breath Hold Training System ===\n")
     
     # Check for previous data
-    storage = ProgressStorage()
-    previous_data = storage.get_current_data()
+    storage = open_storage(storage_backend)
+    with stage('storage_load'):
+        previous_data = storage.get_current_data()
     
     if previous_data:
         print("Previous training data found:")
@@ -144,23 +150,34 @@ def create_training_plan():
         print(f"\nGenerating adaptive training plan...")
         
         # Initialize components
-        zones = TrainingZones(athlete)
+        with stage('zones'):
+            zones = TrainingZones(athlete)
         session_gen = SessionGenerator(athlete, zones)
         schedule_gen = ScheduleGenerator(athlete, session_gen)
         
         # Generate schedule
-        weekly_schedule = schedule_gen.generate_weekly_schedule()
+        with stage('schedule'):
+            weekly_schedule = schedule_gen.generate_weekly_schedule()
         
-        # Generate PDF
-        pdf_gen = PDFGenerator(athlete, zones)
-        pdf_gen.generate_complete_plan(weekly_schedule)
+        # Render the plan (PDFs are served from the render cache for repeat inputs)
+        with stage(f'{output_format}_build'):
+            options = {}
+            if output_format == 'pdf':
+                # Imported here so the other commands and formats skip the PDF stack
+                from ..generators.pdf_cache import PDFCache
+                options['cache'] = PDFCache()
+            renderer = get_renderer(output_format, **options)
+            plan_data = renderer.render(athlete, weekly_schedule, zones)
         
         # Generate filename
-        filename = f"adaptive_breath_hold_week{athlete.current_week}_max{athlete.current_max//60}m{athlete.current_max%60}s_{datetime.now().strftime('%Y%m%d')}.pdf"
-        pdf_gen.save_pdf(filename)
+        filename = output or renderer.filename(athlete, datetime.now().strftime('%Y%m%d'))
+        with stage(f'{output_format}_write'):
+            with open(filename, 'wb') as f:
+                f.write(plan_data)
 
         # Save progress data
-        progress_file = storage.save_progress(athlete, zones.zones)
+        with stage('progress_save'):
+            progress_file = storage.save_progress(athlete, zones.zones)
 
         print(f"\n✅ Adaptive training plan created: {filename}")
         print(f"📊 Progress data saved: {progress_file}")
@@ -178,12 +195,13 @@ def create_training_plan():
         traceback.print_exc()
         return None
 
-def update_max_after_testing():
+def update_max_after_testing(storage_backend: str = DEFAULT_STORAGE_BACKEND):
     """Quick function to update max hold after performance testing"""
     print("=== Update Maximum Hold Time ===\n")
 
-    storage = ProgressStorage()
-    previous_data = storage.get_current_data()
+    storage = open_storage(storage_backend)
+    with stage('storage_load'):
+        previous_data = storage.get_current_data()
     
     if not previous_data:
         print("No previous training data found. Please run the full setup first.")
@@ -214,21 +232,85 @@ def update_max_after_testing():
             print("🔄 Consider technique focus or recovery week.")
 
         # Update the data
-        storage.update_max_hold(new_max)
-        print(f"\n✅ Max updated! Run create_training_plan() for next week.")
+        with stage('progress_save'):
+            storage.update_max_hold(new_max)
+        print(f"\n✅ Max updated! Run create_training_plan() for next week.\n")
+        with stage('analytics'):
+            analytics = storage.get_analytics()
+        if analytics.get('records'):
+            # Tested maxes are not history records; the next saved plan brings this one in
+            print("Training history (without this test until the next plan is saved):")
+        print_analytics(analytics)
 
     except ValueError:
         print("Invalid input. Please enter numbers only.")
     except Exception as e:
         print(f"Error updating max hold: {e}")
 
+def print_analytics(analytics):
+    """Summarize the training history aggregates from storage.get_analytics()"""
+    if not analytics.get('records'):
+        return
+    print(f"Best recorded max: {format_time(analytics['best_max'])} ({analytics['best_date'][:10]})")
+    print(f"{analytics['window_weeks']}-week average: {format_time(round(analytics['rolling_mean']))} "
+          f"over {analytics['rolling_records']} sessions")
+    week_over_week = analytics['week_over_week']
+    if week_over_week:
+        print(f"Since the previous week: {'+' if week_over_week['change'] >= 0 else ''}{week_over_week['change']} "
+              f"seconds ({week_over_week['pct']:+.1f}%)")
+    if analytics['trend_per_week'] is not None:
+        print(f"Trend: {analytics['trend_per_week']:+.1f} seconds per week")
+    if analytics['plateau']:
+        print(f"⏸️  No new best for {analytics['weeks_since_best']:.0f} weeks; a plateau. "
+              f"Consider a recovery week or technique focus.")
+    print()
+
 # Main execution functions
-def main():
-    """Main CLI entry point"""
-    if len(sys.argv) > 1 and sys.argv[1].lower() == "update":
-        update_max_after_testing()
-    else:
-        create_training_plan()
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main CLI entry point; returns the process exit code"""
+    parser = argparse.ArgumentParser(description="Adaptive breath hold training plan generator")
+    parser.add_argument('command', nargs='?', default='plan', type=str.lower, choices=['plan', 'update', 'batch'],
+                        help="'plan' builds this week's plan (default), 'update' records a new max hold, "
+                             "'batch' builds plans for every athlete in a roster file")
+    parser.add_argument('roster', nargs='?',
+                        help="batch: CSV or JSONL roster with current_max (seconds), experience_level, goals "
+                             "and optional current_week, previous_max, total_weeks and athlete_id columns")
+    parser.add_argument('-f', '--format', dest='output_format', default=DEFAULT_OUTPUT_FORMAT,
+                        choices=sorted(RENDERERS), help='plan output format (default: %(default)s)')
+    parser.add_argument('-o', '--output',
+                        help='output file name (default: dated name per format); for batch, the output directory '
+                             '(default: plans)')
+    parser.add_argument('-w', '--workers', type=int, help='batch: render processes (default: CPU count)')
+    parser.add_argument('--storage', default=DEFAULT_STORAGE_BACKEND, choices=sorted(STORAGE_BACKENDS),
+                        help="plan/update: progress backend; 'journal' appends each save instead of rewriting "
+                             "the whole file (default: %(default)s)")
+    parser.add_argument('--progress-db', default=DEFAULT_PROGRESS_DB,
+                        help='batch: SQLite database recording each athlete (default: %(default)s)')
+    parser.add_argument('--no-save', action='store_true', help='batch: do not record progress')
+    parser.add_argument('--profile', action='store_true',
+                        help='print wall time, CPU time and allocations for each stage of the run '
+                             '(allocation tracking slows the run; --trace-out alone times it without)')
+    parser.add_argument('--trace-out', metavar='FILE',
+                        help='write a profile of the whole run: Chrome trace events for *.json '
+                             '(chrome://tracing, Perfetto), cProfile stats for any other name')
+    args = parser.parse_args(argv)
+
+    if args.command == 'batch' and not args.roster:
+        parser.error("batch needs a roster file")
+    if args.command != 'batch' and args.roster:
+        parser.error(f"unexpected argument for {args.command}: {args.roster}")
+
+    with profile_run(args.profile, args.trace_out):
+        if args.command == 'batch':
+            from .batch import run_batch
+            failed = run_batch(args.roster, args.output_format, args.output or 'plans', args.workers,
+                               None if args.no_save else args.progress_db)
+            return 1 if failed else 0
+        if args.command == 'update':
+            update_max_after_testing(args.storage)
+        else:
+            create_training_plan(args.output_format, args.output, args.storage)
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -17,4 +17,64 @@ RPE_DESCRIPTIONS = {
 }
 
 # Default file names
-DEFAULT_PROGRESS_FILE = 'breath_hold_progress.json'
\ No newline at end of file
+DEFAULT_PROGRESS_FILE = 'breath_hold_progress.json'
+
+# Append-only progress journal
+DEFAULT_JOURNAL_FILE = 'breath_hold_progress.jsonl'
+DEFAULT_COMPACT_EVERY = 100  # journal events between snapshot compactions
+
+# SQLite progress storage
+DEFAULT_PROGRESS_DB = 'breath_hold_progress.db'
+DEFAULT_ATHLETE_ID = 'default'
+
+# Progress storage backends by name, with their default files (see data.backends)
+STORAGE_BACKENDS = {
+    'json': DEFAULT_PROGRESS_FILE,
+    'journal': DEFAULT_JOURNAL_FILE,
+    'sqlite': DEFAULT_PROGRESS_DB
+}
+DEFAULT_STORAGE_BACKEND = 'json'
+
+# Seconds to wait for the progress file lock before giving up
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+# Weekly schedules kept in the plan LRU cache
+DEFAULT_PLAN_CACHE_SIZE = 1024
+
+# Plans handed to each batch PDF render task
+DEFAULT_RENDER_CHUNKSIZE = 8
+
+# Plan output format when none is chosen (see generators.renderers)
+DEFAULT_OUTPUT_FORMAT = 'pdf'
+
+# Rendered PDF cache, kept under the user cache directory unless the env var names one
+PDF_CACHE_DIR_ENV = 'BREATH_HOLD_PDF_CACHE_DIR'
+DEFAULT_PDF_CACHE_DIR = 'breath_hold/pdf'
+DEFAULT_PDF_CACHE_BYTES = 256 * 1024 * 1024
+
+# HTTP API executors (render workers default to the CPU count)
+DEFAULT_API_RENDER_WORKERS = None
+DEFAULT_API_IO_WORKERS = 4
+DEFAULT_API_MAX_PENDING = 64  # jobs queued per pool before requests get 503
+
+# Rendered API responses kept for ETag revalidation
+DEFAULT_RESPONSE_CACHE_SIZE = 256
+
+# Bulk roster plans rendered at once per request
+DEFAULT_BULK_CONCURRENCY = 8
+MAX_BULK_CONCURRENCY = 32
+
+# Background plan render jobs
+DEFAULT_JOB_DB = 'breath_hold_jobs.db'
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_JOB_MAX_ATTEMPTS = 3
+DEFAULT_JOB_RETRY_DELAY = 1.0  # seconds before the first retry, doubling after each failure
+DEFAULT_JOB_RESULT_TTL = 3600.0  # seconds finished jobs keep their result
+DEFAULT_JOB_LEASE_TIMEOUT = 300.0  # seconds before a running job is presumed lost and requeued
+DEFAULT_JOB_POLL_INTERVAL = 0.5
+DEFAULT_JOB_CLEANUP_INTERVAL = 60.0
+
+# Progress analytics over the training history
+ANALYTICS_WINDOW_WEEKS = 4  # span of the rolling mean max hold
+PLATEAU_WEEKS = 3  # weeks without a new best before a plateau is reported
+PLATEAU_MIN_RECORDS = 3  # records since the best needed to call a plateau
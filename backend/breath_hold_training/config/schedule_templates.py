@@ -0,0 +1,46 @@
+# Weekly schedule layouts as data.
+#
+# A template maps each day to a session name. 'goals' and 'weeks' hold
+# per-goal and per-week day overrides, applied in that order on top of
+# 'days'. Session names are the keys of ScheduleGenerator.SESSION_BUILDERS.
+# Extra templates can be loaded from JSON with load_templates().
+import json
+from typing import Dict, Any
+
+DEFAULT_TEMPLATE = 'standard'
+
+SCHEDULE_TEMPLATES = {
+    'standard': {
+        'days': {
+            'Monday': 'co2_recovery',
+            'Tuesday': 'performance_test',
+            'Wednesday': 'active_recovery',
+            'Thursday': 'o2',
+            'Friday': 'co2_standard',
+            'Saturday': 'technique',
+            'Sunday': 'rest'
+        },
+        'goals': {
+            'strength': {'Saturday': 'co2_recovery'},
+            'endurance': {'Wednesday': 'technique'}
+        },
+        'weeks': {
+            # Deload week
+            4: {'Tuesday': 'technique', 'Thursday': 'co2_recovery', 'Friday': 'technique'}
+        }
+    }
+}
+
+def load_templates(filename: str) -> Dict[str, Any]:
+    """Load schedule templates from a JSON file and register them"""
+    with open(filename, 'r') as f:
+        templates = json.load(f)
+
+    for name, template in templates.items():
+        if 'days' not in template:
+            raise ValueError(f"Template '{name}' must define 'days'")
+        # JSON object keys are strings; week overrides are looked up by int
+        template['weeks'] = {int(week): days for week, days in template.get('weeks', {}).items()}
+        template.setdefault('goals', {})
+        SCHEDULE_TEMPLATES[name] = template
+    return templates
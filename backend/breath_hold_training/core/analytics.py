@@ -0,0 +1,206 @@
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from ..config.constants import ANALYTICS_WINDOW_WEEKS, PLATEAU_WEEKS, PLATEAU_MIN_RECORDS
+
+_EPOCH = datetime(1970, 1, 1)
+
+def epoch_days(date: str) -> float:
+    """Days since 1970-01-01 for an ISO timestamp (aware ones are taken in UTC)"""
+    moment = datetime.fromisoformat(date)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return (moment - _EPOCH).total_seconds() / 86400
+
+def calendar_week(days: float) -> int:
+    """Monday-based week number for a day count from epoch_days (1970-01-01 was a Thursday)"""
+    return int((days + 3) // 7)
+
+class ProgressAnalytics:
+    """Running aggregates over a training history, updated in O(1) per record.
+
+    Tracks the best max hold, the mean max hold over the last
+    ANALYTICS_WINDOW_WEEKS, the change between the last max of the latest
+    calendar week and that of the previous recorded week, the least-squares
+    trend of max hold over time and whether the best has stood for
+    PLATEAU_WEEKS. Records must arrive in date order, as the history stores
+    them. to_dict()/from_dict() persist the state next to the history;
+    from_history() rebuilds it from scratch with vectorized NumPy.
+
+    Only training_history records count. A tested max stored with
+    update_max_hold() changes 'current' alone and is excluded until the
+    next saved plan adds a history record with it.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.origin: Optional[float] = None  # epoch days of the first record; trend x is relative to it
+        self.latest_days: Optional[float] = None
+        self.latest_max = 0
+        self.best_max = 0
+        self.best_days: Optional[float] = None
+        self.best_index = -1
+        # Records inside the rolling window as (epoch days, max hold), oldest first
+        self.window: Deque[Tuple[float, int]] = deque()
+        self.window_sum = 0
+        # Last max hold of the latest and previous recorded calendar weeks
+        self.week: Optional[int] = None
+        self.week_max = 0
+        self.previous_week: Optional[int] = None
+        self.previous_week_max = 0
+        # Welford-style co-moments for the trend
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.c_xy = 0.0
+
+    def update(self, record: Dict[str, Any]):
+        """Fold one history record into the aggregates"""
+        days = epoch_days(record['date'])
+        max_hold = int(record['max_hold'])
+        if self.origin is None:
+            self.origin = days
+
+        if max_hold > self.best_max or self.best_index < 0:
+            self.best_max, self.best_days, self.best_index = max_hold, days, self.count
+        self.count += 1
+        self.latest_days, self.latest_max = days, max_hold
+
+        self.window.append((days, max_hold))
+        self.window_sum += max_hold
+        start = days - ANALYTICS_WINDOW_WEEKS * 7
+        while self.window[0][0] < start:
+            self.window_sum -= self.window.popleft()[1]
+
+        week = calendar_week(days)
+        if week != self.week:
+            if self.week is not None:
+                self.previous_week, self.previous_week_max = self.week, self.week_max
+            self.week = week
+        self.week_max = max_hold
+
+        x = days - self.origin
+        dx = x - self.mean_x
+        self.mean_x += dx / self.count
+        self.mean_y += (max_hold - self.mean_y) / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        self.c_xy += dx * (max_hold - self.mean_y)
+
+    def extend(self, records: Iterable[Dict[str, Any]]):
+        for record in records:
+            self.update(record)
+
+    def summary(self) -> Dict[str, Any]:
+        """The aggregates as plain values for the API and CLI"""
+        if not self.count:
+            return {'records': 0}
+
+        week_over_week = None
+        if self.previous_week is not None:
+            change = self.week_max - self.previous_week_max
+            week_over_week = {
+                'change': change,
+                'pct': round(change / self.previous_week_max * 100, 1) if self.previous_week_max > 0 else 0.0,
+                'weeks_apart': self.week - self.previous_week
+            }
+        # Slope in seconds per day, reported per week; undefined until records span some time
+        trend = round(self.c_xy / self.m2_x * 7, 2) if self.m2_x > 1e-12 else None
+        weeks_since_best = (self.latest_days - self.best_days) / 7
+        records_since_best = self.count - 1 - self.best_index
+        return {
+            'records': self.count,
+            'latest_max': self.latest_max,
+            'best_max': self.best_max,
+            'best_date': _iso(self.best_days),
+            'rolling_mean': round(self.window_sum / len(self.window), 1),
+            'rolling_records': len(self.window),
+            'window_weeks': ANALYTICS_WINDOW_WEEKS,
+            'week_over_week': week_over_week,
+            'trend_per_week': trend,
+            'weeks_since_best': round(weeks_since_best, 1),
+            'plateau': weeks_since_best >= PLATEAU_WEEKS and records_since_best >= PLATEAU_MIN_RECORDS
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe state, restored with from_dict()"""
+        state = {key: value for key, value in vars(self).items() if key != 'window'}
+        state['window'] = [list(item) for item in self.window]
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'ProgressAnalytics':
+        analytics = cls()
+        for key, value in state.items():
+            if key == 'window':
+                analytics.window = deque((days, max_hold) for days, max_hold in value)
+            elif hasattr(analytics, key):
+                setattr(analytics, key, value)
+        return analytics
+
+    @classmethod
+    def from_history(cls, history: List[Dict[str, Any]]) -> 'ProgressAnalytics':
+        """Rebuild the aggregates for a whole history with NumPy, matching update() per record"""
+        analytics = cls()
+        if not history:
+            return analytics
+
+        # Imported here so storage and the CLI only load NumPy when a rebuild is needed
+        import numpy as np
+
+        max_hold = np.fromiter((record['max_hold'] for record in history), dtype=np.int64, count=len(history))
+        dates = [record['date'] for record in history]
+        if any(_has_offset(date) for date in dates):
+            # NumPy's datetime64 has no time zones (2.x only warns on offsets), so convert them here
+            days = np.fromiter((epoch_days(date) for date in dates), dtype=np.float64, count=len(dates))
+        else:
+            moments = np.array(dates, dtype='datetime64[us]')
+            days = (moments - np.datetime64('1970-01-01', 'us')) / np.timedelta64(86400_000_000, 'us')
+
+        count = len(history)
+        best_index = int(np.argmax(max_hold))
+        analytics.count = count
+        analytics.origin = float(days[0])
+        analytics.latest_days, analytics.latest_max = float(days[-1]), int(max_hold[-1])
+        analytics.best_max, analytics.best_days = int(max_hold[best_index]), float(days[best_index])
+        analytics.best_index = best_index
+
+        in_window = days >= days[-1] - ANALYTICS_WINDOW_WEEKS * 7
+        # update() only evicts from the front, so the window is the suffix from the first record inside it
+        start = int(np.argmax(in_window))
+        analytics.window = deque(zip(days[start:].tolist(), max_hold[start:].tolist()))
+        analytics.window_sum = int(max_hold[start:].sum())
+
+        weeks = np.floor((days + 3) / 7).astype(np.int64)
+        analytics.week, analytics.week_max = int(weeks[-1]), int(max_hold[-1])
+        # Last record of every week but the latest
+        week_ends = np.flatnonzero(weeks[:-1] != weeks[1:])
+        if len(week_ends):
+            analytics.previous_week = int(weeks[week_ends[-1]])
+            analytics.previous_week_max = int(max_hold[week_ends[-1]])
+
+        x = days - days[0]
+        analytics.mean_x = float(x.mean())
+        analytics.mean_y = float(max_hold.mean())
+        centered = x - analytics.mean_x
+        analytics.m2_x = float(np.dot(centered, centered))
+        analytics.c_xy = float(np.dot(centered, max_hold - analytics.mean_y))
+        return analytics
+
+    @classmethod
+    def for_document(cls, data: Dict[str, Any]) -> 'ProgressAnalytics':
+        """Analytics for a progress document: its stored state when current, else a rebuild"""
+        history = data.get('training_history', [])
+        state = data.get('analytics')
+        if state and state.get('count') == len(history):
+            return cls.from_dict(state)
+        return cls.from_history(history)
+
+def _has_offset(date: str) -> bool:
+    """Whether an ISO timestamp carries a UTC offset or Z suffix"""
+    time_part = date[10:]
+    return time_part.endswith('Z') or '+' in time_part or '-' in time_part
+
+def _iso(days: Optional[float]) -> Optional[str]:
+    if days is None:
+        return None
+    return datetime.fromtimestamp(days * 86400, timezone.utc).replace(tzinfo=None).isoformat()
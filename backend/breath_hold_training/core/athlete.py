@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Optional
 from ..utils.validators import validate_experience_level, validate_goals
+from ..utils.instrumentation import timed
 
 @dataclass
 class Athlete:
@@ -12,6 +13,7 @@ class Athlete:
     total_weeks: int = 6
     previous_max: Optional[int] = None
     
+    @timed('athlete_validation')
     def __post_init__(self):
         """Validate data after initialization"""
         validate_experience_level(self.experience_level)
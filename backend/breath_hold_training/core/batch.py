@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+from .athlete import Athlete
+from .training_zones import TrainingZones
+from .sessions import SessionGenerator
+from ..config.constants import SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS
+
+# Rounds arrays are padded to this width; unused slots hold NO_VALUE
+MAX_ROUNDS = 7
+NO_VALUE = -1
+
+ZONE_NAMES = ['co2_base', 'co2_recovery', 'o2_start', 'o2_peak', 'test_target']
+
+# Performance test holds as fractions of the target, and rest seconds
+# ('Complete' after the final round is NO_VALUE), for beginners vs others
+TEST_FRACTIONS = {True: [0.6, 0.8], False: [0.7, 0.85]}
+TEST_RESTS = {True: [150, 210, NO_VALUE], False: [180, 240, NO_VALUE]}
+
+class BatchPlanner:
+    """Compute zones and session round times for a whole roster at once.
+
+    Inputs are columnar arrays: current_max and previous_max in seconds
+    (previous_max 0 means no previous max), level and goal codes indexing
+    SUPPORTED_EXPERIENCE_LEVELS / SUPPORTED_GOALS, and the training week.
+    Every value matches what TrainingZones and SessionGenerator produce for
+    the same athlete.
+    """
+
+    def __init__(self, current_max, previous_max, level, goal, week):
+        self.current_max = np.asarray(current_max, dtype=np.int64)
+        self.previous_max = np.asarray(previous_max, dtype=np.int64)
+        self.level = np.asarray(level, dtype=np.int64)
+        self.goal = np.asarray(goal, dtype=np.int64)
+        self.week = np.asarray(week, dtype=np.int64)
+
+        if np.any(self.current_max <= 0):
+            raise ValueError("Current max must be positive")
+        if np.any((self.level < 0) | (self.level >= len(SUPPORTED_EXPERIENCE_LEVELS))):
+            raise ValueError(f"Level codes must index {SUPPORTED_EXPERIENCE_LEVELS}")
+        if np.any((self.goal < 0) | (self.goal >= len(SUPPORTED_GOALS))):
+            raise ValueError(f"Goal codes must index {SUPPORTED_GOALS}")
+        if np.any(self.week < 1):
+            raise ValueError("Week must be at least 1")
+
+        self._zones = None
+        self._progression = None
+
+    @classmethod
+    def from_athletes(cls, athletes: Sequence[Athlete]) -> 'BatchPlanner':
+        """Build a planner from Athlete objects"""
+        return cls(
+            [a.current_max for a in athletes],
+            [a.previous_max or 0 for a in athletes],
+            [SUPPORTED_EXPERIENCE_LEVELS.index(a.experience_level) for a in athletes],
+            [SUPPORTED_GOALS.index(a.goals) for a in athletes],
+            [a.current_week for a in athletes]
+        )
+
+    def __len__(self) -> int:
+        return len(self.current_max)
+
+    def calculate_zones(self) -> Dict[str, np.ndarray]:
+        """Training zones in seconds, one array per zone name"""
+        if self._zones is not None:
+            return self._zones
+
+        has_previous = self.previous_max != 0
+        safe_previous = np.where(has_previous, self.previous_max, 1)
+        progress_rate = np.where(has_previous, (self.current_max - self.previous_max) / safe_previous, 0.0)
+
+        multipliers = TrainingZones.PROGRESS_MULTIPLIERS
+        multiplier = np.where(progress_rate > 0.15, multipliers['aggressive'],
+                              np.where(progress_rate < 0.05, multipliers['conservative'], multipliers['steady']))
+
+        current_max = self.current_max.astype(np.float64)
+        self._zones = {}
+        for name in ZONE_NAMES:
+            base = np.array([TrainingZones.BASE_ZONES[level][name] for level in SUPPORTED_EXPERIENCE_LEVELS])[self.level]
+            if name != 'test_target':
+                base = base * multiplier
+            self._zones[name] = np.floor(current_max * base).astype(np.int64)
+        return self._zones
+
+    def calculate_weekly_progression(self) -> np.ndarray:
+        """Progression multiplier for each athlete's current week"""
+        if self._progression is None:
+            curves = np.array([SessionGenerator.PROGRESSION_CURVES[goal] for goal in SUPPORTED_GOALS])
+            self._progression = curves[self.goal, np.minimum(self.week - 1, 5)]
+        return self._progression
+
+    def _progressed(self, zone_name: str) -> np.ndarray:
+        zone = self.calculate_zones()[zone_name].astype(np.float64)
+        return np.floor(zone * self.calculate_weekly_progression()).astype(np.int64)
+
+    def generate_rounds(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Hold and rest seconds per round for every session type.
+
+        Each session maps to 'hold' and 'rest' arrays of shape (athletes, MAX_ROUNDS),
+        padded with NO_VALUE. A NO_VALUE rest on a real round means 'Complete'.
+        """
+        count = len(self)
+        slots = np.arange(MAX_ROUNDS)
+        sessions = {}
+
+        for session_type, zone_name, rest_start, rest_end, rounds_count in (
+                ('co2_recovery', 'co2_recovery', 150, 60, 6),
+                ('co2_standard', 'co2_base', 120, 30, 7)):
+            hold = np.full((count, MAX_ROUNDS), NO_VALUE, dtype=np.int64)
+            rest = np.full((count, MAX_ROUNDS), NO_VALUE, dtype=np.int64)
+            hold[:, :rounds_count] = self._progressed(zone_name)[:, None]
+            rest[:, :rounds_count] = rest_start - (slots[:rounds_count] * (rest_start - rest_end) // (rounds_count - 1))
+            sessions[session_type] = {'hold': hold, 'rest': rest}
+
+        start = self._progressed('o2_start')
+        peak = self._progressed('o2_peak')
+        round_counts = np.array([SessionGenerator.O2_ROUND_COUNTS[level] for level in SUPPORTED_EXPERIENCE_LEVELS])[self.level]
+        increment = (peak - start) // (round_counts - 1)
+        in_session = slots[None, :] < round_counts[:, None]
+        last_two = slots[None, :] >= (round_counts - 2)[:, None]
+        sessions['o2'] = {
+            'hold': np.where(in_session, start[:, None] + slots[None, :] * increment[:, None], NO_VALUE),
+            'rest': np.where(in_session, 150 + np.where(last_two, 30, 0), NO_VALUE)
+        }
+
+        target = self._progressed('test_target')
+        is_beginner = self.level == SUPPORTED_EXPERIENCE_LEVELS.index('beginner')
+        hold = np.full((count, MAX_ROUNDS), NO_VALUE, dtype=np.int64)
+        rest = np.full((count, MAX_ROUNDS), NO_VALUE, dtype=np.int64)
+        target_float = target.astype(np.float64)
+        for i in range(2):
+            fraction = np.where(is_beginner, TEST_FRACTIONS[True][i], TEST_FRACTIONS[False][i])
+            hold[:, i] = np.floor(target_float * fraction)
+        hold[:, 2] = target
+        rest[:, :3] = np.where(is_beginner[:, None], TEST_RESTS[True], TEST_RESTS[False])
+        sessions['performance_test'] = {'hold': hold, 'rest': rest}
+
+        hold = np.full((count, MAX_ROUNDS), NO_VALUE, dtype=np.int64)
+        rest = np.full((count, MAX_ROUNDS), NO_VALUE, dtype=np.int64)
+        hold[:, :4] = self.calculate_zones()['co2_recovery'][:, None]
+        rest[:, :4] = 120
+        sessions['technique'] = {'hold': hold, 'rest': rest}
+
+        return sessions
+
+    def athlete_rounds(self, index: int, sessions: Optional[Dict[str, Dict[str, np.ndarray]]] = None) -> Dict[str, List[tuple]]:
+        """(hold, rest) pairs for one athlete, with padding stripped and None for 'Complete'"""
+        sessions = sessions if sessions is not None else self.generate_rounds()
+        result = {}
+        for session_type, arrays in sessions.items():
+            holds = arrays['hold'][index]
+            rests = arrays['rest'][index]
+            result[session_type] = [
+                (int(h), int(r) if r != NO_VALUE else None)
+                for h, r in zip(holds, rests) if h != NO_VALUE
+            ]
+        return result
@@ -0,0 +1,145 @@
+from collections.abc import Mapping
+from enum import IntEnum
+from typing import Dict, Any, List, Optional, Sequence
+from ..utils.time_utils import format_time
+
+class SessionKind(IntEnum):
+    """Session type codes"""
+    CO2_RECOVERY = 1
+    CO2_STANDARD = 2
+    O2 = 3
+    PERFORMANCE_TEST = 4
+    TECHNIQUE = 5
+    ACTIVE_RECOVERY = 6
+    REST = 7
+
+SESSION_TYPES = {
+    SessionKind.CO2_RECOVERY: 'Adaptive CO2 Table (Recovery)',
+    SessionKind.CO2_STANDARD: 'Adaptive CO2 Table (Standard)',
+    SessionKind.O2: 'Adaptive O2 Table',
+    SessionKind.PERFORMANCE_TEST: 'Adaptive Performance Test',
+    SessionKind.TECHNIQUE: 'Adaptive Technique Work',
+    SessionKind.ACTIVE_RECOVERY: 'Active Recovery',
+    SessionKind.REST: 'Complete Rest'
+}
+
+class Round(Mapping):
+    """One round of a session, stored as integer seconds.
+
+    Reads like the legacy round dict ('round', 'hold_time', 'rest_time',
+    'target_rpe' and optional 'focus'), formatting times only when accessed.
+    A rest of None renders as 'Complete'; an open-ended hold renders with '+'.
+    """
+    __slots__ = ('number', 'hold', 'rest', 'target_rpe', 'focus', 'open_ended')
+
+    def __init__(self, number: int, hold: int, rest: Optional[int], target_rpe: str,
+                 focus: Optional[str] = None, open_ended: bool = False):
+        self.number = number
+        self.hold = hold
+        self.rest = rest
+        self.target_rpe = target_rpe
+        self.focus = focus
+        self.open_ended = open_ended
+
+    @property
+    def hold_time(self) -> str:
+        return format_time(self.hold) + ('+' if self.open_ended else '')
+
+    @property
+    def rest_time(self) -> str:
+        return format_time(self.rest) if self.rest is not None else 'Complete'
+
+    def __getitem__(self, key: str):
+        if key == 'round':
+            return self.number
+        if key == 'hold_time':
+            return self.hold_time
+        if key == 'rest_time':
+            return self.rest_time
+        if key == 'target_rpe':
+            return self.target_rpe
+        if key == 'focus' and self.focus is not None:
+            return self.focus
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from ('round', 'hold_time', 'rest_time', 'target_rpe')
+        if self.focus is not None:
+            yield 'focus'
+
+    def __len__(self) -> int:
+        return 4 if self.focus is None else 5
+
+    def __repr__(self) -> str:
+        return f"Round({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the legacy round format"""
+        return dict(self.items())
+
+class Session(Mapping):
+    """A training session holding its rounds as Round objects.
+
+    Reads like the legacy session dict ('type', 'description', and 'rounds'
+    and 'notes' when present). The description may contain '{0}'-style
+    placeholders that are filled with formatted `times` on access.
+    """
+    __slots__ = ('kind', 'description_template', 'times', 'rounds', 'notes', 'label')
+
+    def __init__(self, kind: SessionKind, description: str, rounds: Optional[List[Round]] = None,
+                 notes: Optional[str] = None, times: Sequence[int] = (), label: Optional[str] = None):
+        self.kind = kind
+        self.description_template = description
+        self.times = tuple(times)
+        self.rounds = rounds
+        self.notes = notes
+        self.label = label
+
+    @property
+    def type(self) -> str:
+        return self.label or SESSION_TYPES[self.kind]
+
+    @property
+    def description(self) -> str:
+        if not self.times:
+            return self.description_template
+        return self.description_template.format(*(format_time(t) for t in self.times))
+
+    def __getitem__(self, key: str):
+        if key == 'type':
+            return self.type
+        if key == 'description':
+            return self.description
+        if key == 'rounds' and self.rounds is not None:
+            return self.rounds
+        if key == 'notes' and self.notes is not None:
+            return self.notes
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield 'type'
+        yield 'description'
+        if self.rounds is not None:
+            yield 'rounds'
+        if self.notes is not None:
+            yield 'notes'
+
+    def __len__(self) -> int:
+        return 2 + (self.rounds is not None) + (self.notes is not None)
+
+    def __repr__(self) -> str:
+        return f"Session({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the legacy session format, ready for JSON"""
+        data = {'type': self.type, 'description': self.description}
+        if self.rounds is not None:
+            data['rounds'] = [r.to_dict() for r in self.rounds]
+        if self.notes is not None:
+            data['notes'] = self.notes
+        return data
+
+def schedule_to_dict(schedule: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a weekly schedule to plain dicts for JSON output"""
+    return {day: session.to_dict() if isinstance(session, Session) else dict(session)
+            for day, session in schedule.items()}
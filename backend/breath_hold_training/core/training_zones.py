@@ -1,5 +1,6 @@
 from typing import Dict
 from .athlete import Athlete
+from ..utils.instrumentation import timed
 
 class TrainingZones:
     """Calculate personalized training zones based on athlete data"""
@@ -28,22 +29,33 @@ class TrainingZones:
         }
     }
     
+    # Zone multiplier for each progress-rate bucket
+    PROGRESS_MULTIPLIERS = {
+        'conservative': 0.9,  # <5% improvement
+        'steady': 1.0,
+        'aggressive': 1.1  # >15% improvement
+    }
+    
+    @timed('training_zones')
     def __init__(self, athlete: Athlete):
         self.athlete = athlete
         self._zones = self._calculate_zones()
     
     def _calculate_zones(self) -> Dict[str, int]:
         """Calculate training zones with adaptive adjustments"""
-        base_zones = self.BASE_ZONES[self.athlete.experience_level].copy()
+        return self.calculate(
+            self.athlete.current_max,
+            self.athlete.experience_level,
+            self.progress_bucket(self.athlete.progress_rate)
+        )
+    
+    @classmethod
+    def calculate(cls, current_max: int, experience_level: str, bucket: str) -> Dict[str, int]:
+        """Calculate zones in seconds for a max hold, level and progress bucket"""
+        base_zones = cls.BASE_ZONES[experience_level].copy()
         
         # Adjust based on progress rate
-        progress_rate = self.athlete.progress_rate
-        if progress_rate > 0.15:  # >15% improvement
-            multiplier = 1.1  # Aggressive progression
-        elif progress_rate < 0.05:  # <5% improvement
-            multiplier = 0.9  # Conservative progression
-        else:
-            multiplier = 1.0
+        multiplier = cls.PROGRESS_MULTIPLIERS[bucket]
         
         # Apply multiplier (except test_target)
         for key in base_zones:
@@ -51,7 +63,16 @@ class TrainingZones:
                 base_zones[key] *= multiplier
         
         # Convert to seconds
-        return {k: int(self.athlete.current_max * v) for k, v in base_zones.items()}
+        return {k: int(current_max * v) for k, v in base_zones.items()}
+    
+    @staticmethod
+    def progress_bucket(progress_rate: float) -> str:
+        """Classify a progress rate into its zone adjustment bucket"""
+        if progress_rate > 0.15:
+            return 'aggressive'
+        elif progress_rate < 0.05:
+            return 'conservative'
+        return 'steady'
     
     def get_zone(self, zone_name: str) -> int:
         """Get specific training zone value"""
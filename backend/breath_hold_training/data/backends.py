@@ -0,0 +1,23 @@
+from typing import Optional
+from ..config.constants import STORAGE_BACKENDS, DEFAULT_STORAGE_BACKEND
+from .journal import JournalProgressStorage
+from .sqlite_storage import SQLiteProgressStorage
+from .storage import ProgressStorage
+
+def open_storage(backend: str = DEFAULT_STORAGE_BACKEND, filename: Optional[str] = None):
+    """Open a progress storage backend by name: 'json', 'journal' or 'sqlite'.
+
+    All of them keep the ProgressStorage interface. 'json' rewrites one
+    document per save, 'journal' appends a line per save and 'sqlite' inserts
+    a row. filename defaults to the backend's own file; the journal imports
+    an existing JSON progress document the first time it is used.
+    """
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend} (choose from {', '.join(sorted(STORAGE_BACKENDS))})")
+    filename = filename or STORAGE_BACKENDS[backend]
+
+    if backend == 'journal':
+        return JournalProgressStorage(filename)
+    if backend == 'sqlite':
+        return SQLiteProgressStorage(filename)
+    return ProgressStorage(filename)
@@ -0,0 +1,251 @@
+import hashlib
+import json
+import math
+import sqlite3
+import statistics
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+from ..config.constants import (
+    DEFAULT_JOB_DB, DEFAULT_JOB_MAX_ATTEMPTS, DEFAULT_JOB_RETRY_DELAY, DEFAULT_JOB_RESULT_TTL,
+    DEFAULT_JOB_LEASE_TIMEOUT, DEFAULT_LOCK_TIMEOUT
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    dedupe_key TEXT NOT NULL,
+    format TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    error TEXT,
+    result BLOB,
+    created REAL NOT NULL,
+    run_after REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    expires REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs (status, run_after, created);
+CREATE INDEX IF NOT EXISTS idx_jobs_expires ON jobs (expires);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished ON jobs (finished);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_inflight ON jobs (dedupe_key) WHERE status IN ('queued', 'running');
+"""
+
+JOB_COLUMNS = 'id, format, params, status, attempts, max_attempts, error, created, started, finished, expires'
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+# Finished jobs sampled for the latency figures in stats()
+LATENCY_SAMPLE = 1000
+
+def dedupe_key(output_format: str, params: Dict[str, Any]) -> str:
+    """Key shared by jobs that would render the same plan"""
+    payload = json.dumps([output_format, params], sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+class JobQueue:
+    """Persistent queue of plan render jobs in a local SQLite database.
+
+    Jobs move queued -> running -> done, or back to queued with a growing
+    delay after a failure until max_attempts is used up, then failed.
+    Enqueuing inputs identical to a queued or running job returns that job.
+    Finished jobs keep their result until the TTL runs out and cleanup()
+    deletes them; running jobs whose worker vanished are requeued by
+    requeue_stale(). Each thread gets its own connection, so the queue can
+    be shared by I/O threads and by several processes.
+    """
+
+    def __init__(self, filename: str = DEFAULT_JOB_DB, max_attempts: int = DEFAULT_JOB_MAX_ATTEMPTS,
+                 retry_delay: float = DEFAULT_JOB_RETRY_DELAY, result_ttl: float = DEFAULT_JOB_RESULT_TTL,
+                 lease_timeout: float = DEFAULT_JOB_LEASE_TIMEOUT, lock_timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.filename = filename
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.result_ttl = result_ttl
+        self.lease_timeout = lease_timeout
+        self.lock_timeout = lock_timeout
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.deduplicated = 0
+        self.retried = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection, opened lazily with the schema in place"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.filename, timeout=self.lock_timeout, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every connection opened by this queue"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def enqueue(self, output_format: str, params: Dict[str, Any]) -> Tuple[str, bool]:
+        """Queue a render of the plan for these athlete inputs.
+
+        Returns the job id and whether a new job was created; False means an
+        identical job was already queued or running.
+        """
+        key = dedupe_key(output_format, params)
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO jobs (id, dedupe_key, format, params, status, max_attempts, created, run_after) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, key, output_format, json.dumps(params), QUEUED, self.max_attempts, now, now))
+        except sqlite3.IntegrityError:
+            row = self.conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?)", (key, QUEUED, RUNNING)).fetchone()
+            if row is not None:
+                self.deduplicated += 1
+                return row[0], False
+            # The in-flight job finished in between
+            return self.enqueue(output_format, params)
+        self.enqueued += 1
+        return job_id, True
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest job that is due as running and return it"""
+        now = time.time()
+        with self.conn:
+            row = self.conn.execute(
+                f"UPDATE jobs SET status = ?, started = ?, attempts = attempts + 1 "
+                f"WHERE id = (SELECT id FROM jobs WHERE status = ? AND run_after <= ? ORDER BY created LIMIT 1) "
+                f"RETURNING {JOB_COLUMNS}",
+                (RUNNING, now, QUEUED, now)).fetchone()
+        return self._from_row(row) if row else None
+
+    def complete(self, job_id: str, result: bytes):
+        """Store a job's result and start its TTL"""
+        now = time.time()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, finished = ?, expires = ? "
+                "WHERE id = ? AND status = ?",
+                (DONE, result, now, now + self.result_ttl, job_id, RUNNING))
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """Record a failed attempt; returns True when the job will be retried"""
+        now = time.time()
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ?", (job_id, RUNNING)).fetchone()
+            if row is None:
+                return False
+            attempts, max_attempts = row
+            if attempts < max_attempts:
+                # Back off 1x, 2x, 4x ... the retry delay
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, started = NULL, run_after = ? WHERE id = ?",
+                    (QUEUED, error, now + self.retry_delay * 2 ** (attempts - 1), job_id))
+                self.retried += 1
+                return True
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ?, expires = ? WHERE id = ?",
+                (FAILED, error, now, now + self.result_ttl, job_id))
+        return False
+
+    def release(self, job_id: str):
+        """Put a running job back without counting the attempt (e.g. on shutdown)"""
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, started = NULL, attempts = attempts - 1 WHERE id = ? AND status = ?",
+                (QUEUED, job_id, RUNNING))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's status without its result; expired jobs count as gone before cleanup() runs"""
+        row = self.conn.execute(
+            f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = ? AND (expires IS NULL OR expires > ?)",
+            (job_id, time.time())).fetchone()
+        return self._from_row(row) if row else None
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """A finished job's result, or None"""
+        row = self.conn.execute(
+            "SELECT result FROM jobs WHERE id = ? AND status = ? AND expires > ?",
+            (job_id, DONE, time.time())).fetchone()
+        return row[0] if row else None
+
+    def cleanup(self, now: Optional[float] = None) -> int:
+        """Delete finished jobs whose TTL ran out; returns how many"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND expires <= ?", (DONE, FAILED, now or time.time()))
+        return cursor.rowcount
+
+    def requeue_stale(self, now: Optional[float] = None) -> int:
+        """Requeue running jobs held longer than the lease timeout; returns how many"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = ?, started = NULL WHERE status = ? AND started <= ?",
+                (QUEUED, RUNNING, (now or time.time()) - self.lease_timeout))
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by status and latency percentiles of recently finished jobs"""
+        depth = {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)}
+        for status, count in self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            depth[status] = count
+        oldest = self.conn.execute(
+            "SELECT MIN(created) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+
+        rows = self.conn.execute(
+            "SELECT created, started, finished FROM jobs WHERE status = ? ORDER BY finished DESC LIMIT ?",
+            (DONE, LATENCY_SAMPLE)).fetchall()
+        return {
+            'depth': depth,
+            'oldest_queued_s': round(time.time() - oldest, 3) if oldest is not None else 0.0,
+            'wait_ms': self._percentiles([started - created for created, started, _ in rows]),
+            'run_ms': self._percentiles([finished - started for _, started, finished in rows]),
+            'total_ms': self._percentiles([finished - created for created, _, finished in rows]),
+            'enqueued': self.enqueued,
+            'deduplicated': self.deduplicated,
+            'retried': self.retried
+        }
+
+    @staticmethod
+    def _percentiles(seconds: List[float]) -> Dict[str, float]:
+        if not seconds:
+            return {'count': 0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        seconds.sort()
+        return {
+            'count': len(seconds),
+            'p50': round(statistics.median(seconds) * 1000, 1),
+            'p95': round(seconds[math.ceil(len(seconds) * 0.95) - 1] * 1000, 1),
+            'max': round(seconds[-1] * 1000, 1)
+        }
+
+    @staticmethod
+    def _from_row(row) -> Dict[str, Any]:
+        job_id, output_format, params, status, attempts, max_attempts, error, created, started, finished, expires = row
+        return {
+            'id': job_id,
+            'format': output_format,
+            'params': json.loads(params),
+            'status': status,
+            'attempts': attempts,
+            'max_attempts': max_attempts,
+            'error': error,
+            'created': created,
+            'started': started,
+            'finished': finished,
+            'expires': expires
+        }
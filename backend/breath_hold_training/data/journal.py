@@ -0,0 +1,212 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from ..core.athlete import Athlete
+from ..core.analytics import ProgressAnalytics
+from ..config.constants import DEFAULT_PROGRESS_FILE, DEFAULT_JOURNAL_FILE, DEFAULT_COMPACT_EVERY, DEFAULT_LOCK_TIMEOUT
+from ..utils.file_utils import atomic_write, file_lock
+from .storage import ProgressStorage
+
+class JournalProgressStorage:
+    """Append-only progress storage backed by a JSON Lines journal.
+
+    Every save appends a single event line to the journal instead of
+    rewriting the whole progress document. A small snapshot file holds the
+    current record, the history aggregates and the journal offset they
+    reflect, so reading the current data or analytics only replays the events
+    written since the last compaction.
+    """
+
+    def __init__(self, filename: str = DEFAULT_JOURNAL_FILE,
+                 compact_every: int = DEFAULT_COMPACT_EVERY,
+                 legacy_filename: Optional[str] = DEFAULT_PROGRESS_FILE,
+                 lock_timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.filename = filename
+        self.snapshot_filename = os.path.splitext(filename)[0] + '.current.json'
+        self.compact_every = compact_every
+        self.legacy_filename = legacy_filename
+        self.lock_timeout = lock_timeout
+
+    def load_progress(self) -> Dict[str, Any]:
+        """Load the full training progress document from the journal"""
+        self._migrate_if_needed()
+        history, current = self._replay(self._read_events(0), None)
+
+        data = {'training_history': history}
+        if current is not None:
+            data['current'] = current
+        return data
+
+    def save_progress(self, athlete: Athlete, training_zones: Dict[str, int], new_max_hold: Optional[int] = None) -> str:
+        """Append a training session record to the journal"""
+        self._migrate_if_needed()
+        current_session = {
+            'date': datetime.now().isoformat(),
+            'week': athlete.current_week,
+            'max_hold': new_max_hold if new_max_hold else athlete.current_max,
+            'experience_level': athlete.experience_level,
+            'goals': athlete.goals,
+            'training_zones': training_zones
+        }
+
+        self._append({'op': 'session', 'record': current_session})
+        return self.filename
+
+    def get_current_data(self) -> Optional[Dict[str, Any]]:
+        """Get current training data from the snapshot plus the journal tail"""
+        self._migrate_if_needed()
+        snapshot = self._read_snapshot()
+        _, current = self._replay(self._read_events(snapshot['offset']), snapshot.get('current'))
+        return current
+
+    def get_analytics(self) -> Dict[str, Any]:
+        """Progress aggregates: the snapshot's, advanced by the sessions in the journal tail.
+
+        Like the other backends, tested maxes not yet in the history are excluded.
+        """
+        self._migrate_if_needed()
+        snapshot = self._read_snapshot()
+        if 'analytics' not in snapshot:
+            # No compaction since aggregates were added to snapshots
+            return ProgressAnalytics.from_history(self.load_progress()['training_history']).summary()
+
+        analytics = ProgressAnalytics.from_dict(snapshot['analytics'])
+        history, _ = self._replay(self._read_events(snapshot['offset']), None)
+        analytics.extend(history)
+        return analytics.summary()
+
+    def update_max_hold(self, new_max: int) -> str:
+        """Update maximum hold time"""
+        if self.get_current_data() is not None:
+            self._append({'op': 'max_hold', 'max_hold': new_max})
+        return self.filename
+
+    def signature(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the journal's version; every append and compaction changes it"""
+        return ProgressStorage._file_signature(os.path.abspath(self.filename))
+
+    def compact(self) -> str:
+        """Fold max hold updates into the snapshot and rewrite the journal"""
+        with file_lock(self.filename, self.lock_timeout):
+            self._compact()
+        return self.filename
+
+    def migrate_from_document(self, legacy_filename: str) -> str:
+        """Import a single-document progress file into the journal"""
+        with file_lock(self.filename, self.lock_timeout):
+            self._import_document(legacy_filename)
+        return self.filename
+
+    def export_document(self, filename: str) -> str:
+        """Write the journal back out in the single-document format"""
+        atomic_write(filename, json.dumps(self.load_progress(), indent=2))
+        return filename
+
+    def _compact(self):
+        history, current = self._replay(self._read_events(0), None)
+        self._rewrite(history, current)
+
+    def _import_document(self, legacy_filename: str):
+        with open(legacy_filename, 'r') as f:
+            data = json.load(f)
+        self._rewrite(data.get('training_history', []), data.get('current'))
+
+    def _rewrite(self, history: List[Dict[str, Any]], current: Optional[Dict[str, Any]]):
+        """Replace the journal with one line per session, then refresh the snapshot.
+
+        The journal stays the source of truth: when the current record differs
+        from the last session it is kept as a trailing 'current' event, so a
+        crash between the two writes leaves a stale snapshot but no data loss.
+        """
+        events = [{'op': 'session', 'record': record} for record in history]
+        if current is not None and (not history or current != history[-1]):
+            events.append({'op': 'current', 'record': current})
+
+        lines = ''.join(self._encode(event) for event in events).encode('utf-8')
+        atomic_write(self.filename, lines)
+        self._write_snapshot(current, len(lines), ProgressAnalytics.from_history(history))
+
+    def _migrate_if_needed(self):
+        """Import the legacy progress document the first time the journal is used"""
+        if os.path.exists(self.filename) or not self.legacy_filename:
+            return
+        if os.path.exists(self.legacy_filename):
+            with file_lock(self.filename, self.lock_timeout):
+                if os.path.exists(self.filename):
+                    return
+                try:
+                    self._import_document(self.legacy_filename)
+                except json.JSONDecodeError:
+                    pass
+
+    def _append(self, event: Dict[str, Any]):
+        """Append one event and compact once enough events have piled up"""
+        line = self._encode(event).encode('utf-8')
+        with file_lock(self.filename, self.lock_timeout):
+            with open(self.filename, 'a+b') as f:
+                # Terminate a torn line left by an interrupted append
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+
+            snapshot = self._read_snapshot()
+            if len(self._read_events(snapshot['offset'])) >= self.compact_every:
+                self._compact()
+
+    def _read_events(self, offset: int) -> List[Dict[str, Any]]:
+        """Read journal events starting at a byte offset"""
+        if not os.path.exists(self.filename):
+            return []
+
+        events = []
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A torn trailing line from an interrupted append
+                    continue
+        return events
+
+    @staticmethod
+    def _replay(events: List[Dict[str, Any]], current: Optional[Dict[str, Any]]):
+        """Apply journal events to a history list and current record"""
+        history = []
+        for event in events:
+            if event.get('op') == 'session':
+                history.append(event['record'])
+                current = dict(event['record'])
+            elif event.get('op') == 'current':
+                current = dict(event['record'])
+            elif event.get('op') == 'max_hold' and current is not None:
+                current = dict(current, max_hold=event['max_hold'])
+        return history, current
+
+    def _read_snapshot(self) -> Dict[str, Any]:
+        """Load the current-record snapshot, ignoring it if the journal was replaced since"""
+        try:
+            with open(self.snapshot_filename, 'r') as f:
+                snapshot = json.load(f)
+            stat = os.stat(self.filename)
+        except (OSError, json.JSONDecodeError):
+            return {'offset': 0}
+
+        if snapshot.get('journal_inode') != stat.st_ino or snapshot.get('offset', 0) > stat.st_size:
+            return {'offset': 0}
+        return snapshot
+
+    def _write_snapshot(self, current: Optional[Dict[str, Any]], offset: int, analytics: ProgressAnalytics):
+        """Persist the current record and history aggregates with the journal offset they cover"""
+        snapshot = {'offset': offset, 'journal_inode': os.stat(self.filename).st_ino,
+                    'analytics': analytics.to_dict()}
+        if current is not None:
+            snapshot['current'] = current
+        atomic_write(self.snapshot_filename, json.dumps(snapshot, indent=2))
+
+    @staticmethod
+    def _encode(event: Dict[str, Any]) -> str:
+        return json.dumps(event, separators=(',', ':')) + '\n'
@@ -0,0 +1,262 @@
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterator, List, Optional
+from ..core.athlete import Athlete
+from ..core.analytics import ProgressAnalytics
+from ..config.constants import DEFAULT_PROGRESS_DB, DEFAULT_ATHLETE_ID, DEFAULT_LOCK_TIMEOUT
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS training_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    athlete TEXT NOT NULL,
+    date TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    max_hold INTEGER NOT NULL,
+    experience_level TEXT NOT NULL,
+    goals TEXT NOT NULL,
+    training_zones TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_athlete_date ON training_history (athlete, date);
+CREATE INDEX IF NOT EXISTS idx_history_athlete_week ON training_history (athlete, week);
+CREATE TABLE IF NOT EXISTS current (
+    athlete TEXT PRIMARY KEY,
+    date TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    max_hold INTEGER NOT NULL,
+    experience_level TEXT NOT NULL,
+    goals TEXT NOT NULL,
+    training_zones TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analytics (
+    athlete TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+"""
+
+RECORD_COLUMNS = 'date, week, max_hold, experience_level, goals, training_zones'
+
+class _Connections:
+    """Per-thread connections to one database, shared by every athlete view of it"""
+
+    def __init__(self, filename: str, timeout: float):
+        self.filename = filename
+        self.timeout = timeout
+        self._local = threading.local()
+        self._opened: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> sqlite3.Connection:
+        """This thread's connection, opened lazily with the schema in place"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # close() may run on another thread than the one that opened the connection
+            conn = sqlite3.connect(self.filename, timeout=self.timeout, check_same_thread=False)
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            with self._lock:
+                self._opened.append(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Commit on leaving the outermost block on this thread; nested blocks join it"""
+        conn = self.get()
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        try:
+            if depth:
+                yield conn
+            else:
+                with conn:
+                    yield conn
+        finally:
+            self._local.depth = depth
+
+    def close(self):
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+        self._local = threading.local()
+
+class SQLiteProgressStorage:
+    """Progress storage for many athletes in a single SQLite database.
+
+    Keeps the ProgressStorage interface, scoped to one athlete key, and adds
+    indexed history queries so lookups never scan the full history. Each
+    thread gets its own connection, so one instance can serve the API's I/O
+    pool; views from for_athlete() share them.
+    """
+
+    def __init__(self, filename: str = DEFAULT_PROGRESS_DB, athlete_id: str = DEFAULT_ATHLETE_ID,
+                 lock_timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.filename = filename
+        self.athlete_id = athlete_id
+        self.lock_timeout = lock_timeout
+        self._connections = _Connections(filename, lock_timeout)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """This thread's connection to the database"""
+        return self._connections.get()
+
+    def for_athlete(self, athlete_id: str) -> 'SQLiteProgressStorage':
+        """Get a storage view for another athlete sharing this database and its connections"""
+        storage = SQLiteProgressStorage(self.filename, athlete_id, self.lock_timeout)
+        storage._connections = self._connections
+        return storage
+
+    def transaction(self):
+        """Group writes (from this storage or its athlete views) into one transaction.
+
+        Saves inside the block commit together when it exits, or roll back
+        together if it raises.
+        """
+        return self._connections.transaction()
+
+    def close(self):
+        """Close every connection opened through this storage and its athlete views"""
+        self._connections.close()
+
+    def load_progress(self) -> Dict[str, Any]:
+        """Load training progress for this athlete"""
+        data = {'training_history': self.get_history()}
+        current = self.get_current_data()
+        if current is not None:
+            data['current'] = current
+        return data
+
+    def save_progress(self, athlete: Athlete, training_zones: Dict[str, int], new_max_hold: Optional[int] = None) -> str:
+        """Save training progress for this athlete"""
+        current_session = {
+            'date': datetime.now().isoformat(),
+            'week': athlete.current_week,
+            'max_hold': new_max_hold if new_max_hold else athlete.current_max,
+            'experience_level': athlete.experience_level,
+            'goals': athlete.goals,
+            'training_zones': training_zones
+        }
+
+        values = self._to_row(current_session)
+        with self.transaction():
+            self.conn.execute(
+                f"INSERT INTO training_history (athlete, {RECORD_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values)
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO current (athlete, {RECORD_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                values)
+            # Read inside the write transaction the inserts opened, so concurrent saves cannot lose an update
+            analytics = self._stored_analytics()
+            if analytics is None:
+                analytics = ProgressAnalytics.from_history(self.get_history())
+            else:
+                analytics.update(current_session)
+            self.conn.execute("INSERT OR REPLACE INTO analytics (athlete, state) VALUES (?, ?)",
+                              (self.athlete_id, json.dumps(analytics.to_dict())))
+
+        return self.filename
+
+    def get_current_data(self) -> Optional[Dict[str, Any]]:
+        """Get current training data"""
+        row = self.conn.execute(
+            f"SELECT {RECORD_COLUMNS} FROM current WHERE athlete = ?", (self.athlete_id,)).fetchone()
+        return self._from_row(row) if row else None
+
+    def update_max_hold(self, new_max: int) -> str:
+        """Update maximum hold time"""
+        with self.transaction():
+            self.conn.execute(
+                "UPDATE current SET max_hold = ? WHERE athlete = ?", (new_max, self.athlete_id))
+        return self.filename
+
+    def get_history(self, start: Optional[str] = None, end: Optional[str] = None,
+                    week: Optional[int] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get history records in date order, optionally bounded by ISO dates or week.
+
+        With a limit, the most recent records are returned (still oldest first).
+        """
+        if week is not None:
+            clauses, params = ["athlete = ?", "week = ?"], [self.athlete_id, week]
+        else:
+            clauses, params = ["athlete = ?"], [self.athlete_id]
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("date < ?")
+            params.append(end)
+
+        query = f"SELECT {RECORD_COLUMNS} FROM training_history WHERE {' AND '.join(clauses)} ORDER BY date DESC, id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        rows = self.conn.execute(query, params).fetchall()
+        return [self._from_row(row) for row in reversed(rows)]
+
+    def get_latest_record(self) -> Optional[Dict[str, Any]]:
+        """Get the most recent history record"""
+        records = self.get_history(limit=1)
+        return records[0] if records else None
+
+    def get_last_weeks(self, weeks: int, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get history records from the last N calendar weeks"""
+        start = (now or datetime.now()) - timedelta(weeks=weeks)
+        return self.get_history(start=start.isoformat())
+
+    def get_analytics(self) -> Dict[str, Any]:
+        """Progress aggregates over this athlete's training history (tested maxes not yet in it are excluded)"""
+        analytics = self._stored_analytics()
+        if analytics is None:
+            # None stored yet (e.g. after an import); rebuild from the history
+            analytics = ProgressAnalytics.from_history(self.get_history())
+        return analytics.summary()
+
+    def _stored_analytics(self) -> Optional[ProgressAnalytics]:
+        row = self.conn.execute("SELECT state FROM analytics WHERE athlete = ?", (self.athlete_id,)).fetchone()
+        return ProgressAnalytics.from_dict(json.loads(row[0])) if row else None
+
+    def list_athletes(self) -> List[str]:
+        """List athlete keys with a current record"""
+        rows = self.conn.execute("SELECT athlete FROM current ORDER BY athlete").fetchall()
+        return [row[0] for row in rows]
+
+    def import_document(self, data: Dict[str, Any]) -> str:
+        """Import a single-document progress dict (as loaded from JSON) for this athlete"""
+        with self.transaction():
+            self.conn.executemany(
+                f"INSERT INTO training_history (athlete, {RECORD_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [self._to_row(record) for record in data.get('training_history', [])])
+            # Imported records may predate stored ones; rebuild on next use
+            self.conn.execute("DELETE FROM analytics WHERE athlete = ?", (self.athlete_id,))
+            if data.get('current'):
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO current (athlete, {RECORD_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._to_row(data['current']))
+        return self.filename
+
+    def _to_row(self, record: Dict[str, Any]) -> tuple:
+        return (
+            self.athlete_id,
+            record['date'],
+            record['week'],
+            record['max_hold'],
+            record['experience_level'],
+            record['goals'],
+            json.dumps(record.get('training_zones', {}))
+        )
+
+    @staticmethod
+    def _from_row(row) -> Dict[str, Any]:
+        date, week, max_hold, experience_level, goals, training_zones = row
+        return {
+            'date': date,
+            'week': week,
+            'max_hold': max_hold,
+            'experience_level': experience_level,
+            'goals': goals,
+            'training_zones': json.loads(training_zones)
+        }
@@ -1,32 +1,107 @@
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from ..core.athlete import Athlete
+from ..core.analytics import ProgressAnalytics
+from ..config.constants import DEFAULT_LOCK_TIMEOUT
+from ..utils.file_utils import atomic_write, file_lock
+from ..utils.instrumentation import count, timed
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Cached progress documents are read-only; copy them (e.g. dict(record)) to make changes")
+
+class ReadOnlyDict(dict):
+    """A dict that refuses changes, for documents shared through the read cache"""
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return ReadOnlyDict, (dict(self),)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+class ReadOnlyList(list):
+    """A list that refuses changes, for documents shared through the read cache"""
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = clear = sort = reverse = _read_only
+
+    def __reduce__(self):
+        return ReadOnlyList, (list(self),)
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+def freeze(value: Any) -> Any:
+    """Read-only view of a decoded JSON value; parts already frozen are reused"""
+    if type(value) is dict:
+        return ReadOnlyDict((key, freeze(item)) for key, item in value.items())
+    if type(value) is list:
+        return ReadOnlyList(freeze(item) for item in value)
+    return value
+
+def thaw(value: Any) -> Any:
+    """Mutable deep copy of a (possibly frozen) JSON value"""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
 
 class ProgressStorage:
     """Handle data persistence for training progress"""
+
+    # Decoded documents shared by all instances, keyed on absolute path and
+    # validated against (inode, size, mtime) before every reuse. Cached data
+    # is shared, so load_progress hands out read-only views (see freeze());
+    # thaw() gives a mutable copy.
+    _cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+    cache_hits = 0
+    cache_misses = 0
+    # Called with the absolute path after every write, e.g. to drop derived caches
+    _write_listeners: List[Callable[[str], None]] = []
     
-    def __init__(self, filename: str = 'breath_hold_progress.json'):
+    def __init__(self, filename: str = 'breath_hold_progress.json', lock_timeout: float = DEFAULT_LOCK_TIMEOUT):
         self.filename = filename
+        self.lock_timeout = lock_timeout
     
+    @timed('storage_read')
     def load_progress(self) -> Dict[str, Any]:
-        """Load training progress from file"""
-        if not os.path.exists(self.filename):
+        """Load training progress from file as a read-only document"""
+        path = os.path.abspath(self.filename)
+        signature = self._file_signature(path)
+        if signature is None:
             return {'training_history': []}
+
+        cached = ProgressStorage._cache.get(path)
+        if cached is not None and cached[0] == signature:
+            ProgressStorage.cache_hits += 1
+            count('breath_hold_storage_reads_total', cache='hit')
+            return cached[1]
+        ProgressStorage.cache_misses += 1
+        count('breath_hold_storage_reads_total', cache='miss')
+        count('breath_hold_storage_read_bytes_total', signature[1])
         
         try:
             with open(self.filename, 'r') as f:
-                return json.load(f)
+                data = freeze(json.load(f))
         except json.JSONDecodeError:
             return {'training_history': []}
         except Exception as e:
             raise Exception(f"Error loading progress data: {e}")
+
+        ProgressStorage._cache[path] = (signature, data)
+        return data
     
     def save_progress(self, athlete: Athlete, training_zones: Dict[str, int], new_max_hold: Optional[int] = None) -> str:
         """Save training progress to file"""
-        data = self.load_progress()
-        
         current_session = {
             'date': datetime.now().isoformat(),
             'week': athlete.current_week,
@@ -35,12 +110,20 @@ class ProgressStorage:
             'goals': athlete.goals,
             'training_zones': training_zones
         }
-        
-        data['training_history'].append(current_session)
-        data['current'] = current_session
-        
-        with open(self.filename, 'w') as f:
-            json.dump(data, f, indent=2)
+
+        with file_lock(self.filename, self.lock_timeout):
+            stored = self.load_progress()
+
+            # Stored aggregates advance by one record; older documents get a one-off rebuild
+            analytics = ProgressAnalytics.for_document(stored)
+            analytics.update(current_session)
+            # A new document sharing the unchanged records; the cached one stays as it was
+            data = dict(stored)
+            data['training_history'] = list(stored.get('training_history', [])) + [current_session]
+            data['current'] = dict(current_session)
+            data['analytics'] = analytics.to_dict()
+
+            self._write(data)
         
         return self.filename
     
@@ -49,13 +132,75 @@ class ProgressStorage:
         data = self.load_progress()
         return data.get('current')
     
+    def get_analytics(self) -> Dict[str, Any]:
+        """Progress aggregates over the training history (tested maxes not yet in it are excluded)"""
+        return ProgressAnalytics.for_document(self.load_progress()).summary()
+
     def update_max_hold(self, new_max: int) -> str:
         """Update maximum hold time"""
-        data = self.load_progress()
-        if 'current' in data:
-            data['current']['max_hold'] = new_max
-            
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=2)
+        with file_lock(self.filename, self.lock_timeout):
+            stored = self.load_progress()
+            if 'current' in stored:
+                data = dict(stored)
+                data['current'] = dict(stored['current'], max_hold=new_max)
+
+                self._write(data)
         
-        return self.filename
\ No newline at end of file
+        return self.filename
+
+    def signature(self) -> Optional[Tuple[int, int, int]]:
+        """Identify the stored document's version; changes with every write"""
+        return self._file_signature(os.path.abspath(self.filename))
+
+    @classmethod
+    def add_write_listener(cls, listener: Callable[[str], None]):
+        """Call listener(absolute path) after every write through any instance"""
+        cls._write_listeners.append(listener)
+
+    @classmethod
+    def remove_write_listener(cls, listener: Callable[[str], None]):
+        """Stop calling a listener added with add_write_listener"""
+        if listener in cls._write_listeners:
+            cls._write_listeners.remove(listener)
+
+    def invalidate_cache(self):
+        """Drop the cached document for this file"""
+        ProgressStorage._cache.pop(os.path.abspath(self.filename), None)
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, int]:
+        """Get read cache hit/miss counters"""
+        return {'hits': cls.cache_hits, 'misses': cls.cache_misses, 'entries': len(cls._cache)}
+
+    @classmethod
+    def clear_cache(cls):
+        """Empty the read cache and reset its counters"""
+        cls._cache.clear()
+        cls.cache_hits = 0
+        cls.cache_misses = 0
+
+    @timed('storage_write')
+    def _write(self, data: Dict[str, Any]):
+        """Atomically replace the document and cache a read-only view under the new file signature"""
+        self.invalidate_cache()
+        content = json.dumps(data, indent=2)
+        atomic_write(self.filename, content)
+        count('breath_hold_storage_writes_total')
+        count('breath_hold_storage_write_bytes_total', len(content))
+
+        path = os.path.abspath(self.filename)
+        signature = self._file_signature(path)
+        if signature is not None:
+            ProgressStorage._cache[path] = (signature, freeze(data))
+
+        for listener in list(ProgressStorage._write_listeners):
+            listener(path)
+
+    @staticmethod
+    def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+        """Identify a file version by inode, size and modification time"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
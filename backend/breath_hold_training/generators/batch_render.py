@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple, Union
+from ..core.athlete import Athlete
+from ..core.training_zones import TrainingZones
+from ..core.sessions import SessionGenerator
+from ..config.constants import DEFAULT_RENDER_CHUNKSIZE
+from ..utils import instrumentation
+from .schedule import ScheduleGenerator
+
+RenderItem = Union[Athlete, Tuple[Athlete, Dict[str, Any]]]
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering one plan in a batch"""
+    index: int
+    filename: Optional[str] = None
+    data: Optional[bytes] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+def plan_filename(athlete: Athlete, index: Optional[int] = None) -> str:
+    """File name for an athlete's weekly plan, prefixed with its batch index"""
+    name = f"adaptive_breath_hold_week{athlete.current_week}_max{athlete.current_max//60}m{athlete.current_max%60}s.pdf"
+    return f"{index:05d}_{name}" if index is not None else name
+
+def render_plan(athlete: Athlete, weekly_schedule: Optional[Dict[str, Any]] = None) -> bytes:
+    """Render one athlete's weekly plan to PDF bytes"""
+    from .pdf_generator import PDFGenerator
+
+    zones = TrainingZones(athlete)
+    if weekly_schedule is None:
+        weekly_schedule = ScheduleGenerator(athlete, SessionGenerator(athlete, zones)).generate_weekly_schedule()
+
+    pdf_gen = PDFGenerator(athlete, zones)
+    pdf_gen.generate_complete_plan(weekly_schedule)
+    return pdf_gen.to_bytes()
+
+def _render_chunk(chunk: List[Tuple[int, RenderItem]], output_dir: Optional[str]) -> List[RenderResult]:
+    """Render a chunk of plans inside a worker, capturing failures per item"""
+    results = []
+    for index, item in chunk:
+        try:
+            athlete, schedule = item if isinstance(item, tuple) else (item, None)
+            data = render_plan(athlete, schedule)
+            if output_dir is None:
+                results.append(RenderResult(index, data=data))
+            else:
+                filename = os.path.join(output_dir, plan_filename(athlete, index))
+                with open(filename, 'wb') as f:
+                    f.write(data)
+                results.append(RenderResult(index, filename=filename))
+        except Exception as e:
+            results.append(RenderResult(index, error=f"{type(e).__name__}: {e}"))
+    return results
+
+def _render_chunk_captured(chunk: List[Tuple[int, RenderItem]], output_dir: Optional[str]):
+    """_render_chunk with the worker's metrics returned for the parent to replay"""
+    return instrumentation.call_captured(_render_chunk, chunk, output_dir)
+
+def render_batch(items: Sequence[RenderItem], output_dir: Optional[str] = None,
+                 workers: Optional[int] = None, chunksize: int = DEFAULT_RENDER_CHUNKSIZE,
+                 progress: Optional[Callable[[int, int], None]] = None) -> List[RenderResult]:
+    """Render PDFs for many athletes across a process pool.
+
+    Items are Athletes or (Athlete, weekly schedule) pairs. PDFs are written to
+    output_dir when given, otherwise returned as bytes. Failures are reported
+    per item and never abort the batch. Results come back in input order.
+    workers=1 renders in the calling process. progress(done, total) is called
+    as each chunk finishes. While metrics are enabled, the workers' stage
+    timings are recorded in the parent's registry.
+    """
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    indexed = list(enumerate(items))
+    chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+    results: List[RenderResult] = []
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in chunks:
+            results.extend(_render_chunk(chunk, output_dir))
+            if progress is not None:
+                progress(len(results), len(indexed))
+    else:
+        capture = instrumentation.is_enabled()
+        task = _render_chunk_captured if capture else _render_chunk
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(task, chunk, output_dir): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    chunk_results = future.result()
+                    if capture:
+                        chunk_results, records = chunk_results
+                        instrumentation.get_metrics().replay(records)
+                    results.extend(chunk_results)
+                except Exception as e:
+                    # The worker itself died; fail every item of its chunk
+                    results.extend(RenderResult(index, error=f"{type(e).__name__}: {e}")
+                                   for index, _item in futures[future])
+                if progress is not None:
+                    progress(len(results), len(indexed))
+
+    results.sort(key=lambda result: result.index)
+    return results
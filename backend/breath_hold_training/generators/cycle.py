@@ -0,0 +1,61 @@
+import json
+from dataclasses import asdict, replace
+from typing import Dict, Any, Iterator, Optional, Tuple
+from ..core.athlete import Athlete
+from ..core.models import schedule_to_dict
+from ..core.training_zones import TrainingZones
+from ..core.sessions import SessionGenerator
+from .schedule import ScheduleGenerator
+
+class CycleGenerator:
+    """Generate the weekly schedules of a whole training cycle.
+
+    Zones depend only on the athlete's max and progress, so they are computed
+    once and shared by every week; each week applies its own progression
+    multiplier. Weeks are produced lazily, so rendering weeks 1-2 does not
+    pay for the rest of the cycle.
+    """
+
+    def __init__(self, athlete: Athlete, training_zones: Optional[TrainingZones] = None):
+        self.athlete = athlete
+        self.zones = training_zones or TrainingZones(athlete)
+
+    def iter_weeks(self, start_week: int = 1, end_week: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (week, weekly schedule) pairs from start_week to end_week inclusive"""
+        end_week = end_week or self.athlete.total_weeks
+        if not 1 <= start_week <= end_week <= self.athlete.total_weeks:
+            raise ValueError(f"Weeks must be between 1 and {self.athlete.total_weeks}")
+
+        for week in range(start_week, end_week + 1):
+            week_athlete = replace(self.athlete, current_week=week)
+            session_gen = SessionGenerator(week_athlete, self.zones)
+            yield week, ScheduleGenerator(week_athlete, session_gen).generate_weekly_schedule()
+
+    def generate_cycle(self) -> Dict[int, Dict[str, Any]]:
+        """Generate every week of the cycle"""
+        return dict(self.iter_weeks())
+
+    def to_dict(self, start_week: int = 1, end_week: Optional[int] = None) -> Dict[str, Any]:
+        """Cycle as a JSON-ready document"""
+        return {
+            'athlete': asdict(self.athlete),
+            'training_zones': self.zones.zones,
+            'weeks': {
+                str(week): schedule_to_dict(schedule)
+                for week, schedule in self.iter_weeks(start_week, end_week)
+            }
+        }
+
+    def save_json(self, filename: str, start_week: int = 1, end_week: Optional[int] = None) -> str:
+        """Save the cycle as one JSON document"""
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(start_week, end_week), f, indent=2)
+        return filename
+
+    def save_pdf(self, filename: str, start_week: int = 1, end_week: Optional[int] = None) -> str:
+        """Render the cycle into one PDF with an overview and session pages per week"""
+        from .pdf_generator import PDFGenerator
+
+        pdf_gen = PDFGenerator(self.athlete, self.zones)
+        pdf_gen.generate_cycle_plan(self.iter_weeks(start_week, end_week))
+        return pdf_gen.save_pdf(filename)
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from ..core.athlete import Athlete
+from ..core.models import Session
+from ..config.constants import DEFAULT_PDF_CACHE_DIR, DEFAULT_PDF_CACHE_BYTES, PDF_CACHE_DIR_ENV
+from ..utils.file_utils import atomic_write
+
+# Bump whenever the PDF layout changes so stale renders are never served
+PDF_LAYOUT_VERSION = 2
+
+def default_cache_dir() -> str:
+    """$BREATH_HOLD_PDF_CACHE_DIR, else breath_hold/pdf in the user cache directory.
+
+    The user cache directory is $XDG_CACHE_HOME, %LOCALAPPDATA% on Windows,
+    or ~/.cache.
+    """
+    override = os.environ.get(PDF_CACHE_DIR_ENV)
+    if override:
+        return override
+    base = os.environ.get('XDG_CACHE_HOME') or (os.name == 'nt' and os.environ.get('LOCALAPPDATA')) \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, DEFAULT_PDF_CACHE_DIR)
+
+class PDFCache:
+    """Content-addressed on-disk cache of rendered plan PDFs.
+
+    Entries are keyed by a SHA-256 of the normalized header fields and
+    schedule, inserted atomically, and evicted least-recently-used (by
+    file mtime, refreshed on every hit) once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_PDF_CACHE_BYTES):
+        directory = directory or default_cache_dir()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._entries())
+
+    @staticmethod
+    def cache_key(athlete: Athlete, weekly_schedule: Dict[str, Any], week: Optional[int] = None) -> str:
+        """Stable hash of everything that appears in the rendered plan.
+
+        Sessions are fingerprinted from their compact fields; repr() of tuples
+        of ints and strings is identical across processes and runs.
+        """
+        header = (
+            PDF_LAYOUT_VERSION,
+            week or athlete.current_week,
+            athlete.total_weeks,
+            athlete.current_max,
+            athlete.previous_max,
+            athlete.experience_level,
+            athlete.goals
+        )
+        days = []
+        for day, session in weekly_schedule.items():
+            if isinstance(session, Session):
+                rounds = tuple(
+                    (r.number, r.hold, r.rest, r.target_rpe, r.focus, r.open_ended)
+                    for r in session.rounds or ())
+                days.append((day, session.type, session.description, session.notes, rounds))
+            else:
+                days.append((day, json.dumps(session, sort_keys=True)))
+
+        return hashlib.sha256(repr((header, tuple(days))).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Get a cached PDF and mark it recently used"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Insert a rendered PDF, evicting old entries past the size cap"""
+        path = self._path(key)
+        try:
+            previous_size = os.path.getsize(path)
+        except FileNotFoundError:
+            previous_size = 0
+
+        atomic_write(path, data)
+        with self._lock:
+            self._total_bytes += len(data) - previous_size
+            over_cap = self._total_bytes > self.max_bytes
+        if over_cap:
+            self._evict()
+
+    def get_or_render(self, pdf_gen, weekly_schedule: Dict[str, Any]) -> bytes:
+        """Serve a PDFGenerator's plan from the cache, rendering it on a miss"""
+        key = self.cache_key(pdf_gen.athlete, weekly_schedule, pdf_gen.week)
+        data = self.get(key)
+        if data is None:
+            pdf_gen.generate_complete_plan(weekly_schedule)
+            data = pdf_gen.to_bytes()
+            self.put(key, data)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters and the cache size"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def clear(self):
+        """Delete every cached PDF"""
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._total_bytes = 0
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits the cap.
+
+        Rescans the directory so entries added by other processes count too.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        evicted = 0
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                evicted += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+
+        with self._lock:
+            self._total_bytes = total
+            self.evictions += evicted
+
+    def _entries(self) -> List[Tuple[str, int, int]]:
+        """(path, mtime_ns, size) for every cached PDF"""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith('.pdf'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_mtime_ns, stat.st_size))
+        return entries
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
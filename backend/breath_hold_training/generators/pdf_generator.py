@@ -1,10 +1,144 @@
 # breath_hold_training/generators/pdf_generator.py
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, BinaryIO, Iterable, Optional, Tuple
 from ..core.athlete import Athlete
 from ..core.training_zones import TrainingZones
 from ..utils.time_utils import format_time
+from ..utils.instrumentation import timed
+
+# Core font the plans are set in ('Arial' is only an alias fpdf2 maps to it)
+FONT_FAMILY = 'helvetica'
+# new_x/new_y for a cell that ends the line (the deprecated ln=1)
+NEXT_LINE = {'new_x': XPos.LMARGIN, 'new_y': YPos.NEXT}
+
+# Stamps read and write fpdf2 internals (page content buffers, _out, the
+# resource catalog, font indexes), as laid out in the 2.8 releases they
+# were tested on. Where those differ, pages fall back to plain cells.
+try:
+    from fpdf.enums import PDFResourceType
+except ImportError:
+    PDFResourceType = None
+
+def stamping_supported(pdf: FPDF) -> bool:
+    """Whether this fpdf2 exposes the internals stamps are written through"""
+    return (PDFResourceType is not None and callable(getattr(pdf, '_out', None))
+            and callable(getattr(getattr(pdf, '_resource_catalog', None), 'add', None)))
+
+class Stamp:
+    """Content stream of a static block, recorded once at a reference height"""
+    __slots__ = ('style', 'size', 'height', 'y', 'content')
+
+    def __init__(self, style: str, size: int, height: float, y: float, content: bytes):
+        self.style = style
+        self.size = size
+        self.height = height
+        self.y = y
+        self.content = content
+
+class PageLayout:
+    """Static elements shared by every plan page, computed once per process.
+
+    The rounds table header row and the ruled notes section are drawn once on
+    a scratch page and kept as content stream stamps; a document only renders
+    the per-athlete fields (titles, times, RPE, focus) and translates the
+    stamps to where they fall on its page. Focus labels are truncated once.
+    With an fpdf2 whose internals differ, there are no stamps
+    (header_stamps is empty, notes_stamp None) and pages draw every cell.
+    """
+
+    ROW_HEIGHT = 8
+    NOTES_LINES = 8
+    # (style, size) of the rounds table header and the notes section
+    HEADER_FONT = ('B', 10)
+    NOTES_FONT = ('B', 11)
+    FOCUS_LIMIT = 25
+    MAX_FOCUS_LABELS = 1024
+    # Height on the scratch page where stamps are recorded
+    REFERENCE_Y = 50
+
+    def __init__(self):
+        base_headers = ('Round', 'Hold Time', 'Rest', 'Target RPE')
+        base_widths = (20, 30, 30, 30)
+        # Rounds table header cells keyed by whether the table has a focus column
+        self.table_headers = {
+            False: tuple(zip(base_headers, base_widths)),
+            True: tuple(zip(base_headers + ('Focus',), base_widths + (70,)))
+        }
+        self._focus_labels: Dict[str, str] = {}
+
+        scratch = FPDF()
+        self.page_geometry = self.geometry(scratch)
+        self.header_stamps: Dict[bool, Stamp] = {}
+        self.notes_stamp: Optional[Stamp] = None
+        if not stamping_supported(scratch):
+            return
+        try:
+            self.header_stamps = {
+                has_focus: self._record(scratch, self.HEADER_FONT, self.ROW_HEIGHT,
+                                        lambda pdf, cells=cells: self.draw_table_header(pdf, cells))
+                for has_focus, cells in self.table_headers.items()
+            }
+            self.notes_stamp = self._record(scratch, self.NOTES_FONT, self.ROW_HEIGHT * (self.NOTES_LINES + 1),
+                                            self.draw_notes)
+        except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+            # Page content buffers are laid out differently in this fpdf2
+            self.header_stamps = {}
+            self.notes_stamp = None
+
+    @staticmethod
+    def geometry(pdf: FPDF) -> Tuple[float, ...]:
+        """Page size, scale, margins and line width the stamps depend on"""
+        return (pdf.w, pdf.h, pdf.k, pdf.l_margin, pdf.r_margin, pdf.line_width)
+
+    def draw_table_header(self, pdf: FPDF, cells: Tuple[Tuple[str, int], ...]):
+        """Draw the rounds table header row with plain cells"""
+        for header, width in cells:
+            pdf.cell(width, self.ROW_HEIGHT, header, 1, align='C')
+        pdf.ln()
+
+    def draw_notes(self, pdf: FPDF):
+        """Draw the notes section with plain cells"""
+        pdf.cell(0, self.ROW_HEIGHT, 'Notes & Performance:', 0, **NEXT_LINE)
+        for _ in range(self.NOTES_LINES):
+            pdf.cell(0, self.ROW_HEIGHT, '', 'B', **NEXT_LINE)
+
+    def _record(self, scratch: FPDF, font: Tuple[str, int], height: float, draw) -> Stamp:
+        """Draw a block on a fresh scratch page and keep its content stream.
+
+        The leading font selection is dropped; stamping re-selects the font by
+        the index it has in the target document.
+        """
+        style, size = font
+        scratch.add_page()
+        scratch.set_font(FONT_FAMILY, style, size)
+        scratch.set_y(self.REFERENCE_Y)
+        contents = scratch.pages[scratch.page].contents
+        start = len(contents)
+        draw(scratch)
+        font_line, content = bytes(contents[start:]).split(b'\n', 1)
+        if not font_line.endswith(b' Tf ET'):
+            raise ValueError(f"Unexpected stamp prologue: {font_line!r}")
+        return Stamp(style, size, height, self.REFERENCE_Y, content.rstrip(b'\n'))
+
+    def focus_label(self, focus: str) -> str:
+        """Focus text truncated to fit its column"""
+        label = self._focus_labels.get(focus)
+        if label is None:
+            label = focus[:self.FOCUS_LIMIT] + '...' if len(focus) > self.FOCUS_LIMIT else focus
+            if len(self._focus_labels) < self.MAX_FOCUS_LABELS:
+                self._focus_labels[focus] = label
+        return label
+
+_page_layout: Optional[PageLayout] = None
+
+def get_page_layout() -> PageLayout:
+    """Get the process-wide page layout"""
+    global _page_layout
+    if _page_layout is None:
+        _page_layout = PageLayout()
+    return _page_layout
 
 class PDFGenerator(FPDF):
     """PDF generator for training plans"""
@@ -13,25 +147,46 @@ class PDFGenerator(FPDF):
         super().__init__()
         self.athlete = athlete
         self.zones = training_zones
+        self.week = athlete.current_week
+        self.layout = get_page_layout()
+        self._header_lines: Optional[Tuple[int, str, str]] = None
     
     def header(self):
         """PDF header"""
-        self.set_font('Arial', 'B', 16)
-        title = f"Adaptive Breath-Hold Training - Week {self.athlete.current_week}/{self.athlete.total_weeks}"
-        self.cell(0, 10, title, 0, 1, 'C')
-
-        self.set_font('Arial', '', 10)
-        progress_info = f"Current Max: {format_time(self.athlete.current_max)} | "
-        if self.athlete.previous_max and self.athlete.previous_max > 0:
-            improvement = self.athlete.current_max - self.athlete.previous_max
-            progress_info += f"Progress: +{format_time(improvement)} | "
-        progress_info += f"Level: {self.athlete.experience_level.title()}"
+        title, progress_info = self._header_text()
+        self.set_font(FONT_FAMILY, 'B', 16)
+        self.cell(0, 10, title, 0, align='C', **NEXT_LINE)
 
-        self.cell(0, 5, progress_info, 0, 1, 'C')
+        self.set_font(FONT_FAMILY, '', 10)
+        self.cell(0, 5, progress_info, 0, align='C', **NEXT_LINE)
         self.ln(5)
+
+    def _header_text(self) -> Tuple[str, str]:
+        """Header title and progress line, built once per week of the document"""
+        if self._header_lines is None or self._header_lines[0] != self.week:
+            title = f"Adaptive Breath-Hold Training - Week {self.week}/{self.athlete.total_weeks}"
+            progress_info = f"Current Max: {format_time(self.athlete.current_max)} | "
+            if self.athlete.previous_max and self.athlete.previous_max > 0:
+                improvement = self.athlete.current_max - self.athlete.previous_max
+                progress_info += f"Progress: +{format_time(improvement)} | "
+            progress_info += f"Level: {self.athlete.experience_level.title()}"
+            self._header_lines = (self.week, title, progress_info)
+        return self._header_lines[1], self._header_lines[2]
     
+    @timed('pdf_layout')
     def generate_complete_plan(self, weekly_schedule: Dict[str, Any]):
         """Generate complete PDF plan"""
+        self._draw_week(weekly_schedule)
+    
+    @timed('pdf_layout')
+    def generate_cycle_plan(self, weekly_schedules: Iterable[Tuple[int, Dict[str, Any]]]):
+        """Generate one PDF covering several weeks of (week, schedule) pairs"""
+        for week, schedule in weekly_schedules:
+            self.week = week
+            self._draw_week(schedule)
+    
+    def _draw_week(self, weekly_schedule: Dict[str, Any]):
+        """Overview page then one page per session (untimed, so cycles count as one layout)"""
         # Add overview page
         self.add_page()
         self._draw_overview(weekly_schedule)
@@ -42,12 +197,12 @@ class PDFGenerator(FPDF):
     
     def _draw_overview(self, schedule: Dict[str, Any]):
         """Draw training overview"""
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, f'Personalized Training Plan - {self.athlete.goals.title()} Focus', 0, 1, 'L')
+        self.set_font(FONT_FAMILY, 'B', 14)
+        self.cell(0, 10, f'Personalized Training Plan - {self.athlete.goals.title()} Focus', 0, align='L', **NEXT_LINE)
         self.ln(5)
         
         # Personal stats
-        self.set_font('Arial', '', 11)
+        self.set_font(FONT_FAMILY, '', 11)
         stats_text = f"Experience: {self.athlete.experience_level.title()} | "
         stats_text += f"Current Max: {format_time(self.athlete.current_max)}"
         if self.athlete.previous_max and self.athlete.previous_max > 0:
@@ -58,28 +213,28 @@ class PDFGenerator(FPDF):
         self.ln(10)
         
         # Weekly schedule table
-        self.set_font('Arial', 'B', 12)
-        self.cell(0, 8, 'This Week\'s Schedule:', 0, 1)
+        self.set_font(FONT_FAMILY, 'B', 12)
+        self.cell(0, 8, 'This Week\'s Schedule:', 0, **NEXT_LINE)
         self.ln(5)
         
         for day, session in schedule.items():
-            self.set_font('Arial', 'B', 10)
-            self.cell(0, 6, f"{day}: {session.get('type', 'Rest')}", 0, 1)
+            self.set_font(FONT_FAMILY, 'B', 10)
+            self.cell(0, 6, f"{day}: {session.get('type', 'Rest')}", 0, **NEXT_LINE)
             if 'description' in session:
-                self.set_font('Arial', '', 9)
-                self.cell(0, 5, f"  {session['description']}", 0, 1)
+                self.set_font(FONT_FAMILY, '', 9)
+                self.cell(0, 5, f"  {session['description']}", 0, **NEXT_LINE)
         
         self.ln(10)
     
     def _draw_session_detail(self, day: str, session: Dict[str, Any]):
         """Draw detailed session page"""
         self.add_page()
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, f'{day} - {session["type"]}', 0, 1)
+        self.set_font(FONT_FAMILY, 'B', 14)
+        self.cell(0, 10, f'{day} - {session["type"]}', 0, **NEXT_LINE)
         self.ln(5)
         
         if 'description' in session:
-            self.set_font('Arial', '', 11)
+            self.set_font(FONT_FAMILY, '', 11)
             self.multi_cell(0, 6, session['description'])
             self.ln(5)
         
@@ -88,42 +243,72 @@ class PDFGenerator(FPDF):
             self._draw_rounds_table(session['rounds'])
         
         # Add notes section
-        self.set_font('Arial', 'B', 11)
-        self.cell(0, 8, 'Notes & Performance:', 0, 1)
-        for i in range(8):
-            self.cell(0, 8, '', 'B', 1)
+        if not self._stamp(self.layout.notes_stamp, PageLayout.NOTES_FONT):
+            self.layout.draw_notes(self)
+    
+    def _stamp(self, stamp: Optional[Stamp], font: Tuple[str, int]) -> bool:
+        """Place a recorded static block at the current position in its font.
+
+        Returns False, with only the font selected, when there is no stamp, the
+        block would cross a page break or the page geometry differs from the
+        one it was recorded on; the caller then draws the block with plain cells.
+        """
+        self.set_font(FONT_FAMILY, *font)
+        if stamp is None:
+            return False
+        font_index = getattr(self.current_font, 'i', None)
+        if (font_index is None or self.will_page_break(stamp.height)
+                or PageLayout.geometry(self) != self.layout.page_geometry):
+            return False
+
+        offset = (stamp.y - self.y) * self.k
+        self._out(f"q 1 0 0 1 0 {offset:.2f} cm BT /F{font_index} {stamp.size:.2f} Tf ET")
+        self._out(stamp.content)
+        self._out("Q")
+        self._resource_catalog.add(PDFResourceType.FONT, font_index, self.page)
+        self.ln(stamp.height)
+        return True
     
     def _draw_rounds_table(self, rounds):
         """Draw rounds table"""
-        # Headers
-        headers = ['Round', 'Hold Time', 'Rest', 'Target RPE']
-        if 'focus' in rounds[0]:
-            headers.append('Focus')
-        
-        col_widths = [20, 30, 30, 30] + ([70] if len(headers) > 4 else [])
-        
-        self.set_font('Arial', 'B', 10)
-        for i, header in enumerate(headers):
-            self.cell(col_widths[i], 8, header, 1, 0, 'C')
-        self.ln()
+        layout = self.layout
+        row = layout.ROW_HEIGHT
+        has_focus = 'focus' in rounds[0]
+        headers = layout.table_headers[has_focus]
+
+        if not self._stamp(layout.header_stamps.get(has_focus), layout.HEADER_FONT):
+            layout.draw_table_header(self, headers)
         
         # Data rows
-        self.set_font('Arial', '', 9)
+        widths = [width for _, width in headers]
+        self.set_font(FONT_FAMILY, '', 9)
         for round_data in rounds:
-            self.cell(col_widths[0], 8, str(round_data['round']), 1, 0, 'C')
-            self.cell(col_widths[1], 8, round_data['hold_time'], 1, 0, 'C')
-            self.cell(col_widths[2], 8, round_data['rest_time'], 1, 0, 'C')
-            self.cell(col_widths[3], 8, round_data.get('target_rpe', ''), 1, 0, 'C')
+            self.cell(widths[0], row, str(round_data['round']), 1, align='C')
+            self.cell(widths[1], row, round_data['hold_time'], 1, align='C')
+            self.cell(widths[2], row, round_data['rest_time'], 1, align='C')
+            self.cell(widths[3], row, round_data.get('target_rpe', ''), 1, align='C')
             
             if 'focus' in round_data:
-                focus_text = round_data['focus'][:25] + '...' if len(round_data['focus']) > 25 else round_data['focus']
-                self.cell(col_widths[4], 8, focus_text, 1, 0, 'L')
+                self.cell(widths[4], row, layout.focus_label(round_data['focus']), 1, align='L')
             
             self.ln()
         
         self.ln(5)
     
+    @timed('pdf_output')
     def save_pdf(self, filename: str):
         """Save PDF to file"""
-        self.output(filename, 'F')
-        return filename
\ No newline at end of file
+        self.output(filename)
+        return filename
+    
+    @timed('pdf_output')
+    def to_bytes(self) -> bytes:
+        """Render the PDF in memory, e.g. for an HTTP response body"""
+        return bytes(self.output())
+    
+    @timed('pdf_output')
+    def write_to(self, stream: BinaryIO) -> int:
+        """Write the PDF to a binary stream and return the bytes written"""
+        data = self.output()
+        stream.write(data)
+        return len(data)
\ No newline at end of file
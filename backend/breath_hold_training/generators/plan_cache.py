@@ -0,0 +1,167 @@
+import threading
+from collections import OrderedDict
+from itertools import product
+from typing import Dict, Any, Tuple, Optional
+from ..core.athlete import Athlete
+from ..core.models import Round, Session
+from ..core.training_zones import TrainingZones
+from ..core.sessions import SessionGenerator
+from ..config.constants import (
+    SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS, DEFAULT_TOTAL_WEEKS, DEFAULT_PLAN_CACHE_SIZE
+)
+from .schedule import ScheduleGenerator
+
+PlanKey = Tuple[int, str, str, int, str]
+
+# Previous max ratios that land an athlete in each progress bucket
+BUCKET_PREVIOUS_RATIOS = {'conservative': None, 'steady': 1.1, 'aggressive': 1.3}
+
+class PlanCache:
+    """Memoize weekly schedules on the only inputs that shape them.
+
+    A schedule depends on current_max, experience level, goals, week and the
+    progress-rate bucket, so athletes sharing those get the same plan. Lookups
+    check an optional precomputed table first, then a bounded LRU.
+    Returned schedules are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_PLAN_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lru: 'OrderedDict[PlanKey, Dict[str, Any]]' = OrderedDict()
+        self._table: Dict[PlanKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def plan_key(athlete: Athlete) -> PlanKey:
+        """Normalize an athlete to the inputs the schedule depends on"""
+        return (
+            athlete.current_max,
+            athlete.experience_level,
+            athlete.goals,
+            min(athlete.current_week, DEFAULT_TOTAL_WEEKS),
+            TrainingZones.progress_bucket(athlete.progress_rate)
+        )
+
+    def get_schedule(self, athlete: Athlete) -> Dict[str, Any]:
+        """Get the weekly schedule for an athlete, generating it on a miss"""
+        key = self.plan_key(athlete)
+
+        schedule = self._table.get(key)
+        if schedule is not None:
+            with self._lock:
+                self.hits += 1
+            return schedule
+
+        with self._lock:
+            schedule = self._lru.get(key)
+            if schedule is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return schedule
+            self.misses += 1
+
+        schedule = self._generate(athlete)
+
+        with self._lock:
+            self._lru[key] = schedule
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+        return schedule
+
+    def peek(self, key: PlanKey) -> Optional[Dict[str, Any]]:
+        """Get a cached schedule by key without generating it on a miss"""
+        schedule = self._table.get(key)
+        with self._lock:
+            if schedule is None:
+                schedule = self._lru.get(key)
+                if schedule is None:
+                    return None
+                self._lru.move_to_end(key)
+            self.hits += 1
+        return schedule
+
+    def precompute(self, min_max: int = 30, max_max: int = 600) -> int:
+        """Fill the lookup table for every plan with current_max in [min_max, max_max].
+
+        Identical rounds and sessions are shared between plans to keep the
+        table compact. Returns the number of plans in the table.
+        """
+        interned = {}
+        for key in product(range(min_max, max_max + 1), SUPPORTED_EXPERIENCE_LEVELS, SUPPORTED_GOALS,
+                           range(1, DEFAULT_TOTAL_WEEKS + 1), BUCKET_PREVIOUS_RATIOS):
+            athlete = self.athlete_for_key(key)
+            if athlete is not None:
+                self._table[key] = _intern(self._generate(athlete), interned)
+        return len(self._table)
+
+    @classmethod
+    def athlete_for_key(cls, key: PlanKey) -> Optional[Athlete]:
+        """Build an athlete whose plan has the given key.
+
+        Returns None when the max is too small to reach the progress bucket
+        with a whole-second previous max.
+        """
+        current_max, level, goals, week, bucket = key
+        ratio = BUCKET_PREVIOUS_RATIOS[bucket]
+        athlete = Athlete(
+            current_max=current_max,
+            previous_max=round(current_max / ratio) if ratio else None,
+            experience_level=level,
+            goals=goals,
+            current_week=week
+        )
+        return athlete if cls.plan_key(athlete) == tuple(key) else None
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters and sizes"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'lru_entries': len(self._lru),
+            'table_entries': len(self._table)
+        }
+
+    def clear(self):
+        """Drop cached and precomputed plans and reset counters"""
+        with self._lock:
+            self._lru.clear()
+            self._table.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def _generate(athlete: Athlete) -> Dict[str, Any]:
+        zones = TrainingZones(athlete)
+        return ScheduleGenerator(athlete, SessionGenerator(athlete, zones)).generate_weekly_schedule()
+
+def _intern(value: Any, interned: Dict[Any, Any]) -> Any:
+    """Replace a plan structure with shared copies of equal sub-structures"""
+    if isinstance(value, Round):
+        key = ('round', value.number, value.hold, value.rest, value.target_rpe, value.focus, value.open_ended)
+    elif isinstance(value, Session):
+        rounds = _intern(value.rounds, interned) if value.rounds is not None else None
+        value = Session(value.kind, value.description_template, rounds, value.notes, value.times, value.label)
+        key = ('session', value.kind, value.description_template, value.times, id(rounds), value.notes, value.label)
+    elif isinstance(value, dict):
+        value = {k: _intern(v, interned) for k, v in value.items()}
+        key = ('dict', tuple((k, id(v)) for k, v in value.items()))
+    elif isinstance(value, list):
+        value = [_intern(v, interned) for v in value]
+        key = ('list', tuple(id(v) for v in value))
+    elif isinstance(value, str):
+        key = value
+    else:
+        return value
+    return interned.setdefault(key, value)
+
+_default_cache: Optional[PlanCache] = None
+
+def get_plan_cache() -> PlanCache:
+    """Get the process-wide plan cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PlanCache()
+    return _default_cache
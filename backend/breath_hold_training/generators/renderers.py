@@ -0,0 +1,254 @@
+import html
+import json
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Type
+from ..core.athlete import Athlete
+from ..core.models import schedule_to_dict
+from ..core.training_zones import TrainingZones
+from ..utils.time_utils import format_time
+
+DAY_OFFSETS = {
+    'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
+    'Friday': 4, 'Saturday': 5, 'Sunday': 6
+}
+
+class PlanRenderer(ABC):
+    """Base class for weekly plan output formats.
+
+    Subclasses set a format name, file extension and media type and turn a
+    weekly schedule into bytes. Register them with register_renderer() to
+    make them selectable from the CLI and API.
+    """
+    name = ''
+    extension = ''
+    media_type = 'application/octet-stream'
+
+    @abstractmethod
+    def render(self, athlete: Athlete, weekly_schedule: Dict[str, Any],
+               zones: Optional[TrainingZones] = None, week: Optional[int] = None) -> bytes:
+        """The plan in this format"""
+
+    def filename(self, athlete: Athlete, stamp: Optional[str] = None) -> str:
+        """Default output file name for an athlete's plan"""
+        name = f"adaptive_breath_hold_week{athlete.current_week}_max{athlete.current_max//60}m{athlete.current_max%60}s"
+        if stamp:
+            name += f"_{stamp}"
+        return f"{name}.{self.extension}"
+
+RENDERERS: Dict[str, Type[PlanRenderer]] = {}
+
+def register_renderer(renderer_class: Type[PlanRenderer]) -> Type[PlanRenderer]:
+    """Class decorator adding a renderer to RENDERERS under its name"""
+    RENDERERS[renderer_class.name] = renderer_class
+    return renderer_class
+
+def get_renderer(name: str, **options) -> PlanRenderer:
+    """Create the renderer for an output format"""
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown output format: {name} (choose from {', '.join(sorted(RENDERERS))})")
+    return RENDERERS[name](**options)
+
+@register_renderer
+class PDFRenderer(PlanRenderer):
+    """Printable PDF plan, optionally served from a PDFCache"""
+    name = 'pdf'
+    extension = 'pdf'
+    media_type = 'application/pdf'
+
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    def render(self, athlete: Athlete, weekly_schedule: Dict[str, Any],
+               zones: Optional[TrainingZones] = None, week: Optional[int] = None) -> bytes:
+        from .pdf_generator import PDFGenerator
+
+        pdf_gen = PDFGenerator(athlete, zones or TrainingZones(athlete))
+        if week is not None:
+            pdf_gen.week = week
+        if self.cache is not None:
+            return self.cache.get_or_render(pdf_gen, weekly_schedule)
+        pdf_gen.generate_complete_plan(weekly_schedule)
+        return pdf_gen.to_bytes()
+
+@register_renderer
+class JSONRenderer(PlanRenderer):
+    """Plan as JSON in the legacy session/round dict format the frontend reads"""
+    name = 'json'
+    extension = 'json'
+    media_type = 'application/json'
+
+    def __init__(self, indent: Optional[int] = None):
+        self.indent = indent
+
+    def to_dict(self, athlete: Athlete, weekly_schedule: Dict[str, Any],
+                zones: Optional[TrainingZones] = None, week: Optional[int] = None) -> Dict[str, Any]:
+        """Plan as a JSON-ready document"""
+        return {
+            'athlete': asdict(athlete),
+            'week': week or athlete.current_week,
+            'training_zones': (zones or TrainingZones(athlete)).zones,
+            'schedule': schedule_to_dict(weekly_schedule)
+        }
+
+    def render(self, athlete: Athlete, weekly_schedule: Dict[str, Any],
+               zones: Optional[TrainingZones] = None, week: Optional[int] = None) -> bytes:
+        document = self.to_dict(athlete, weekly_schedule, zones, week)
+        separators = (',', ':') if self.indent is None else None
+        return json.dumps(document, indent=self.indent, separators=separators).encode('utf-8')
+
+@register_renderer
+class HTMLRenderer(PlanRenderer):
+    """Standalone static HTML page with the same content as the PDF"""
+    name = 'html'
+    extension = 'html'
+    media_type = 'text/html; charset=utf-8'
+
+    PAGE = ('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            '<title>{title}</title>\n<style>{style}</style>\n</head>\n<body>\n'
+            '<header><h1>{title}</h1><p>{progress}</p></header>\n{body}</body>\n</html>\n')
+    STYLE = ('body{font-family:Helvetica,Arial,sans-serif;max-width:48rem;margin:2rem auto;padding:0 1rem}'
+             'header{text-align:center}table{border-collapse:collapse;margin:1rem 0}'
+             'th,td{border:1px solid #444;padding:.25rem .75rem;text-align:center}'
+             'td.focus{text-align:left}section{margin-top:2rem}')
+    TABLE_HEADERS = ('Round', 'Hold Time', 'Rest', 'Target RPE')
+
+    def render(self, athlete: Athlete, weekly_schedule: Dict[str, Any],
+               zones: Optional[TrainingZones] = None, week: Optional[int] = None) -> bytes:
+        escape = html.escape
+        week = week or athlete.current_week
+        title = f"Adaptive Breath-Hold Training - Week {week}/{athlete.total_weeks}"
+
+        progress = f"Current Max: {format_time(athlete.current_max)} | "
+        if athlete.previous_max and athlete.previous_max > 0:
+            progress += f"Progress: +{format_time(athlete.current_max - athlete.previous_max)} | "
+        progress += f"Level: {athlete.experience_level.title()}"
+
+        parts = [f'<h2>Personalized Training Plan - {escape(athlete.goals.title())} Focus</h2>\n<ul>\n']
+        for day, session in weekly_schedule.items():
+            parts.append(f'<li><a href="#{escape(day.lower())}"><strong>{escape(day)}</strong></a>: '
+                         f'{escape(session.get("type", "Rest"))}')
+            if 'description' in session:
+                parts.append(f' &ndash; {escape(session["description"])}')
+            parts.append('</li>\n')
+        parts.append('</ul>\n')
+
+        for day, session in weekly_schedule.items():
+            parts.append(f'<section id="{escape(day.lower())}">\n'
+                         f'<h2>{escape(day)} - {escape(session["type"])}</h2>\n')
+            if 'description' in session:
+                parts.append(f'<p>{escape(session["description"])}</p>\n')
+            if 'rounds' in session:
+                parts.append(self._rounds_table(session['rounds']))
+            if 'notes' in session:
+                parts.append(f'<p><em>{escape(session["notes"])}</em></p>\n')
+            parts.append('</section>\n')
+
+        page = self.PAGE.format(title=escape(title), progress=escape(progress),
+                                style=self.STYLE, body=''.join(parts))
+        return page.encode('utf-8')
+
+    def _rounds_table(self, rounds) -> str:
+        escape = html.escape
+        has_focus = 'focus' in rounds[0]
+        headers = self.TABLE_HEADERS + (('Focus',) if has_focus else ())
+        rows = ['<table>\n<tr>', ''.join(f'<th>{header}</th>' for header in headers), '</tr>\n']
+        for round_data in rounds:
+            rows.append(f"<tr><td>{round_data['round']}</td><td>{escape(round_data['hold_time'])}</td>"
+                        f"<td>{escape(round_data['rest_time'])}</td>"
+                        f"<td>{escape(round_data.get('target_rpe', ''))}</td>")
+            if 'focus' in round_data:
+                rows.append(f"<td class=\"focus\">{escape(round_data['focus'])}</td>")
+            rows.append('</tr>\n')
+        rows.append('</table>\n')
+        return ''.join(rows)
+
+@register_renderer
+class ICSRenderer(PlanRenderer):
+    """iCalendar feed with one all-day event per training day.
+
+    Days are placed in the week of start_date (defaults to today), starting
+    on its Monday. Event UIDs depend only on that week and the day, so
+    re-importing a re-planned week replaces its events instead of adding more.
+    """
+    name = 'ics'
+    extension = 'ics'
+    media_type = 'text/calendar; charset=utf-8'
+
+    PRODID = '-//Adaptive Breath-Hold Training//Plan Generator//EN'
+    LINE_LIMIT = 75
+
+    def __init__(self, start_date: Optional[date] = None, timestamp: Optional[datetime] = None):
+        self.start_date = start_date
+        self.timestamp = timestamp
+
+    def render(self, athlete: Athlete, weekly_schedule: Dict[str, Any],
+               zones: Optional[TrainingZones] = None, week: Optional[int] = None) -> bytes:
+        week = week or athlete.current_week
+        start = self.start_date or date.today()
+        start -= timedelta(days=start.weekday())
+        stamp = (self.timestamp or datetime.now(timezone.utc)).strftime('%Y%m%dT%H%M%SZ')
+
+        lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{self.PRODID}', 'CALSCALE:GREGORIAN',
+                 f'X-WR-CALNAME:{self._escape(f"Breath-Hold Training Week {week}")}']
+        for day, session in weekly_schedule.items():
+            if day not in DAY_OFFSETS:
+                raise ValueError(f"Cannot place day '{day}' in a calendar week")
+            day_date = start + timedelta(days=DAY_OFFSETS[day])
+            lines.extend((
+                'BEGIN:VEVENT',
+                f'UID:{start:%Y%m%d}-week{week}-{day.lower()}@breath-hold-training',
+                f'DTSTAMP:{stamp}',
+                f'DTSTART;VALUE=DATE:{day_date:%Y%m%d}',
+                f'DTEND;VALUE=DATE:{day_date + timedelta(days=1):%Y%m%d}',
+                f'SUMMARY:{self._escape(session.get("type", "Rest"))}',
+                f'DESCRIPTION:{self._escape(self._describe(session))}',
+                'TRANSP:TRANSPARENT',
+                'END:VEVENT'
+            ))
+        lines.append('END:VCALENDAR')
+        return ''.join(self._fold(line) + '\r\n' for line in lines).encode('utf-8')
+
+    @staticmethod
+    def _describe(session) -> str:
+        """Description text with one line per round"""
+        lines: List[str] = [session['description']] if 'description' in session else []
+        for round_data in session.get('rounds') or ():
+            line = (f"Round {round_data['round']}: hold {round_data['hold_time']}, "
+                    f"rest {round_data['rest_time']}, RPE {round_data.get('target_rpe', '')}")
+            if 'focus' in round_data:
+                line += f" - {round_data['focus']}"
+            lines.append(line)
+        if 'notes' in session:
+            lines.append(session['notes'])
+        return '\n'.join(lines)
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        """Escape a TEXT property value (RFC 5545 3.3.11)"""
+        return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+                .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+    @classmethod
+    def _fold(cls, line: str) -> str:
+        """Fold a content line to 75 octets (RFC 5545 3.1)"""
+        limit = cls.LINE_LIMIT
+        # Continuation lines start with a space that counts toward the limit
+        if line.isascii():
+            if len(line) <= limit:
+                return line
+            parts = [line[:limit]]
+            parts.extend(line[i:i + limit - 1] for i in range(limit, len(line), limit - 1))
+            return '\r\n '.join(parts)
+
+        parts, current, size = [], '', 0
+        for char in line:
+            width = len(char.encode('utf-8'))
+            if size + width > (limit if not parts else limit - 1):
+                parts.append(current)
+                current, size = '', 0
+            current += char
+            size += width
+        parts.append(current)
+        return '\r\n '.join(parts)
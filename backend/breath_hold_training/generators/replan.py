@@ -0,0 +1,190 @@
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+from ..core.athlete import Athlete
+from ..core.models import SessionKind
+from ..core.training_zones import TrainingZones
+from ..core.sessions import SessionGenerator
+from ..config.constants import DEFAULT_TOTAL_WEEKS
+from .plan_cache import PlanCache, get_plan_cache
+from .schedule import ScheduleGenerator
+
+# Zones each session kind reads; kinds not listed never change
+ZONE_DEPENDENCIES = {
+    SessionKind.CO2_RECOVERY: ('co2_recovery',),
+    SessionKind.CO2_STANDARD: ('co2_base',),
+    SessionKind.O2: ('o2_start', 'o2_peak'),
+    SessionKind.PERFORMANCE_TEST: ('test_target',),
+    SessionKind.TECHNIQUE: ('co2_recovery',)
+}
+
+@dataclass
+class ReplanResult:
+    """Outcome of an incremental re-plan and what had to be recomputed"""
+    athlete: Athlete
+    zones: TrainingZones
+    schedule: Dict[str, Any]
+    changed_zones: Dict[str, Tuple[Optional[int], int]]
+    previous_bucket: Optional[str]
+    bucket: str
+    regenerated_days: List[str] = field(default_factory=list)
+    reused_days: List[str] = field(default_factory=list)
+    changed_pages: List[int] = field(default_factory=list)
+    # The running page header shows the max; it is redrawn from one template, not per page
+    header_changed: bool = False
+
+    @property
+    def bucket_changed(self) -> bool:
+        return self.previous_bucket != self.bucket
+
+    @property
+    def pages_to_render(self) -> List[int]:
+        """PDF pages whose body differs; a changed header alone does not add pages"""
+        return self.changed_pages
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-ready report of the re-plan"""
+        return {
+            'changed_zones': {k: {'old': old, 'new': new} for k, (old, new) in self.changed_zones.items()},
+            'previous_bucket': self.previous_bucket,
+            'bucket': self.bucket,
+            'bucket_changed': self.bucket_changed,
+            'regenerated_days': self.regenerated_days,
+            'reused_days': self.reused_days,
+            'changed_pages': self.changed_pages,
+            'header_changed': self.header_changed,
+            'pages_to_render': self.pages_to_render
+        }
+
+def infer_plan_inputs(record: Dict[str, Any]) -> Optional[Tuple[int, str]]:
+    """Recover the (max hold, progress bucket) a stored record's zones were built from.
+
+    The stored max_hold may already have been replaced by update_max_hold, so
+    the max is searched around what test_target implies and checked exactly.
+    """
+    level = record['experience_level']
+    zones = record.get('training_zones') or {}
+    if 'test_target' not in zones:
+        return None
+
+    test_factor = TrainingZones.BASE_ZONES[level]['test_target']
+    low = int(zones['test_target'] / test_factor)
+    candidates = [record.get('max_hold')] + list(range(max(low - 1, 1), low + 3))
+    for current_max in candidates:
+        if not current_max:
+            continue
+        for bucket in TrainingZones.PROGRESS_MULTIPLIERS:
+            if TrainingZones.calculate(current_max, level, bucket) == zones:
+                return current_max, bucket
+    return None
+
+class Replanner:
+    """Re-plan after a new max hold, regenerating only sessions whose zones moved"""
+
+    def __init__(self, plan_cache: Optional[PlanCache] = None):
+        self.plan_cache = plan_cache or get_plan_cache()
+
+    def replan(self, record: Dict[str, Any], new_max: int, previous_max: Optional[int] = None,
+               week: Optional[int] = None) -> ReplanResult:
+        """Build the plan for new_max from the stored current record.
+
+        previous_max defaults to the max the stored plan was built from.
+        """
+        inferred = infer_plan_inputs(record)
+        old_max, old_bucket = inferred if inferred else (record.get('max_hold'), None)
+
+        athlete = Athlete(
+            current_max=new_max,
+            previous_max=previous_max if previous_max is not None else old_max,
+            experience_level=record['experience_level'],
+            goals=record['goals'],
+            current_week=week or record['week']
+        )
+        zones = TrainingZones(athlete)
+        old_zones = record.get('training_zones') or {}
+        changed_zones = {
+            name: (old_zones.get(name), value)
+            for name, value in zones.zones.items() if old_zones.get(name) != value
+        }
+
+        result = ReplanResult(
+            athlete=athlete,
+            zones=zones,
+            schedule={},
+            changed_zones=changed_zones,
+            previous_bucket=old_bucket,
+            bucket=TrainingZones.progress_bucket(athlete.progress_rate),
+            header_changed=new_max != old_max
+        )
+
+        max_changed = result.header_changed
+        session_gen = SessionGenerator(athlete, zones)
+        previous_schedule = self._previous_schedule(inferred, record, athlete.current_week)
+        if previous_schedule is None:
+            return self._replan_cold(result, session_gen, max_changed)
+
+        for page, (day, session) in enumerate(previous_schedule.items(), start=2):
+            kind = getattr(session, 'kind', None)
+            if self._is_stale(kind, changed_zones, max_changed):
+                # Template session names are the lowercase kind names
+                new_session = ScheduleGenerator.SESSION_BUILDERS[kind.name.lower()](session_gen)
+                result.regenerated_days.append(day)
+                if new_session != session:
+                    result.changed_pages.append(page)
+                result.schedule[day] = new_session
+            else:
+                result.reused_days.append(day)
+                result.schedule[day] = session
+
+        # The overview page's stats line shows the max as well
+        overview_changed = max_changed or any(
+            (result.schedule[day]['type'], result.schedule[day]['description']) !=
+            (previous_schedule[day]['type'], previous_schedule[day]['description'])
+            for day in result.regenerated_days)
+        if overview_changed:
+            result.changed_pages.insert(0, 1)
+        return result
+
+    def _replan_cold(self, result: ReplanResult, session_gen: SessionGenerator, max_changed: bool) -> ReplanResult:
+        """Re-plan without the previous schedule, diffing by each day's session kind.
+
+        The days' session kinds come from the schedule template, which does
+        not depend on the max, so only days whose zones moved are rebuilt and
+        marked changed; the rest are taken from the new plan as they are.
+        """
+        layout = ScheduleGenerator(result.athlete, session_gen).resolve_layout()
+        result.schedule = self.plan_cache.get_schedule(result.athlete)
+        for page, (day, name) in enumerate(layout.items(), start=2):
+            if self._is_stale(SessionKind[name.upper()], result.changed_zones, max_changed):
+                result.regenerated_days.append(day)
+                result.changed_pages.append(page)
+            else:
+                result.reused_days.append(day)
+        if max_changed or result.regenerated_days:
+            result.changed_pages.insert(0, 1)
+        return result
+
+    @staticmethod
+    def _is_stale(kind: Optional[SessionKind], changed_zones: Dict[str, Any], max_changed: bool) -> bool:
+        """Whether a session of this kind reads a changed zone (or the max, for a test)"""
+        depends = ZONE_DEPENDENCIES.get(kind, ())
+        return any(name in changed_zones for name in depends) or (
+            kind == SessionKind.PERFORMANCE_TEST and max_changed)
+
+    def replan_from_storage(self, storage, new_max: int, **kwargs) -> Optional[ReplanResult]:
+        """Re-plan from a storage backend's current record"""
+        record = storage.get_current_data()
+        if not record:
+            return None
+        return self.replan(record, new_max, **kwargs)
+
+    def _previous_schedule(self, inferred: Optional[Tuple[int, str]], record: Dict[str, Any],
+                           week: int) -> Optional[Dict[str, Any]]:
+        """The stored plan's schedule if the plan cache still holds it.
+
+        It is never rebuilt on a miss; _replan_cold() diffs by session kind instead.
+        """
+        if inferred is None:
+            return None
+        old_max, old_bucket = inferred
+        return self.plan_cache.peek((old_max, record['experience_level'], record['goals'],
+                                     min(week, DEFAULT_TOTAL_WEEKS), old_bucket))
@@ -1,36 +1,59 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ..core.athlete import Athlete
+from ..core.models import Session, SessionKind
 from ..core.sessions import SessionGenerator
+from ..config.schedule_templates import SCHEDULE_TEMPLATES, DEFAULT_TEMPLATE
+from ..utils.instrumentation import timed
 
 class ScheduleGenerator:
     """Generate weekly training schedules"""
-    
-    def __init__(self, athlete: Athlete, session_generator: SessionGenerator):
+
+    SESSION_BUILDERS = {
+        'co2_recovery': lambda gen: gen.generate_co2_table("recovery"),
+        'co2_standard': lambda gen: gen.generate_co2_table("standard"),
+        'o2': lambda gen: gen.generate_o2_table(),
+        'performance_test': lambda gen: gen.generate_performance_test(),
+        'technique': lambda gen: gen.generate_technique_session(),
+        'active_recovery': lambda gen: Session(SessionKind.ACTIVE_RECOVERY, 'Light mobility, breathing technique practice'),
+        'rest': lambda gen: Session(SessionKind.REST, 'Full recovery day')
+    }
+
+    # Resolved (day, builder) pairs per (template name, goals, week), stored
+    # with the template dict they came from so replaced templates miss
+    _resolved_layouts: Dict[tuple, tuple] = {}
+
+    def __init__(self, athlete: Athlete, session_generator: SessionGenerator,
+                 template: str = DEFAULT_TEMPLATE, templates: Optional[Dict[str, Any]] = None):
         self.athlete = athlete
         self.session_gen = session_generator
-    
+        self.template = template
+        self.templates = templates if templates is not None else SCHEDULE_TEMPLATES
+
+    def resolve_layout(self) -> Dict[str, str]:
+        """Resolve the template to a session name per day for this athlete"""
+        if self.template not in self.templates:
+            raise ValueError(f"Unknown schedule template: {self.template}")
+        template = self.templates[self.template]
+
+        layout = dict(template['days'])
+        layout.update(template.get('goals', {}).get(self.athlete.goals, {}))
+        layout.update(template.get('weeks', {}).get(self.athlete.current_week, {}))
+
+        unknown = set(layout.values()) - set(self.SESSION_BUILDERS)
+        if unknown:
+            raise ValueError(f"Unknown session types in template '{self.template}': {sorted(unknown)}")
+        return layout
+
+    @timed('schedule')
     def generate_weekly_schedule(self) -> Dict[str, Any]:
         """Generate adaptive weekly schedule based on goals and level"""
-        base_schedule = {
-            'Monday': self.session_gen.generate_co2_table("recovery"),
-            'Tuesday': self.session_gen.generate_performance_test(),
-            'Wednesday': {'type': 'Active Recovery', 'description': 'Light mobility, breathing technique practice'},
-            'Thursday': self.session_gen.generate_o2_table(),
-            'Friday': self.session_gen.generate_co2_table("standard"),
-            'Saturday': self.session_gen.generate_technique_session(),
-            'Sunday': {'type': 'Complete Rest', 'description': 'Full recovery day'}
-        }
-        
-        # Adjust for goals
-        if self.athlete.goals == 'strength':
-            base_schedule['Saturday'] = self.session_gen.generate_co2_table("recovery")
-        elif self.athlete.goals == 'endurance':
-            base_schedule['Wednesday'] = self.session_gen.generate_technique_session()
-        
-        # Deload week adjustments
-        if self.athlete.current_week == 4:
-            base_schedule['Tuesday'] = self.session_gen.generate_technique_session()
-            base_schedule['Thursday'] = self.session_gen.generate_co2_table("recovery")
-            base_schedule['Friday'] = self.session_gen.generate_technique_session()
-        
-        return base_schedule
\ No newline at end of file
+        template = self.templates.get(self.template)
+        key = (self.template, self.athlete.goals, self.athlete.current_week)
+        cached = self._resolved_layouts.get(key)
+        if cached is not None and cached[0] is template:
+            builders = cached[1]
+        else:
+            builders = tuple((day, self.SESSION_BUILDERS[name]) for day, name in self.resolve_layout().items())
+            self._resolved_layouts[key] = (template, builders)
+
+        return {day: build(self.session_gen) for day, build in builders}
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Union
+from ..config.constants import DEFAULT_LOCK_TIMEOUT
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no advisory flock
+    fcntl = None
+
+class LockTimeout(TimeoutError):
+    """Raised when a file lock cannot be acquired within the allowed wait"""
+
+@contextmanager
+def file_lock(path: str, timeout: float = DEFAULT_LOCK_TIMEOUT, poll_interval: float = 0.005):
+    """Hold an exclusive advisory lock on `<path>.lock` for the duration of the block.
+
+    The lock lives in a sidecar file because atomic writes replace the data
+    file's inode. Without fcntl (Windows) the block runs unlocked.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"Timed out after {timeout}s waiting for lock on {path}")
+                time.sleep(poll_interval)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+def atomic_write(path: str, content: Union[str, bytes]):
+    """Write a file via a synced temporary sibling renamed into place.
+
+    Readers see either the old or the new content, never a truncated file.
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,260 @@
+"""
+Lightweight metrics for the plan pipeline: stage timers, counters and gauges.
+
+Disabled by default. While disabled, timed() wrappers and count()/observe()
+calls return after a single flag check, so instrumented code runs at
+essentially full speed. Enable it with enable() (the API does so unless
+BREATH_HOLD_METRICS=0) and read the results with render_prometheus() or
+get_metrics().snapshot(). Hooks added with add_hook() see every recorded
+value, e.g. to forward them to another metrics system.
+
+Stages nest: 'schedule' includes the 'sessions' calls it makes, and
+'pdf_layout' excludes 'pdf_output'.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGE_METRIC = 'breath_hold_stage_seconds'
+
+HELP = {
+    STAGE_METRIC: 'Time spent in each plan pipeline stage',
+    'breath_hold_storage_reads_total': 'Progress document reads by cache outcome',
+    'breath_hold_storage_read_bytes_total': 'Bytes of progress documents read from disk',
+    'breath_hold_storage_writes_total': 'Progress document writes',
+    'breath_hold_storage_write_bytes_total': 'Bytes of progress documents written',
+    'breath_hold_http_requests_total': 'API requests by route and status',
+    'breath_hold_http_request_seconds': 'API request latency until the response headers',
+    'breath_hold_executor_pending': 'Jobs waiting or running in an API executor pool',
+    'breath_hold_executor_rejected': 'Jobs an API executor pool turned away as busy',
+    'breath_hold_response_cache_entries': 'Rendered responses in the API response cache',
+    'breath_hold_response_cache_hit_ratio': 'API response cache hit ratio',
+    'breath_hold_jobs': 'Background render jobs by status',
+    'breath_hold_jobs_oldest_queued_seconds': 'Age of the oldest queued background job',
+    'breath_hold_job_workers_busy': 'Background job workers currently rendering',
+    'breath_hold_job_latency_seconds': 'Enqueue-to-finish latency of recent background jobs',
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Hook = Callable[[str, str, float, Dict[str, str]], None]
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class _CaptureState(threading.local):
+    # Set in a thread while capture() diverts its values into a list
+    records = None
+
+class Metrics:
+    """Registry of counters, gauges and histograms keyed by name and labels"""
+
+    def __init__(self):
+        self.enabled = False
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.help = dict(HELP)
+        self.hooks: List[Hook] = []
+        self._lock = threading.Lock()
+        self._local = _CaptureState()
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        self._record('counter', name, value, labels)
+
+    def set_gauge(self, name: str, value: float, **labels: str):
+        self._record('gauge', name, value, labels)
+
+    def observe(self, name: str, value: float, **labels: str):
+        self._record('histogram', name, value, labels)
+
+    def _record(self, kind: str, name: str, value: float, labels: Dict[str, str], key: Labels = None):
+        records = self._local.records
+        if records is not None:
+            records.append((kind, name, value, labels))
+            return
+
+        if key is None:
+            key = tuple(sorted(labels.items()))
+        with self._lock:
+            if kind == 'counter':
+                series = self.counters.setdefault(name, {})
+                series[key] = series.get(key, 0.0) + value
+            elif kind == 'gauge':
+                self.gauges.setdefault(name, {})[key] = value
+            else:
+                series = self.histograms.setdefault(name, {})
+                histogram = series.get(key)
+                if histogram is None:
+                    histogram = series[key] = Histogram()
+                histogram.observe(value)
+        for hook in self.hooks:
+            hook(kind, name, value, labels)
+
+    @contextmanager
+    def capture(self) -> Iterator[List[tuple]]:
+        """Collect this thread's values in a list instead of the registry, for replay()"""
+        previous = self._local.records
+        self._local.records = records = []
+        try:
+            yield records
+        finally:
+            self._local.records = previous
+
+    def replay(self, records: List[tuple]):
+        """Record values collected by capture(), e.g. in a worker process"""
+        for kind, name, value, labels in records:
+            self._record(kind, name, value, labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict copy of every series"""
+        with self._lock:
+            return {
+                'counters': {name: {_label_text(key): value for key, value in series.items()}
+                             for name, series in self.counters.items()},
+                'gauges': {name: {_label_text(key): value for key, value in series.items()}
+                           for name, series in self.gauges.items()},
+                'histograms': {name: {_label_text(key): {'count': h.count, 'sum': h.sum}
+                                      for key, h in series.items()}
+                               for name, series in self.histograms.items()}
+            }
+
+    def render_prometheus(self) -> str:
+        """Every series in the Prometheus text exposition format (0.0.4)"""
+        lines = []
+        with self._lock:
+            for kind, families in (('counter', self.counters), ('gauge', self.gauges)):
+                for name in sorted(families):
+                    self._family_header(lines, name, kind)
+                    for key, value in sorted(families[name].items()):
+                        lines.append(f"{name}{_label_text(key)} {_number(value)}")
+
+            for name in sorted(self.histograms):
+                self._family_header(lines, name, 'histogram')
+                for key, histogram in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f"{name}_bucket{_label_text(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{name}_sum{_label_text(key)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_label_text(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def _family_header(self, lines: List[str], name: str, kind: str):
+        if name in self.help:
+            lines.append(f"# HELP {name} {self.help[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def reset(self):
+        """Drop every recorded value (hooks and the enabled flag stay)"""
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+def _label_text(key: Labels) -> str:
+    if not key:
+        return ''
+    pairs = (f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+             for name, value in key)
+    return '{' + ','.join(pairs) + '}'
+
+def _number(value: float) -> str:
+    return str(int(value)) if value == int(value) else repr(value)
+
+_metrics = Metrics()
+
+def get_metrics() -> Metrics:
+    """The process-wide metrics registry"""
+    return _metrics
+
+def enable():
+    _metrics.enabled = True
+
+def disable():
+    _metrics.enabled = False
+
+def is_enabled() -> bool:
+    return _metrics.enabled
+
+def count(name: str, value: float = 1.0, **labels: str):
+    """Increment a counter when metrics are enabled"""
+    if _metrics.enabled:
+        _metrics.inc(name, value, **labels)
+
+def observe(name: str, value: float, **labels: str):
+    """Add a value to a histogram when metrics are enabled"""
+    if _metrics.enabled:
+        _metrics.observe(name, value, **labels)
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a pipeline stage"""
+    if not _metrics.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _metrics._record('histogram', STAGE_METRIC, time.perf_counter() - start, {'stage': name}, (('stage', name),))
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator timing every call of a function as a pipeline stage"""
+    labels = {'stage': name}
+    key = (('stage', name),)
+
+    def decorate(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _metrics.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _metrics._record('histogram', STAGE_METRIC, time.perf_counter() - start, labels, key)
+        return wrapper
+    return decorate
+
+def add_hook(hook: Hook):
+    """Call hook(kind, name, value, labels) for every value recorded"""
+    _metrics.hooks.append(hook)
+
+def remove_hook(hook: Hook):
+    """Stop calling a hook added with add_hook"""
+    if hook in _metrics.hooks:
+        _metrics.hooks.remove(hook)
+
+def render_prometheus() -> str:
+    return _metrics.render_prometheus()
+
+def call_captured(fn: Callable, *args, **kwargs) -> Tuple[Any, List[tuple]]:
+    """Run fn with metrics enabled and return (result, recorded values).
+
+    Meant for worker processes, whose registry the parent never sees: the
+    parent passes the values to get_metrics().replay().
+    """
+    _metrics.enabled = True
+    with _metrics.capture() as records:
+        result = fn(*args, **kwargs)
+    return result, records
@@ -0,0 +1,212 @@
+"""
+Per-stage profiling for one CLI run.
+
+The CLI wraps its work in stage() blocks. Without an active Profiler these
+return a shared no-op context manager, so normal runs pay nothing beyond a
+None check. A Profiler records wall and CPU time (perf_counter_ns /
+process_time_ns) and, with trace_memory, tracemalloc allocation for each
+stage. While it runs it also enables the pipeline instrumentation and
+collects the library's timed() stages (sessions, pdf_layout, ...) as
+nested entries. It can print a breakdown, write a Chrome trace-event JSON
+(chrome://tracing, Perfetto) and dump cProfile stats for the whole run.
+
+Stages that hand work to worker processes are marked with workers=True.
+Their CPU time adds what the finished workers used (os.times() children,
+so the pool must be joined inside the stage; not available on Windows).
+Allocation figures cover only this process and are left out for them.
+"""
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+from . import instrumentation
+
+_NO_STAGE = nullcontext()
+_active: Optional['Profiler'] = None
+
+class StageTiming:
+    """One completed stage"""
+    __slots__ = ('name', 'start_ns', 'wall_ns', 'cpu_ns', 'alloc_bytes', 'peak_bytes', 'workers', 'thread')
+
+    def __init__(self, name: str, start_ns: int, wall_ns: int, cpu_ns: Optional[int] = None,
+                 alloc_bytes: Optional[int] = None, peak_bytes: Optional[int] = None, workers: bool = False):
+        self.name = name
+        self.start_ns = start_ns
+        self.wall_ns = wall_ns
+        self.cpu_ns = cpu_ns
+        self.alloc_bytes = alloc_bytes
+        self.peak_bytes = peak_bytes
+        self.workers = workers
+        self.thread = threading.get_ident()
+
+class Profiler:
+    """Collects stage timings, nested library stages and optionally cProfile stats"""
+
+    def __init__(self, trace_memory: bool = True, cprofile: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: List[StageTiming] = []
+        self.library_stages: List[StageTiming] = []
+        self._cprofile = cProfile.Profile() if cprofile else None
+        self._started_tracemalloc = False
+        self._metrics_were_enabled = False
+        self.start_ns = 0
+        self.wall_ns = 0
+        self.cpu_ns = 0
+
+    def start(self):
+        global _active
+        self._metrics_were_enabled = instrumentation.is_enabled()
+        instrumentation.enable()
+        instrumentation.add_hook(self._library_stage)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.start_ns = time.perf_counter_ns()
+        self._cpu_start = time.process_time_ns()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        _active = self
+
+    def stop(self):
+        global _active
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        self.wall_ns = time.perf_counter_ns() - self.start_ns
+        self.cpu_ns = time.process_time_ns() - self._cpu_start
+        _active = None
+        instrumentation.remove_hook(self._library_stage)
+        if not self._metrics_were_enabled:
+            instrumentation.disable()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str, workers: bool = False) -> Iterator[None]:
+        memory = self.trace_memory and tracemalloc.is_tracing() and not workers
+        if memory:
+            tracemalloc.reset_peak()
+            current_start = tracemalloc.get_traced_memory()[0]
+        children_start = _children_cpu_ns() if workers else 0
+        cpu_start = time.process_time_ns()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter_ns() - start
+            cpu = time.process_time_ns() - cpu_start
+            if workers:
+                cpu += _children_cpu_ns() - children_start
+            alloc = peak = None
+            if memory:
+                current, peak = tracemalloc.get_traced_memory()
+                alloc, peak = current - current_start, peak - current_start
+            self.stages.append(StageTiming(name, start, wall, cpu, alloc, peak, workers))
+
+    def _library_stage(self, kind: str, name: str, value: float, labels: Dict[str, str]):
+        """Instrumentation hook: timed() stages arrive as they finish"""
+        if name == instrumentation.STAGE_METRIC:
+            wall = int(value * 1e9)
+            self.library_stages.append(StageTiming(labels['stage'], time.perf_counter_ns() - wall, wall))
+
+    def report(self) -> str:
+        """Breakdown table of the run's stages, then the library stages inside them"""
+        lines = [f"{'stage':<24} {'wall ms':>9} {'cpu ms':>9} {'alloc KiB':>10} {'peak KiB':>9}"]
+        for stage in self.stages:
+            name = f"{stage.name} *" if stage.workers else stage.name
+            lines.append(f"{name:<24} {stage.wall_ns / 1e6:>9.2f} {stage.cpu_ns / 1e6:>9.2f} "
+                         f"{_kib(stage.alloc_bytes):>10} {_kib(stage.peak_bytes):>9}")
+        lines.append(f"{'total run':<24} {self.wall_ns / 1e6:>9.2f} {self.cpu_ns / 1e6:>9.2f}")
+        if any(stage.workers for stage in self.stages):
+            lines.append("* worker processes: CPU includes the finished workers, allocations are not tracked")
+
+        if self.library_stages:
+            totals: Dict[str, List[int]] = {}
+            for stage in self.library_stages:
+                entry = totals.setdefault(stage.name, [0, 0])
+                entry[0] += 1
+                entry[1] += stage.wall_ns
+            lines.append('')
+            lines.append(f"{'library stage':<24} {'calls':>9} {'wall ms':>9}")
+            for name, (calls, wall) in sorted(totals.items(), key=lambda item: -item[1][1]):
+                lines.append(f"{name:<24} {calls:>9} {wall / 1e6:>9.2f}")
+        return '\n'.join(lines)
+
+    def trace_events(self) -> Dict[str, Any]:
+        """The run in Chrome trace-event format (complete 'X' events, microseconds)"""
+        pid = os.getpid()
+        events = [{'name': 'cli run', 'cat': 'run', 'ph': 'X', 'ts': 0, 'dur': self.wall_ns / 1000,
+                   'pid': pid, 'tid': threading.main_thread().ident, 'args': {'cpu_ms': self.cpu_ns / 1e6}}]
+        for category, stages in (('stage', self.stages), ('library', self.library_stages)):
+            for stage in stages:
+                args = {}
+                if stage.cpu_ns is not None:
+                    args['cpu_ms'] = stage.cpu_ns / 1e6
+                if stage.workers:
+                    args['worker_processes'] = True
+                if stage.alloc_bytes is not None:
+                    args.update(alloc_bytes=stage.alloc_bytes, peak_bytes=stage.peak_bytes)
+                events.append({'name': stage.name, 'cat': category, 'ph': 'X',
+                               'ts': (stage.start_ns - self.start_ns) / 1000, 'dur': stage.wall_ns / 1000,
+                               'pid': pid, 'tid': stage.thread, 'args': args})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_trace(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.trace_events(), f)
+
+    def write_pstats(self, path: str):
+        if self._cprofile is None:
+            raise ValueError("Profiler was created without cprofile=True")
+        self._cprofile.dump_stats(path)
+
+def _children_cpu_ns() -> int:
+    """CPU time of this process's finished (waited-for) children"""
+    times = os.times()
+    return int((times.children_user + times.children_system) * 1e9)
+
+def _kib(value: Optional[int]) -> str:
+    return '-' if value is None else f"{value / 1024:.1f}"
+
+def stage(name: str, workers: bool = False):
+    """Context manager timing a stage of the active profiler; a no-op otherwise.
+
+    workers=True marks a stage whose work runs in worker processes.
+    """
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name, workers)
+
+def is_trace_json(path: str) -> bool:
+    """Trace files ending in .json are Chrome traces; anything else gets pstats"""
+    return path.lower().endswith('.json')
+
+@contextmanager
+def profile_run(profile: bool = False, trace_out: Optional[str] = None) -> Iterator[Optional[Profiler]]:
+    """Profile the enclosed run when asked to, then print and/or write the results.
+
+    profile prints the stage breakdown (with tracemalloc allocation figures);
+    trace_out writes a Chrome trace (*.json) or cProfile stats (any other name).
+    With neither, nothing is set up at all.
+    """
+    if not profile and not trace_out:
+        yield None
+        return
+
+    profiler = Profiler(trace_memory=profile, cprofile=bool(trace_out) and not is_trace_json(trace_out))
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        if profile:
+            print(f"\n=== Profile ===\n{profiler.report()}")
+        if trace_out:
+            if is_trace_json(trace_out):
+                profiler.write_trace(trace_out)
+            else:
+                profiler.write_pstats(trace_out)
+            print(f"Profile written to {trace_out}")
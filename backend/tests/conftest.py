@@ -0,0 +1,18 @@
+import pytest
+from breath_hold_training.core.athlete import Athlete
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.data.storage import ProgressStorage
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run every test in its own directory with an empty document cache"""
+    monkeypatch.chdir(tmp_path)
+    ProgressStorage.clear_cache()
+    yield tmp_path
+    ProgressStorage.clear_cache()
+
+def make_athlete(current_max: int = 120, week: int = 1) -> Athlete:
+    return Athlete(current_max=current_max, experience_level='intermediate', goals='balanced', current_week=week)
+
+def zones_for(athlete: Athlete):
+    return TrainingZones.calculate(athlete.current_max, athlete.experience_level, 'steady')
@@ -0,0 +1,77 @@
+import random
+import warnings
+from datetime import datetime, timedelta
+import pytest
+from breath_hold_training.core.analytics import ProgressAnalytics
+from breath_hold_training.data.backends import open_storage
+from conftest import make_athlete, zones_for
+
+def history(records: int, seed: int = 7, offset: str = ''):
+    rng = random.Random(seed)
+    moment = datetime(2024, 1, 1, 7, 30)
+    max_hold = 90
+    result = []
+    for _ in range(records):
+        # Irregular gaps, including same-day records and breaks of several weeks
+        moment += timedelta(hours=rng.choice([3, 20, 26, 50, 24 * 9, 24 * 30]))
+        max_hold = max(20, max_hold + rng.randint(-6, 8))
+        result.append({'date': moment.isoformat() + offset, 'max_hold': max_hold})
+    return result
+
+def assert_same_state(incremental: ProgressAnalytics, rebuilt: ProgressAnalytics):
+    a, b = incremental.to_dict(), rebuilt.to_dict()
+    for key in ('mean_x', 'mean_y', 'm2_x', 'c_xy'):
+        assert a.pop(key) == pytest.approx(b.pop(key), rel=1e-9, abs=1e-6)
+    a_window, b_window = a.pop('window'), b.pop('window')
+    assert len(a_window) == len(b_window)
+    for (a_days, a_max), (b_days, b_max) in zip(a_window, b_window):
+        assert a_days == pytest.approx(b_days) and a_max == b_max
+    assert a == pytest.approx(b)
+    assert incremental.summary() == rebuilt.summary()
+
+@pytest.mark.parametrize('records', [1, 2, 15, 300])
+def test_update_matches_from_history(records):
+    records_list = history(records)
+    incremental = ProgressAnalytics()
+    incremental.extend(records_list)
+    assert_same_state(incremental, ProgressAnalytics.from_history(records_list))
+
+def test_round_trip_then_update_matches_rebuild():
+    records = history(60)
+    restored = ProgressAnalytics.from_dict(ProgressAnalytics.from_history(records[:40]).to_dict())
+    restored.extend(records[40:])
+    assert_same_state(restored, ProgressAnalytics.from_history(records))
+
+def test_utc_offsets_are_converted_without_warnings():
+    aware = history(30, offset='+02:00')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        rebuilt = ProgressAnalytics.from_history(aware)
+    incremental = ProgressAnalytics()
+    incremental.extend(aware)
+    assert_same_state(incremental, rebuilt)
+
+    naive_utc = [dict(record, date=(datetime.fromisoformat(record['date'][:-6]) - timedelta(hours=2)).isoformat())
+                 for record in aware]
+    assert rebuilt.summary() == ProgressAnalytics.from_history(naive_utc).summary()
+
+def test_for_document_rebuilds_stale_state():
+    records = history(20)
+    stale = {'training_history': records, 'analytics': ProgressAnalytics.from_history(records[:10]).to_dict()}
+    assert ProgressAnalytics.for_document(stale).count == 20
+    assert ProgressAnalytics().summary() == {'records': 0}
+
+@pytest.mark.parametrize('backend', ['json', 'journal', 'sqlite'])
+def test_backends_exclude_tested_maxes(workdir, backend):
+    storage = open_storage(backend, str(workdir / f'progress.{backend}'))
+    for current_max in (100, 110, 125):
+        athlete = make_athlete(current_max)
+        storage.save_progress(athlete, zones_for(athlete))
+    summary = storage.get_analytics()
+    assert summary['records'] == 3
+
+    # A tested max only updates the current record until the next save
+    storage.update_max_hold(200)
+    assert storage.get_analytics() == summary
+    if hasattr(storage, 'close'):
+        storage.close()
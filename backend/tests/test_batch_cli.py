@@ -0,0 +1,67 @@
+import sqlite3
+import pytest
+from breath_hold_training.cli.batch import _whole_number, parse_entry, run_batch
+from breath_hold_training.data import sqlite_storage
+from breath_hold_training.data.sqlite_storage import SQLiteProgressStorage
+from conftest import make_athlete, zones_for
+
+ROSTER = """athlete_id,current_max,experience_level,goals
+ana,120,intermediate,balanced
+ben,90,beginner,endurance
+cy,95.5,beginner,balanced
+dee,150,advanced,strength
+"""
+
+@pytest.mark.parametrize('value', [90, 90.0, '90', ' 90 '])
+def test_whole_numbers_are_accepted(value):
+    assert _whole_number('current_max', value) == 90
+
+@pytest.mark.parametrize('value', [1.5, True, False, 'abc', '90.5', [90]])
+def test_fractions_and_booleans_are_rejected(value):
+    with pytest.raises(ValueError, match='current_max must be a whole number'):
+        _whole_number('current_max', value)
+
+def test_roster_entry_reports_a_fractional_max():
+    entry = parse_entry(3, {'id': 'cy', 'current_max': 95.5, 'experience_level': 'beginner', 'goals': 'balanced'})
+    assert entry.athlete is None
+    assert entry.athlete_id == 'cy'
+    assert '95.5' in entry.error
+
+def test_batch_saves_in_one_connection_and_commit(workdir, monkeypatch):
+    statements, connections = [], []
+    real_connect = sqlite3.connect
+
+    def connect(*args, **kwargs):
+        conn = real_connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        connections.append(conn)
+        return conn
+    monkeypatch.setattr(sqlite_storage.sqlite3, 'connect', connect)
+
+    roster = workdir / 'roster.csv'
+    roster.write_text(ROSTER)
+    db = str(workdir / 'progress.db')
+    assert run_batch(str(roster), output_format='json', output_dir=str(workdir / 'plans'), progress_db=db) == 1
+
+    assert len(connections) == 1
+    assert statements.count('COMMIT') == 1
+    monkeypatch.undo()
+    storage = SQLiteProgressStorage(db)
+    assert storage.list_athletes() == ['ana', 'ben', 'dee']
+    assert storage.for_athlete('ben').get_current_data()['max_hold'] == 90
+    storage.close()
+
+def test_failed_transaction_saves_nothing(workdir):
+    storage = SQLiteProgressStorage(str(workdir / 'progress.db'))
+    athlete = make_athlete(120)
+    with pytest.raises(RuntimeError):
+        with storage.transaction():
+            storage.for_athlete('ana').save_progress(athlete, zones_for(athlete))
+            storage.for_athlete('ben').save_progress(athlete, zones_for(athlete))
+            raise RuntimeError('render failed')
+    assert storage.list_athletes() == []
+
+    with storage.transaction():
+        storage.for_athlete('ana').save_progress(athlete, zones_for(athlete))
+    assert storage.list_athletes() == ['ana']
+    storage.close()
@@ -0,0 +1,65 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from api.main import create_app
+from api.routes import training
+from breath_hold_training.data.job_queue import JobQueue
+from breath_hold_training.data.storage import ProgressStorage
+
+ATHLETE = {'current_max': 120, 'experience_level': 'intermediate', 'goals': 'balanced'}
+
+@pytest.fixture
+def client(workdir):
+    app = create_app(storage=ProgressStorage(str(workdir / 'progress.json')),
+                     job_queue=JobQueue(str(workdir / 'jobs.db')), job_workers=0, metrics=False)
+    with TestClient(app) as client:
+        yield client
+
+def bulk(client, roster, output_format='json'):
+    response = client.post(f"/api/plans/bulk?format={output_format}", json=roster)
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return sorted(lines[:-1], key=lambda line: line['index']), lines[-1]
+
+def test_invalid_athlete_is_an_inline_error(client):
+    results, summary = bulk(client, [ATHLETE, dict(ATHLETE, current_max=-5), dict(ATHLETE, goals='nope')])
+    assert [result['ok'] for result in results] == [True, False, False]
+    assert 'current_max' in results[1]['error']
+    assert results[0]['plan']
+    assert summary == {'done': True, 'total': 3, 'ok': 1, 'failed': 2}
+
+def test_render_failure_keeps_streaming(client, monkeypatch):
+    real_render = training.render_plan
+
+    async def flaky_render(request, output_format, athlete):
+        if athlete.current_max == 150:
+            raise RuntimeError('renderer exploded')
+        return await real_render(request, output_format, athlete)
+    monkeypatch.setattr(training, 'render_plan', flaky_render)
+
+    roster = [ATHLETE, dict(ATHLETE, current_max=150), dict(ATHLETE, current_max=180), ATHLETE]
+    results, summary = bulk(client, roster, output_format='html')
+    assert [result['index'] for result in results] == [0, 1, 2, 3]
+    assert [result['ok'] for result in results] == [True, False, True, True]
+    assert results[1]['error'] == 'RuntimeError: renderer exploded'
+    assert results[2]['data'].startswith('<')
+    assert summary == {'done': True, 'total': 4, 'ok': 3, 'failed': 1}
+
+def test_ndjson_roster_with_a_bad_line(client):
+    body = '\n'.join([json.dumps(ATHLETE), '{not json', '', json.dumps(dict(ATHLETE, current_max=90))]) + '\n'
+    response = client.post('/api/plans/bulk?concurrency=1', content=body,
+                           headers={'Content-Type': 'application/x-ndjson'})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [line['index'] for line in lines[:-1]] == [0, 1, 2]
+    assert lines[1]['ok'] is False and lines[1]['error'].startswith('Invalid JSON')
+    assert lines[-1] == {'done': True, 'total': 3, 'ok': 2, 'failed': 1}
+
+def test_malformed_array_is_a_plain_400(client):
+    response = client.post('/api/plans/bulk', content='[{"current_max": 1',
+                           headers={'Content-Type': 'application/json'})
+    assert response.status_code == 400
+    assert 'Invalid JSON roster' in response.json()['detail']
+
+def test_unknown_format_is_rejected(client):
+    assert client.post('/api/plans/bulk?format=docx', json=[ATHLETE]).status_code == 400
@@ -0,0 +1,71 @@
+import multiprocessing
+import os
+import pytest
+from breath_hold_training.data.storage import ProgressStorage
+from breath_hold_training.utils import file_utils
+from breath_hold_training.utils.file_utils import LockTimeout, atomic_write, file_lock
+from conftest import make_athlete, zones_for
+
+def test_atomic_write_str_and_bytes(workdir):
+    path = str(workdir / 'data.json')
+    atomic_write(path, '{"a": 1}')
+    with open(path) as f:
+        assert f.read() == '{"a": 1}'
+
+    atomic_write(path, b'replaced')
+    with open(path, 'rb') as f:
+        assert f.read() == b'replaced'
+    assert os.listdir(workdir) == ['data.json']
+
+def test_atomic_write_keeps_mode(workdir):
+    path = str(workdir / 'data.json')
+    atomic_write(path, 'one')
+    os.chmod(path, 0o600)
+    atomic_write(path, 'two')
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+def test_atomic_write_failure_leaves_original(workdir, monkeypatch):
+    path = str(workdir / 'data.json')
+    atomic_write(path, 'original')
+
+    def fail(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(file_utils.os, 'replace', fail)
+    with pytest.raises(OSError):
+        atomic_write(path, 'new')
+
+    with open(path) as f:
+        assert f.read() == 'original'
+    assert os.listdir(workdir) == ['data.json']
+
+@pytest.mark.skipif(file_utils.fcntl is None, reason='needs fcntl')
+def test_file_lock_excludes_and_releases(workdir):
+    path = str(workdir / 'data.json')
+    with file_lock(path):
+        # flock locks belong to the open file, so a second lock in this process still conflicts
+        with pytest.raises(LockTimeout):
+            with file_lock(path, timeout=0.05):
+                pass
+    with file_lock(path, timeout=0.05):
+        pass
+    assert os.path.exists(f"{path}.lock")
+
+def _save_many(filename: str, current_max: int, saves: int):
+    storage = ProgressStorage(filename)
+    athlete = make_athlete(current_max)
+    for _ in range(saves):
+        storage.save_progress(athlete, zones_for(athlete))
+
+@pytest.mark.skipif(file_utils.fcntl is None, reason='needs fcntl')
+def test_concurrent_saves_lose_nothing(workdir):
+    filename = str(workdir / 'progress.json')
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_save_many, args=(filename, 100 + offset, 10)) for offset in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    maxes = [record['max_hold'] for record in ProgressStorage(filename).load_progress()['training_history']]
+    assert sorted(maxes) == sorted([100, 101, 102, 103] * 10)
@@ -0,0 +1,111 @@
+import asyncio
+import time
+import pytest
+from api import jobs
+from api.executors import Executors
+from api.jobs import JobWorkers
+from breath_hold_training.data.job_queue import JobQueue
+
+def params(current_max: int = 120):
+    return {'current_max': current_max, 'experience_level': 'intermediate', 'goals': 'balanced',
+            'current_week': 1, 'total_weeks': 6, 'previous_max': None}
+
+@pytest.fixture
+def queue(workdir):
+    queue = JobQueue(str(workdir / 'jobs.db'), max_attempts=2, retry_delay=0.05, lease_timeout=60)
+    yield queue
+    queue.close()
+
+def test_identical_jobs_are_deduplicated(queue):
+    job_id, created = queue.enqueue('json', params())
+    assert created
+    assert queue.enqueue('json', params()) == (job_id, False)
+    assert queue.enqueue('html', params())[1]
+    assert queue.enqueue('json', params(130))[1]
+
+    # Once the first job is done, the same inputs queue a new one
+    queue.complete(queue.claim()['id'], b'{}')
+    assert queue.enqueue('json', params())[0] != job_id
+
+def test_failures_retry_with_backoff_then_fail(queue):
+    job_id, _ = queue.enqueue('json', params())
+    assert queue.fail(queue.claim()['id'], 'boom') is True
+    job = queue.get(job_id)
+    assert job['status'] == 'queued' and job['attempts'] == 1 and job['error'] == 'boom'
+    assert queue.claim() is None  # still backing off
+
+    time.sleep(0.06)
+    assert queue.fail(queue.claim()['id'], 'boom again') is False
+    job = queue.get(job_id)
+    assert job['status'] == 'failed' and job['attempts'] == 2
+
+def test_release_does_not_count_an_attempt(queue):
+    job_id, _ = queue.enqueue('json', params())
+    queue.release(queue.claim()['id'])
+    assert queue.get(job_id)['attempts'] == 0
+    assert queue.claim()['attempts'] == 1
+
+def test_stale_running_jobs_are_requeued(queue):
+    job_id, _ = queue.enqueue('json', params())
+    queue.claim()
+    assert queue.requeue_stale() == 0
+    assert queue.requeue_stale(now=time.time() + 61) == 1
+    assert queue.get(job_id)['status'] == 'queued'
+    assert queue.claim()['id'] == job_id
+
+def test_expired_results_are_cleaned_up(queue):
+    job_id, _ = queue.enqueue('json', params())
+    queue.complete(queue.claim()['id'], b'plan')
+    assert queue.result(job_id) == b'plan'
+    assert queue.cleanup(now=time.time() + queue.result_ttl + 1) == 1
+    assert queue.get(job_id) is None
+
+def drain(queue: JobQueue, job_ids, workers: int = 1, max_pending: int = 8, timeout: float = 20.0):
+    """Run JobWorkers until every job is finished; returns the workers and whether all tasks survived"""
+    async def run():
+        executors = Executors(render_workers=0, io_workers=1, max_pending=max_pending)
+        job_workers = JobWorkers(queue, executors, workers=workers, poll_interval=0.01)
+        job_workers.start()
+        try:
+            deadline = time.monotonic() + timeout
+            while any(queue.get(job_id)['status'] in ('queued', 'running') for job_id in job_ids):
+                assert time.monotonic() < deadline, 'jobs were not drained'
+                await asyncio.sleep(0.02)
+            alive = all(not task.done() for task in job_workers._tasks)
+        finally:
+            await job_workers.stop()
+            executors.shutdown()
+        return job_workers, alive
+    return asyncio.run(run())
+
+def test_workers_retry_a_failed_render(queue, monkeypatch):
+    real_render = jobs.render_plan_bytes
+    calls = []
+
+    def flaky(output_format, athlete, schedule):
+        calls.append(athlete.current_max)
+        if len(calls) == 1:
+            raise RuntimeError('transient')
+        return real_render(output_format, athlete, schedule)
+    monkeypatch.setattr(jobs, 'render_plan_bytes', flaky)
+
+    job_id, _ = queue.enqueue('json', params())
+    workers, alive = drain(queue, [job_id])
+    job = queue.get(job_id)
+    assert alive
+    assert job['status'] == 'done' and job['attempts'] == 2
+    assert queue.result(job_id).startswith(b'{')
+    assert workers.stats()['completed'] == 1
+
+def test_full_pools_do_not_kill_workers(queue):
+    # One pending call per pool: most claims, renders and completions find it busy
+    job_ids = [queue.enqueue('json', params(current_max))[0] for current_max in range(120, 124)]
+    workers, alive = drain(queue, job_ids, workers=3, max_pending=1)
+
+    assert alive
+    for job_id in job_ids:
+        job = queue.get(job_id)
+        assert job['status'] == 'done'
+        # Being turned away by a busy pool is not a failed attempt
+        assert job['attempts'] == 1
+    assert workers.stats()['completed'] == 4
@@ -0,0 +1,104 @@
+import json
+import os
+import pytest
+from breath_hold_training.core.analytics import ProgressAnalytics
+from breath_hold_training.data.backends import open_storage
+from breath_hold_training.data.journal import JournalProgressStorage
+from breath_hold_training.data.sqlite_storage import SQLiteProgressStorage
+from breath_hold_training.data.storage import ProgressStorage
+from conftest import make_athlete, zones_for
+
+def save(storage, current_max: int, week: int = 1):
+    athlete = make_athlete(current_max, week)
+    storage.save_progress(athlete, zones_for(athlete))
+
+def history_maxes(data):
+    return [record['max_hold'] for record in data['training_history']]
+
+def journal(workdir, compact_every: int = 100) -> JournalProgressStorage:
+    return JournalProgressStorage(str(workdir / 'progress.jsonl'), compact_every=compact_every,
+                                  legacy_filename=None)
+
+def test_journal_replays_sessions_and_max_updates(workdir):
+    storage = journal(workdir)
+    save(storage, 100)
+    storage.update_max_hold(115)
+    save(storage, 120, week=2)
+    storage.update_max_hold(130)
+
+    data = storage.load_progress()
+    assert history_maxes(data) == [100, 120]
+    assert data['current']['max_hold'] == 130
+    assert storage.get_current_data() == data['current']
+    assert storage.get_analytics() == ProgressAnalytics.from_history(data['training_history']).summary()
+
+def test_journal_compaction_keeps_state(workdir):
+    storage = journal(workdir, compact_every=3)
+    for week, current_max in enumerate([100, 105, 110, 115, 120], start=1):
+        save(storage, current_max, week)
+    storage.update_max_hold(140)
+    before = storage.load_progress()
+
+    storage.compact()
+    with open(storage.filename) as f:
+        events = [json.loads(line) for line in f]
+    assert [event['op'] for event in events] == ['session'] * 5 + ['current']
+    with open(storage.snapshot_filename) as f:
+        snapshot = json.load(f)
+    assert snapshot['offset'] == os.path.getsize(storage.filename)
+    assert snapshot['analytics']['count'] == 5
+
+    fresh = journal(workdir)
+    assert fresh.load_progress() == before
+    assert fresh.get_current_data()['max_hold'] == 140
+    assert fresh.get_analytics() == ProgressAnalytics.from_history(before['training_history']).summary()
+
+def test_journal_skips_torn_line(workdir):
+    storage = journal(workdir)
+    save(storage, 100)
+    with open(storage.filename, 'ab') as f:
+        f.write(b'{"op":"session","rec')
+    save(storage, 110)
+
+    assert history_maxes(storage.load_progress()) == [100, 110]
+
+def test_journal_migrates_and_exports_document(workdir):
+    source = ProgressStorage(str(workdir / 'progress.json'))
+    save(source, 100)
+    save(source, 110)
+    source.update_max_hold(125)
+
+    storage = JournalProgressStorage(str(workdir / 'progress.jsonl'), legacy_filename=source.filename)
+    data = storage.load_progress()
+    assert data['training_history'] == source.load_progress()['training_history']
+    assert data['current'] == source.get_current_data()
+
+    storage.export_document(str(workdir / 'export.json'))
+    with open(workdir / 'export.json') as f:
+        assert json.load(f) == data
+
+def test_journal_signature_changes_with_appends(workdir):
+    storage = journal(workdir)
+    assert storage.signature() is None
+    save(storage, 100)
+    first = storage.signature()
+    storage.update_max_hold(110)
+    assert storage.signature() not in (None, first)
+
+def test_open_storage_by_name(workdir):
+    assert isinstance(open_storage('json'), ProgressStorage)
+    assert isinstance(open_storage('journal'), JournalProgressStorage)
+    sqlite = open_storage('sqlite', str(workdir / 'other.db'))
+    assert isinstance(sqlite, SQLiteProgressStorage) and sqlite.filename.endswith('other.db')
+    with pytest.raises(ValueError):
+        open_storage('yaml')
+
+def test_journal_takes_over_the_json_document(workdir):
+    json_storage = open_storage('json')
+    save(json_storage, 100)
+    storage = open_storage('journal')
+    save(storage, 110)
+
+    assert history_maxes(storage.load_progress()) == [100, 110]
+    # Saves append to the journal; the JSON document is left as it was
+    assert history_maxes(ProgressStorage(json_storage.filename).load_progress()) == [100]
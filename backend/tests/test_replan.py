@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+from api.main import create_app
+from breath_hold_training.core.sessions import SessionGenerator
+from breath_hold_training.core.training_zones import TrainingZones
+from breath_hold_training.data.job_queue import JobQueue
+from breath_hold_training.data.storage import ProgressStorage
+from breath_hold_training.generators.plan_cache import PlanCache
+from breath_hold_training.generators.replan import Replanner
+from breath_hold_training.generators.schedule import ScheduleGenerator
+from conftest import make_athlete, zones_for
+
+def stored_record(current_max: int = 120):
+    athlete = make_athlete(current_max)
+    return {'date': '2024-03-01T08:00:00', 'week': athlete.current_week, 'max_hold': current_max,
+            'experience_level': athlete.experience_level, 'goals': athlete.goals,
+            'training_zones': TrainingZones(athlete).zones}
+
+def full_schedule(athlete):
+    return ScheduleGenerator(athlete, SessionGenerator(athlete, TrainingZones(athlete))).generate_weekly_schedule()
+
+def test_header_change_does_not_render_every_page():
+    result = Replanner(PlanCache()).replan(stored_record(120), 150)
+    assert result.header_changed
+    assert result.schedule == full_schedule(result.athlete)
+
+    pages = len(result.schedule) + 1
+    assert result.pages_to_render == result.changed_pages
+    assert 1 in result.pages_to_render
+    assert len(result.pages_to_render) < pages
+    # Rest and active recovery days never read a zone
+    assert set(result.reused_days) >= {day for day, session in result.schedule.items()
+                                       if session['type'] in ('Rest', 'Active Recovery')}
+
+def test_cold_and_warm_cache_agree():
+    record = stored_record(120)
+    cold = Replanner(PlanCache()).replan(record, 150)
+
+    warm_cache = PlanCache()
+    warm_cache.get_schedule(make_athlete(120))
+    warm = Replanner(warm_cache).replan(record, 150)
+
+    assert warm.schedule == cold.schedule
+    assert warm.regenerated_days == cold.regenerated_days
+    assert set(warm.changed_pages) <= set(cold.changed_pages)
+    assert warm.changed_pages[0] == cold.changed_pages[0] == 1
+
+def test_same_max_changes_nothing():
+    result = Replanner(PlanCache()).replan(stored_record(120), 120)
+    assert not result.header_changed
+    assert result.changed_zones == {}
+    assert result.pages_to_render == []
+
+def test_max_hold_route_replans_then_records(workdir):
+    storage = ProgressStorage(str(workdir / 'progress.json'))
+    athlete = make_athlete(120)
+    storage.save_progress(athlete, zones_for(athlete))
+    app = create_app(storage=storage, render_workers=0, job_queue=JobQueue(str(workdir / 'jobs.db')),
+                     job_workers=0, metrics=False)
+    with TestClient(app) as client:
+        response = client.put('/api/progress/max-hold', json={'max_hold': 150})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['previous_max'] == 120 and body['improvement'] == 30
+    assert body['replan']['header_changed'] is True
+    assert body['replan']['pages_to_render'] == body['replan']['changed_pages']
+    assert storage.get_current_data()['max_hold'] == 150
@@ -0,0 +1,76 @@
+import json
+import pytest
+from fastapi.testclient import TestClient
+from api.cache import etag_matches, make_etag
+from api.main import create_app
+from breath_hold_training.data.job_queue import JobQueue
+from breath_hold_training.data.storage import ProgressStorage, thaw
+from breath_hold_training.utils.file_utils import atomic_write
+from conftest import make_athlete, zones_for
+
+ATHLETE = {'current_max': 120, 'experience_level': 'intermediate', 'goals': 'balanced'}
+
+@pytest.fixture
+def storage(workdir):
+    storage = ProgressStorage(str(workdir / 'progress.json'))
+    athlete = make_athlete(120)
+    storage.save_progress(athlete, zones_for(athlete))
+    return storage
+
+@pytest.fixture
+def client(workdir, storage):
+    app = create_app(storage=storage, render_workers=0, job_queue=JobQueue(str(workdir / 'jobs.db')),
+                     job_workers=0, metrics=False)
+    with TestClient(app) as client:
+        yield client
+
+def test_etag_matching():
+    etag = make_etag(b'body')
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+def test_progress_answers_304_for_a_current_etag(client):
+    first = client.get('/api/progress/current')
+    assert first.status_code == 200
+    etag = first.headers['etag']
+
+    again = client.get('/api/progress/current', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.content == b''
+    assert again.headers['etag'] == etag
+    assert client.app.state.response_cache.stats()['not_modified'] == 1
+
+def test_write_through_the_api_invalidates(client):
+    etag = client.get('/api/progress/current').headers['etag']
+    cache = client.app.state.response_cache
+
+    assert client.put('/api/progress/max-hold', json={'max_hold': 150}).status_code == 200
+    assert cache.stats()['invalidations'] >= 1
+
+    after = client.get('/api/progress/current', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.json()['max_hold'] == 150
+    assert after.headers['etag'] != etag
+
+def test_write_outside_the_api_is_noticed(client, storage):
+    etag = client.get('/api/plans/current').headers['etag']
+
+    # Another process rewrites the file; only its signature tells the API
+    document = thaw(storage.load_progress())
+    document['current']['max_hold'] = 200
+    atomic_write(storage.filename, json.dumps(document))
+    assert client.app.state.response_cache.stats()['invalidations'] == 0
+
+    after = client.get('/api/plans/current', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.headers['etag'] != etag
+    assert client.app.state.response_cache.stats()['stale'] == 1
+
+def test_identical_plan_requests_share_a_response(client):
+    first = client.post('/api/plans', json=ATHLETE)
+    second = client.post('/api/plans', json=ATHLETE, headers={'If-None-Match': first.headers['etag']})
+    assert first.status_code == 200 and second.status_code == 304
+    assert client.app.state.response_cache.stats()['hits'] >= 1
@@ -0,0 +1,85 @@
+import json
+import threading
+from fastapi.testclient import TestClient
+from api.main import create_app
+from breath_hold_training.core.analytics import ProgressAnalytics
+from breath_hold_training.data.job_queue import JobQueue
+from breath_hold_training.data.sqlite_storage import SQLiteProgressStorage
+from breath_hold_training.data.storage import ProgressStorage
+from conftest import make_athlete, zones_for
+
+def save(storage, current_max: int, week: int = 1):
+    athlete = make_athlete(current_max, week)
+    storage.save_progress(athlete, zones_for(athlete))
+
+def history_maxes(data):
+    return [record['max_hold'] for record in data['training_history']]
+
+def test_sqlite_round_trip(workdir):
+    storage = SQLiteProgressStorage(str(workdir / 'progress.db'), athlete_id='ana')
+    save(storage, 100)
+    save(storage, 110, week=2)
+    storage.update_max_hold(125)
+    other = storage.for_athlete('ben')
+    save(other, 200)
+    storage.close()
+
+    reopened = SQLiteProgressStorage(str(workdir / 'progress.db'), athlete_id='ana')
+    data = reopened.load_progress()
+    assert history_maxes(data) == [100, 110]
+    assert data['current']['max_hold'] == 125
+    assert data['current']['training_zones'] == zones_for(make_athlete(110, 2))
+    assert reopened.list_athletes() == ['ana', 'ben']
+    assert reopened.get_analytics() == ProgressAnalytics.from_history(data['training_history']).summary()
+    reopened.close()
+
+def test_sqlite_imports_json_document(workdir):
+    source = ProgressStorage(str(workdir / 'progress.json'))
+    save(source, 100)
+    save(source, 105)
+    source.update_max_hold(130)
+
+    storage = SQLiteProgressStorage(str(workdir / 'progress.db'))
+    storage.import_document(json.loads(json.dumps(source.load_progress())))
+    data = storage.load_progress()
+    assert data['training_history'] == source.load_progress()['training_history']
+    assert data['current'] == source.get_current_data()
+    assert storage.get_analytics() == source.get_analytics()
+    storage.close()
+
+def test_sqlite_saves_from_several_threads(workdir):
+    storage = SQLiteProgressStorage(str(workdir / 'progress.db'))
+    errors = []
+
+    def worker(offset):
+        try:
+            for step in range(5):
+                save(storage.for_athlete(f"athlete{offset}"), 100 + step)
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert storage.list_athletes() == [f"athlete{offset}" for offset in range(4)]
+    assert history_maxes(storage.for_athlete('athlete2').load_progress()) == [100, 101, 102, 103, 104]
+    storage.close()
+
+def test_sqlite_behind_the_api(workdir):
+    storage = SQLiteProgressStorage(str(workdir / 'progress.db'))
+    app = create_app(storage=storage, io_workers=4, job_queue=JobQueue(str(workdir / 'jobs.db')),
+                     job_workers=0, metrics=False)
+    athlete = {'current_max': 120, 'experience_level': 'intermediate', 'goals': 'balanced'}
+    with TestClient(app) as client:
+        for current_max in range(120, 130):
+            response = client.post('/api/plans?save=true', json=dict(athlete, current_max=current_max))
+            assert response.status_code == 200
+        progress = client.get('/api/progress').json()
+        assert client.get('/api/progress/analytics').json()['records'] == 10
+
+    assert history_maxes(progress) == list(range(120, 130))
+    assert progress['current']['max_hold'] == 129
+    storage.close()
@@ -0,0 +1,91 @@
+import copy
+import json
+import pickle
+import pytest
+from breath_hold_training.data.storage import ProgressStorage
+from breath_hold_training.utils.file_utils import atomic_write
+from conftest import make_athlete, zones_for
+
+def save(storage, current_max: int, week: int = 1):
+    athlete = make_athlete(current_max, week)
+    storage.save_progress(athlete, zones_for(athlete))
+
+def history_maxes(data):
+    return [record['max_hold'] for record in data['training_history']]
+
+# ProgressStorage (single JSON document)
+
+def test_json_round_trip(workdir):
+    storage = ProgressStorage(str(workdir / 'progress.json'))
+    save(storage, 100)
+    save(storage, 110, week=2)
+    storage.update_max_hold(125)
+
+    ProgressStorage.clear_cache()
+    with open(storage.filename) as f:
+        on_disk = json.load(f)
+    data = ProgressStorage(storage.filename).load_progress()
+    assert data == on_disk
+    assert history_maxes(data) == [100, 110]
+    assert data['current']['max_hold'] == 125
+    assert data['current']['week'] == 2
+    assert data['analytics']['count'] == 2
+
+def test_update_max_hold_leaves_history_alone(workdir):
+    # Regression: 'current' used to be the very dict stored as the last history record
+    storage = ProgressStorage(str(workdir / 'progress.json'))
+    save(storage, 100)
+    storage.update_max_hold(140)
+
+    assert history_maxes(storage.load_progress()) == [100]
+    ProgressStorage.clear_cache()
+    assert history_maxes(storage.load_progress()) == [100]
+    assert storage.get_current_data()['max_hold'] == 140
+
+def test_cached_document_is_read_only(workdir):
+    storage = ProgressStorage(str(workdir / 'progress.json'))
+    save(storage, 100)
+    data = storage.load_progress()
+
+    with pytest.raises(TypeError):
+        data['current']['max_hold'] = 1
+    with pytest.raises(TypeError):
+        data['training_history'].append({})
+    with pytest.raises(TypeError):
+        storage.get_current_data().update(max_hold=1)
+
+    mutable = copy.deepcopy(data)
+    mutable['current']['max_hold'] = 1
+    assert pickle.loads(pickle.dumps(data)) == data
+    assert storage.load_progress()['current']['max_hold'] == 100
+
+def test_external_write_invalidates_cache(workdir):
+    storage = ProgressStorage(str(workdir / 'progress.json'))
+    save(storage, 100)
+    assert storage.get_current_data()['max_hold'] == 100
+
+    other = ProgressStorage(storage.filename)
+    other.update_max_hold(150)
+    assert storage.get_current_data()['max_hold'] == 150
+
+def test_cache_hits_until_the_file_changes(workdir):
+    storage = ProgressStorage(str(workdir / 'progress.json'))
+    save(storage, 100)
+    ProgressStorage.clear_cache()
+
+    first = storage.load_progress()
+    assert storage.load_progress() is first
+    assert ProgressStorage.cache_stats() == {'hits': 1, 'misses': 1, 'entries': 1}
+
+    # Written behind the storage's back, e.g. by another process
+    document = copy.deepcopy(first)
+    document['current']['max_hold'] = 175
+    atomic_write(storage.filename, json.dumps(document))
+    assert storage.load_progress()['current']['max_hold'] == 175
+    assert ProgressStorage.cache_stats()['misses'] == 2
+
+def test_missing_file_is_an_empty_document(workdir):
+    storage = ProgressStorage(str(workdir / 'absent.json'))
+    assert storage.load_progress() == {'training_history': []}
+    assert storage.get_current_data() is None
+    assert storage.signature() is None